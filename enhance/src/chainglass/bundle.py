@@ -0,0 +1,247 @@
+"""Pre-validated wf-spec bundles: one file to compose from.
+
+Composing from a wf-spec folder parses and validates wf.yaml, renders
+every stage-config.yaml and reads each prompt, schema and template from
+its own small file. On network-mounted spec repositories those opens and
+stats dominate. `chainglass bundle` does all of that once and stores the
+result, the compose plan, in a single zip archive:
+
+    bundle.json          format/version, the parsed workflow, stage order,
+                         stage configs, rendered stage-config.yaml text,
+                         the directory list, every copy (target -> source)
+                         and each source's mode, times and sha256
+    sources/<sha256>     content of each distinct source file
+
+Entries are stored uncompressed (so they can also be read in place, e.g.
+memory-mapped) and the zip central directory is the index. load_bundle()
+opens the archive once and rebuilds the ComposePlan without touching the
+wf-spec folder; compose --bundle then creates runs exactly as compose
+would have from the folder at bundle time.
+
+A bundle is a snapshot: re-run `chainglass bundle` after editing the
+wf-spec. Like the parse cache, bundling requires the workflow to
+round-trip through JSON unchanged.
+"""
+
+import json
+import os
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from chainglass.cache import DEFAULT_MAX_ERRORS
+from chainglass.composer import ComposePlan, SourceFile, plan_compose
+from chainglass.validator import validate_or_raise
+
+BUNDLE_FORMAT = "chainglass-bundle"
+
+# Bump when the bundle layout changes shape
+BUNDLE_VERSION = 1
+
+MANIFEST_NAME = "bundle.json"
+
+# Fixed entry timestamp, so bundling an unchanged wf-spec gives the same bytes
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Source digests name files in <run>/.blobs/: lowercase hex sha256 only
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+
+class BundleError(Exception):
+    """Raised when a bundle cannot be written or read."""
+
+    pass
+
+
+def write_bundle(
+    wf_spec_path: Path,
+    bundle_path: Path,
+    use_cache: bool = False,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> ComposePlan:
+    """Validate a wf-spec folder and pack its compose plan into bundle_path.
+
+    Args:
+        wf_spec_path: Path to the wf-spec folder
+        bundle_path: Archive to write (replaced atomically if it exists)
+        use_cache: Use the on-disk wf.yaml parse cache (see chainglass.cache)
+        max_errors: wf.yaml schema errors to report on failure (None or 0 = all)
+
+    Returns:
+        The plan that was bundled
+
+    Raises:
+        ValidationError: If wf-spec validation fails
+        BundleError: If the workflow cannot be stored or the archive written
+    """
+    wf_spec_path = Path(wf_spec_path).resolve()
+    bundle_path = Path(bundle_path).resolve()
+    workflow = validate_or_raise(wf_spec_path, use_cache=use_cache, max_errors=max_errors)
+    plan = plan_compose(wf_spec_path, workflow)
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "wf_spec_path": str(plan.wf_spec_path),
+        "workflow": plan.workflow,
+        "stage_order": plan.stage_order,
+        "stage_configs": plan.stage_configs,
+        "directories": [directory.as_posix() for directory in plan.directories],
+        "files": {target.as_posix(): text for target, text in plan.files.items()},
+        "copies": [[target.as_posix(), str(source)] for target, source in plan.copies],
+        "sources": {
+            str(path): {
+                "sha256": source.sha256,
+                "mode": source.mode,
+                "atime_ns": source.times_ns[0],
+                "mtime_ns": source.times_ns[1],
+            }
+            for path, source in plan.sources.items()
+        },
+        "shared": {digest: str(source.path) for digest, source in plan.shared.items()},
+    }
+    try:
+        payload = json.dumps(manifest, separators=(",", ":"))
+        if json.loads(payload)["workflow"] != plan.workflow:
+            raise ValueError("workflow does not round-trip through JSON")
+    except (TypeError, ValueError) as e:
+        raise BundleError(
+            f"Cannot bundle {wf_spec_path}: {e}\n"
+            f"Action: Quote values in wf.yaml that YAML reads as dates or other "
+            f"non-JSON types, or compose from the wf-spec folder."
+        ) from e
+
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=bundle_path.parent, prefix=f".{bundle_path.name}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp_name, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr(_zip_info(MANIFEST_NAME), payload)
+            written: set[str] = set()
+            for source in plan.sources.values():
+                if source.sha256 in written:
+                    continue
+                written.add(source.sha256)
+                content = source.content
+                if content is None:  # Large file: not kept in the plan
+                    content = source.path.read_bytes()
+                archive.writestr(_zip_info(f"sources/{source.sha256}"), content)
+        os.chmod(tmp_name, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_name, bundle_path)
+    except OSError as e:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise BundleError(
+            f"Failed to write bundle {bundle_path}: {e}\n"
+            f"Action: Check that the output directory is writable."
+        ) from e
+    return plan
+
+
+def load_bundle(bundle_path: Path) -> ComposePlan:
+    """Rebuild the compose plan stored in a bundle (one open of one file).
+
+    Every source is read into memory; the wf-spec folder is not accessed.
+
+    Raises:
+        BundleError: If the file is missing, not a bundle, from another
+            bundle version, corrupt, or has targets outside the run folder
+    """
+    bundle_path = Path(bundle_path)
+    recreate = f"Action: Re-create it with `chainglass bundle <wf-spec> -o {bundle_path}`."
+    try:
+        with zipfile.ZipFile(bundle_path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+            if not isinstance(manifest, dict) or manifest.get("format") != BUNDLE_FORMAT:
+                raise BundleError(f"Not a chainglass bundle: {bundle_path}\n{recreate}")
+            if manifest.get("version") != BUNDLE_VERSION:
+                raise BundleError(
+                    f"Bundle format version {manifest.get('version')} is not supported "
+                    f"(expected {BUNDLE_VERSION}): {bundle_path}\n{recreate}"
+                )
+            contents = {
+                digest: archive.read(f"sources/{digest}")
+                for digest in {entry["sha256"] for entry in manifest["sources"].values()}
+            }
+        return _plan_from_manifest(manifest, contents, bundle_path)
+    except FileNotFoundError as e:
+        raise BundleError(
+            f"Bundle not found: {bundle_path}\n"
+            f"Action: Create it with `chainglass bundle <wf-spec> -o {bundle_path}`."
+        ) from e
+    except (OSError, zipfile.BadZipFile, KeyError, TypeError, AttributeError, ValueError) as e:
+        # ValueError includes json.JSONDecodeError; BadZipFile includes CRC mismatches
+        raise BundleError(f"Corrupt bundle {bundle_path}: {e}\n{recreate}") from e
+
+
+def _plan_from_manifest(
+    manifest: dict[str, Any], contents: dict[str, bytes], bundle_path: Path
+) -> ComposePlan:
+    """ComposePlan from a bundle.json document and the source contents by sha256.
+
+    Raises:
+        BundleError: If a target would land outside the run folder or a
+            digest is not a sha256 (crafted or corrupted bundle)
+    """
+
+    def run_relative(value: str) -> Path:
+        # Same rule as FIX-003 in prepare/preflight: never write outside the run folder
+        path = Path(value)
+        if not path.parts or path.anchor or ".." in path.parts:
+            raise BundleError(
+                f"Unsafe target path in bundle {bundle_path}: {value!r}\n"
+                f"Action: Re-create the bundle with `chainglass bundle`; "
+                f"do not compose from bundles of unknown origin."
+            )
+        return path
+
+    for entry in manifest["sources"].values():
+        if not isinstance(entry["sha256"], str) or not _SHA256_RE.fullmatch(entry["sha256"]):
+            raise BundleError(
+                f"Invalid source digest in bundle {bundle_path}: {entry['sha256']!r}\n"
+                f"Action: Re-create the bundle with `chainglass bundle`."
+            )
+
+    sources = {
+        Path(path): SourceFile(
+            path=Path(path),
+            content=contents[entry["sha256"]],
+            mode=entry["mode"],
+            times_ns=(entry["atime_ns"], entry["mtime_ns"]),
+            sha256=entry["sha256"],
+            size=len(contents[entry["sha256"]]),
+        )
+        for path, entry in manifest["sources"].items()
+    }
+    shared = {digest: sources[Path(path)] for digest, path in manifest["shared"].items()}
+    for digest, source in shared.items():
+        if digest != source.sha256:  # Names the file in .blobs/
+            raise BundleError(
+                f"Shared digest {digest!r} does not match its source in bundle {bundle_path}\n"
+                f"Action: Re-create the bundle with `chainglass bundle`."
+            )
+    return ComposePlan(
+        wf_spec_path=Path(manifest["wf_spec_path"]),
+        workflow=manifest["workflow"],
+        stage_order=manifest["stage_order"],
+        stage_configs=manifest["stage_configs"],
+        directories=[run_relative(directory) for directory in manifest["directories"]],
+        files={run_relative(target): text for target, text in manifest["files"].items()},
+        copies=[(run_relative(target), Path(source)) for target, source in manifest["copies"]],
+        sources=sources,
+        shared=shared,
+    )
+
+
+def _zip_info(name: str) -> zipfile.ZipInfo:
+    """A stored entry with a fixed timestamp and 0644 permissions."""
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_STORED
+    info.external_attr = 0o644 << 16
+    return info
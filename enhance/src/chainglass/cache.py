@@ -0,0 +1,453 @@
+"""Caches shared by parser, validator and CLI.
+
+Two layers:
+- In-process: compiled schema validators, cached so that repeated
+  compose/validate calls do not re-read and re-compile the same schemas.
+  Files are looked up by (path, mtime, size) - an edited schema is picked
+  up without invalidation - and compiled validators are shared by content
+  hash, so the identical wf-result/handback/accept schemas copied into
+  every stage folder are compiled once. Cross-file "$ref"s resolve through
+  a referencing.Registry that loads sibling schema files on demand; every
+  file reachable through such refs (see schema_ref_files()) is part of the
+  lookup key too, so editing a referenced schema is picked up as well.
+- On-disk: validated wf.yaml parse results stored as JSON in a per-user
+  cache folder ($CHAINGLASS_CACHE_DIR, else $XDG_CACHE_HOME/chainglass,
+  else ~/.cache/chainglass), so a warm CLI invocation skips YAML parsing
+  and schema validation. The wf-spec folder itself is never written to;
+  it may be read-only, shared or network-mounted. Each wf.yaml has one
+  entry (the newest parse, checked against the sha256 of wf.yaml +
+  wf.schema.json) and the folder is capped at PARSE_CACHE_MAX_ENTRIES.
+  The cache only ever saves time: unreadable entries are misses and
+  failed writes are skipped silently.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+from chainglass.documents import file_fingerprint
+from chainglass.linking import within_stage
+
+try:
+    from referencing import Registry, Resource
+    from referencing.exceptions import NoSuchResource
+    from referencing.jsonschema import DRAFT202012
+
+    HAS_REFERENCING = True
+except ImportError:  # jsonschema < 4.18 resolves $refs with its own RefResolver
+    HAS_REFERENCING = False
+
+# Schema errors reported per document unless the caller asks otherwise
+DEFAULT_MAX_ERRORS = 20
+
+# Maximum number of compiled validators kept per process (LRU eviction)
+SCHEMA_CACHE_SIZE = 64
+
+# Folder name of the on-disk parse cache under the user cache directory
+PARSE_CACHE_DIRNAME = "chainglass"
+
+# Entries kept in the parse cache folder (oldest evicted first)
+PARSE_CACHE_MAX_ENTRIES = 256
+
+# Bump when the cached representation changes shape
+PARSE_CACHE_FORMAT = 1
+
+
+@dataclass
+class ParseCacheStats:
+    """Counters for the on-disk wf.yaml parse cache (per process)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+
+parse_cache_stats = ParseCacheStats()
+
+
+def get_validator(schema_path: Path) -> Validator:
+    """Return a compiled validator for a schema file.
+
+    The validator class follows the schema's "$schema" (Draft 2020-12 by
+    default) and the schema itself is checked once, at compile time.
+
+    Args:
+        schema_path: Path to a JSON Schema file
+
+    Returns:
+        Compiled validator for the schema
+
+    Raises:
+        FileNotFoundError: If the schema file does not exist
+        json.JSONDecodeError: If the schema file is not valid JSON
+        jsonschema.SchemaError: If the file is not a valid JSON Schema
+    """
+    # $refs resolve next to where the schema is used, not where a symlink to
+    # it points (compose may symlink shared schemas from <run>/.blobs/)
+    schema_path = _unresolved(schema_path)
+    stat_result = schema_path.stat()
+    refs = tuple(
+        (str(path), file_fingerprint(path))
+        for path in schema_ref_files(schema_path, stat_result)
+    )
+    return _load_validator(str(schema_path), stat_result.st_mtime_ns, stat_result.st_size, refs)
+
+
+def _unresolved(path: Path) -> Path:
+    """Absolute path with its directory resolved but the file itself not followed."""
+    path = Path(path)
+    return path.parent.resolve() / path.name
+
+
+def schema_ref_files(schema_path: Path, stat_result: os.stat_result | None = None) -> list[Path]:
+    """Files a schema depends on through external "$ref"s, transitively.
+
+    Refs are resolved as the validator's registry resolves them: relative to
+    the referencing file, within the schema's directory (symlinks in that
+    directory are not resolved, see get_validator()). Referenced files
+    that do not exist are listed too (creating one changes the result).
+    Each file's refs are cached by (path, mtime, size), so a warm call costs
+    one stat per file.
+
+    Args:
+        schema_path: Path to a JSON Schema file
+        stat_result: schema_path's stat, if the caller already has it
+
+    Returns:
+        Referenced files (excluding schema_path), in discovery order
+    """
+    schema_path = _unresolved(schema_path)
+    base = schema_path.parent
+    found: list[Path] = []
+    seen = {schema_path}
+    pending = [(schema_path, stat_result)]
+    while pending:
+        path, stat_result = pending.pop()
+        try:
+            if stat_result is None:
+                stat_result = path.stat()
+            refs = _direct_refs(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+        except (OSError, ValueError):
+            continue  # Missing or unreadable: listed by its referrer, nothing to follow
+        for ref in refs:
+            parts = urlsplit(ref)
+            rel_path = unquote(parts.path)
+            if not rel_path:
+                continue
+            if parts.scheme not in ("", "file") or parts.netloc:
+                target = base / rel_path.rsplit("/", 1)[-1]
+            else:
+                target = path.parent / rel_path
+            target = Path(os.path.normpath(target))
+            if target in seen or not target.is_relative_to(base):
+                continue
+            seen.add(target)
+            found.append(target)
+            pending.append((target, None))
+    return found
+
+
+def first_error(validator: Validator, instance: Any) -> ValidationError | None:
+    """Return the most relevant validation error, or None if instance is valid.
+
+    Same error selection as jsonschema.validate(), without recompiling.
+    """
+    return best_match(validator.iter_errors(instance))
+
+
+def collect_errors(
+    errors: Iterable[ValidationError], max_errors: int | None = DEFAULT_MAX_ERRORS
+) -> tuple[list[ValidationError], bool]:
+    """Take at most max_errors errors from a lazy error iterator.
+
+    Validation stops as soon as the limit is exceeded, so a badly broken
+    document costs no more than max_errors + 1 errors. With max_errors=1
+    (fail-fast) the single error reported is the most relevant one, as
+    chosen by first_error()/jsonschema.validate(); that needs every error,
+    but only one is kept in memory.
+
+    Args:
+        errors: Error iterator (e.g. validator.iter_errors(instance))
+        max_errors: Limit (None or <= 0 = collect all)
+
+    Returns:
+        (errors, truncated) - truncated is True if more errors exist
+    """
+    if max_errors is None or max_errors <= 0:
+        return list(errors), False
+    if max_errors == 1:
+        seen = 0
+
+        def counted() -> Iterable[ValidationError]:
+            nonlocal seen
+            for error in errors:
+                seen += 1
+                yield error
+
+        best = best_match(counted())
+        return ([best] if best is not None else []), seen > 1
+    collected = list(islice(errors, max_errors + 1))
+    return collected[:max_errors], len(collected) > max_errors
+
+
+def validate_instance(instance: Any, schema_path: Path) -> None:
+    """Drop-in for jsonschema.validate(instance, schema) using the cached validator.
+
+    Raises:
+        jsonschema.ValidationError: If instance does not match the schema
+        (plus the exceptions documented on get_validator)
+    """
+    error = first_error(get_validator(schema_path), instance)
+    if error is not None:
+        raise error
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _load_validator(
+    schema_path: str,
+    mtime_ns: int,
+    size: int,
+    refs: tuple[tuple[str, tuple[int, int] | None], ...] = (),
+) -> Validator:
+    """Read a schema file and map it to a compiled validator.
+
+    mtime/size and the fingerprints of the $ref'd files are part of the key.
+    """
+    content = Path(schema_path).read_bytes()
+    schema = json.loads(content)
+
+    # Only schemas with external $refs depend on where they live
+    ref_dir = str(Path(schema_path).parent) if _has_external_ref(schema) else None
+    return _compile_validator(hashlib.sha256(content).hexdigest(), ref_dir, content)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _compile_validator(content_hash: str, ref_dir: str | None, content: bytes) -> Validator:
+    """Compile a schema (cached by content hash + $ref base directory)."""
+    schema = json.loads(content)
+    cls = validator_for(schema, default=Draft202012Validator)
+    cls.check_schema(schema)
+    if ref_dir is not None and HAS_REFERENCING:
+        return cls(schema, registry=_schema_registry(ref_dir))
+    return cls(schema)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE * 4)
+def _direct_refs(schema_path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """External "$ref"/"$dynamicRef" values of one schema file, fragments dropped."""
+    refs: list[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ("$ref", "$dynamicRef") and isinstance(value, str):
+                    if not value.startswith("#"):
+                        refs.append(value.split("#", 1)[0])
+                else:
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(json.loads(Path(schema_path).read_bytes()))
+    return tuple(dict.fromkeys(refs))
+
+
+def _has_external_ref(node: Any) -> bool:
+    """True if any "$ref"/"$dynamicRef" points outside the schema document."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in ("$ref", "$dynamicRef") and isinstance(value, str):
+                if not value.startswith("#"):
+                    return True
+            elif _has_external_ref(value):
+                return True
+    elif isinstance(node, list):
+        return any(_has_external_ref(item) for item in node)
+    return False
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _schema_registry(ref_dir: str) -> "Registry":
+    """Registry resolving relative $refs to schema files under ref_dir.
+
+    Relative references load the referenced file from ref_dir; absolute
+    URIs (e.g. from an "$id" base) map to the file with the same name.
+    References escaping ref_dir are refused, except for files in a stage's
+    schemas/ that compose symlinked from the run's .blobs/ store.
+    """
+    base = Path(ref_dir)
+
+    def retrieve(uri: str) -> "Resource":
+        parts = urlsplit(uri)
+        rel_path = unquote(parts.path)
+        if parts.scheme not in ("", "file") or parts.netloc:
+            rel_path = rel_path.rsplit("/", 1)[-1]
+        path = Path(os.path.normpath(base / rel_path.lstrip("/")))
+        if not (path.resolve().is_relative_to(base) or within_stage(path, base.parent)):
+            raise NoSuchResource(ref=uri)
+        try:
+            contents = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            raise NoSuchResource(ref=uri) from e
+        return Resource.from_contents(contents, default_specification=DRAFT202012)
+
+    return Registry(retrieve=retrieve)
+
+
+def clear_caches() -> None:
+    """Drop all in-process caches and reset counters (on-disk cache is kept)."""
+    _load_validator.cache_clear()
+    _direct_refs.cache_clear()
+    _compile_validator.cache_clear()
+    _schema_registry.cache_clear()
+    parse_cache_stats.hits = parse_cache_stats.misses = parse_cache_stats.writes = 0
+
+
+def cache_stats() -> dict[str, Any]:
+    """Return cache counters for CLI/diagnostic output."""
+    files = _load_validator.cache_info()
+    compiled = _compile_validator.cache_info()
+    return {
+        "parse_cache": asdict(parse_cache_stats),
+        "validators": {
+            "hits": files.hits,
+            "misses": files.misses,
+            "compiled": compiled.currsize,
+            "shared": compiled.hits,
+            "maxsize": files.maxsize,
+        },
+    }
+
+
+# =============================================================================
+# On-disk wf.yaml parse cache
+# =============================================================================
+
+
+def default_cache_dir() -> Path:
+    """Per-user parse cache folder ($CHAINGLASS_CACHE_DIR or the XDG cache directory)."""
+    override = os.environ.get("CHAINGLASS_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / PARSE_CACHE_DIRNAME
+
+
+def workflow_cache_key(wf_yaml_path: Path, schema_path: Path) -> str:
+    """Content hash identifying a (wf.yaml, wf.schema.json) pair.
+
+    Every schema file wf.schema.json reaches through "$ref"s (see
+    schema_ref_files()) is part of the key, since a hit skips validation.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"format={PARSE_CACHE_FORMAT}\n".encode())
+    for path in (wf_yaml_path, schema_path):
+        content = Path(path).read_bytes()
+        digest.update(f"{len(content)}\n".encode())
+        digest.update(content)
+    schema_dir = _unresolved(schema_path).parent
+    for path in schema_ref_files(schema_path):
+        digest.update(f"ref={path.relative_to(schema_dir).as_posix()}\n".encode())
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            digest.update(b"missing\n")
+            continue
+        digest.update(f"{len(content)}\n".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def load_cached_workflow(cache_dir: Path, wf_yaml_path: Path, key: str) -> dict[str, Any] | None:
+    """Return a previously validated workflow, or None on a cache miss.
+
+    Unreadable, corrupt or stale (different key) entries count as misses.
+    """
+    try:
+        entry = json.loads(_cache_entry_path(cache_dir, wf_yaml_path).read_text())
+        if entry.get("format") != PARSE_CACHE_FORMAT or entry.get("key") != key:
+            raise ValueError("stale cache entry")
+        workflow = entry["workflow"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        parse_cache_stats.misses += 1
+        return None
+
+    parse_cache_stats.hits += 1
+    return workflow
+
+
+def store_cached_workflow(
+    cache_dir: Path, wf_yaml_path: Path, key: str, workflow: dict[str, Any]
+) -> None:
+    """Persist a validated workflow (best-effort; never raises on I/O errors).
+
+    Replaces the previous entry for the same wf.yaml. Workflows that do not
+    round-trip through JSON unchanged (e.g. YAML dates or non-string keys)
+    are not cached, so a hit always equals a fresh parse.
+    """
+    try:
+        payload = json.dumps({"format": PARSE_CACHE_FORMAT, "key": key, "workflow": workflow})
+        if json.loads(payload)["workflow"] != workflow:
+            return
+    except (TypeError, ValueError):
+        return
+
+    cache_dir = Path(cache_dir)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see partial entries
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, prefix=".workflow-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_name, _cache_entry_path(cache_dir, wf_yaml_path))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        _evict_cached_workflows(cache_dir)
+    except OSError:
+        return  # Read-only or unavailable cache dir - just skip caching
+
+    parse_cache_stats.writes += 1
+
+
+def _cache_entry_path(cache_dir: Path, wf_yaml_path: Path) -> Path:
+    """Entry file for a wf.yaml (one per resolved path)."""
+    path_hash = hashlib.sha256(str(Path(wf_yaml_path).resolve()).encode()).hexdigest()
+    return Path(cache_dir) / f"workflow-{path_hash}.json"
+
+
+def _evict_cached_workflows(cache_dir: Path) -> None:
+    """Remove the least recently written entries beyond PARSE_CACHE_MAX_ENTRIES."""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.startswith("workflow-") and entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+    entries.sort(reverse=True)
+    for _, path in entries[PARSE_CACHE_MAX_ENTRIES:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass  # Removed by a concurrent writer
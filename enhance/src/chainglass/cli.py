@@ -1,15 +1,31 @@
 """Chainglass CLI - Workflow Composer commands."""
 
+import time
 from pathlib import Path
 
 import typer
 
 from chainglass import __version__
-from chainglass.composer import CompositionError, compose
+from chainglass.bundle import BundleError, load_bundle, write_bundle
+from chainglass.cache import DEFAULT_MAX_ERRORS, cache_stats, validate_instance
+from chainglass.composer import (
+    ComposePlan,
+    CompositionError,
+    compose,
+    compose_many,
+    compose_runs,
+    plan_compose,
+)
+from chainglass.estimate import CostModel, calibration_dir, estimate_compose
+from chainglass.executor import execute
+from chainglass.graph import CycleError
+from chainglass.linking import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES
 from chainglass.preflight import preflight
 from chainglass.preparer import prepare_wf_stage
+from chainglass.run import Run
 from chainglass.stage import Stage
-from chainglass.validator import ValidationError, validate_stage
+from chainglass.validator import ValidationError, validate_or_raise, validate_run, validate_stage
+from chainglass.wfrun import WfRunStore
 
 app = typer.Typer(
     name="chainglass",
@@ -25,6 +41,21 @@ def version_callback(value: bool) -> None:
         raise typer.Exit()
 
 
+def _compact_wf_run(wf_run_path: Path) -> None:
+    """Fold the event log into wf-run.json, so the file is current when the command exits."""
+    try:
+        WfRunStore(wf_run_path).compact()
+    except OSError:
+        pass  # The transition is in wf-run.events.jsonl; the next compaction picks it up
+
+
+def _error_limit(max_errors: int, fail_fast: bool) -> int | None:
+    """Map --max-errors/--fail-fast to the max_errors API argument (None = all)."""
+    if fail_fast:
+        return 1
+    return max_errors or None
+
+
 @app.callback()
 def main(
     version: bool = typer.Option(
@@ -42,9 +73,9 @@ def main(
 
 @app.command(name="compose")
 def compose_cmd(
-    wf_spec: Path = typer.Argument(
-        ...,
-        help="Path to wf-spec folder containing wf.yaml",
+    wf_spec: Path | None = typer.Argument(
+        None,
+        help="Path to wf-spec folder containing wf.yaml (omit with --bundle)",
         exists=True,
         file_okay=False,
         dir_okay=True,
@@ -57,28 +88,278 @@ def compose_cmd(
         help="Output directory for run folder",
         resolve_path=True,
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Skip the on-disk wf.yaml parse cache (~/.cache/chainglass/)",
+    ),
+    show_cache_stats: bool = typer.Option(
+        False,
+        "--cache-stats",
+        help="Print parse/validator cache statistics after composing",
+    ),
+    max_errors: int = typer.Option(
+        DEFAULT_MAX_ERRORS,
+        "--max-errors",
+        min=0,
+        help="Schema errors to report for wf.yaml (0 = all)",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first schema error (same as --max-errors 1)",
+    ),
+    count: int = typer.Option(
+        1,
+        "--count",
+        min=1,
+        help="Number of run folders to create from one parse of the wf-spec",
+    ),
+    link: str = typer.Option(
+        "copy",
+        "--link",
+        help=(
+            "How templates/schemas shared by several stages are placed: copy, or "
+            "hardlink, symlink, reflink to one copy in <run>/.blobs/"
+        ),
+    ),
+    bundle: Path | None = typer.Option(
+        None,
+        "--bundle",
+        "-b",
+        help="Compose from a bundle written by `chainglass bundle` instead of a wf-spec folder",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        resolve_path=True,
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-n",
+        help="Validate and plan, print what would be created, write nothing",
+    ),
+    show_stats: bool = typer.Option(
+        False,
+        "--stats",
+        help="Print directories/files/bytes per stage and a projected compose time",
+    ),
 ) -> None:
     """Create a run folder from a wf-spec folder.
 
     Transforms a wf-spec folder into an executable run directory where
     coding agents can execute workflow stages.
 
+    A validated parse of wf.yaml is cached in ~/.cache/chainglass/ (or
+    $XDG_CACHE_HOME/chainglass, $CHAINGLASS_CACHE_DIR), so repeated composes from an unchanged wf-spec skip YAML parsing and
+    schema validation. Use --no-cache to force a fresh parse.
+
     Example:
         chainglass compose ./wf-spec --output ./runs
+
+    Bulk runs (wf.yaml is parsed and validated once):
+        chainglass compose ./wf-spec --output ./runs --count 50
+
+    Store shared templates once per run and hardlink them into stages:
+        chainglass compose ./wf-spec --output ./runs --link hardlink
+
+    From a pre-validated bundle (one file read, no wf-spec folder access):
+        chainglass compose --bundle ./wf-spec.bundle.zip --output ./runs
+
+    Capacity planning (with --dry-run, --stats times filesystem operations
+    in a scratch folder next to the output directory to calibrate the
+    projection; without it, built-in costs are used and the actual time is
+    printed):
+        chainglass compose ./wf-spec --output ./runs --count 50 --dry-run --stats
     """
+    if (wf_spec is None) == (bundle is None):
+        typer.echo(
+            "Give either a wf-spec folder or --bundle\n"
+            "Action: Run `chainglass compose ./wf-spec -o ./runs` or "
+            "`chainglass compose --bundle ./wf-spec.bundle.zip -o ./runs`.",
+            err=True,
+        )
+        raise typer.Exit(code=1)
     try:
-        run_folder = compose(wf_spec, output)
-        typer.echo(f"Created: {run_folder}")
+        plan = None
+        if bundle is not None:
+            plan = load_bundle(bundle)
+        elif dry_run or show_stats:
+            workflow = validate_or_raise(
+                wf_spec, use_cache=not no_cache, max_errors=_error_limit(max_errors, fail_fast)
+            )
+            plan = plan_compose(wf_spec, workflow)
+        if plan is not None and (dry_run or show_stats):
+            _echo_compose_estimate(plan, output, count, link, dry_run, show_stats)
+
+        start = time.perf_counter()
+        if dry_run:
+            run_folders = []
+        elif plan is not None:
+            run_folders = compose_runs(plan, output, count, link=link)
+        elif count == 1:
+            run_folders = [
+                compose(
+                    wf_spec,
+                    output,
+                    use_cache=not no_cache,
+                    max_errors=_error_limit(max_errors, fail_fast),
+                    link=link,
+                )
+            ]
+        else:
+            run_folders = compose_many(
+                wf_spec,
+                output,
+                count,
+                use_cache=not no_cache,
+                max_errors=_error_limit(max_errors, fail_fast),
+                link=link,
+            )
+        for run_folder in run_folders:
+            typer.echo(f"Created: {run_folder}")
+        if show_stats and not dry_run:
+            typer.echo(f"Actual time: {time.perf_counter() - start:.3f} s")
+        if show_cache_stats:
+            stats = cache_stats()
+            parse = stats["parse_cache"]
+            validators = stats["validators"]
+            typer.echo(
+                f"Parse cache: {parse['hits']} hits, {parse['misses']} misses, "
+                f"{parse['writes']} writes"
+            )
+            typer.echo(
+                f"Validator cache: {validators['hits']} hits, {validators['misses']} misses"
+            )
     except ValidationError as e:
         typer.echo(f"Validation failed:\n", err=True)
         for error in e.result.errors:
             typer.echo(f"  {error}\n", err=True)
         raise typer.Exit(code=1)
-    except CompositionError as e:
+    except (CompositionError, BundleError) as e:
         typer.echo(f"Composition failed: {e}", err=True)
         raise typer.Exit(code=1)
 
 
+def _echo_compose_estimate(
+    plan: ComposePlan, output: Path, count: int, link: str, dry_run: bool, detailed: bool
+) -> None:
+    """Print what composing plan count times will create (and, if detailed, how long it takes)."""
+    estimate = estimate_compose(plan, link=link, count=count)
+    total = estimate.per_run
+
+    if dry_run:
+        typer.echo(f"Dry run: nothing written to {output}")
+    typer.echo(f"Run folders: {count} ({len(plan.stage_order)} stages each, link: {link})")
+    if detailed:
+        typer.echo(f"\n  {'':<28} {'dirs':>8} {'files':>8} {'links':>8} {'bytes':>14}")
+        rows = [*estimate.stages, estimate.run, total]
+        for row in rows:
+            if row is total:
+                typer.echo(f"  {'-' * 70}")
+            typer.echo(
+                f"  {row.stage_id:<28} {row.directories:>8} {row.files:>8} "
+                f"{row.links:>8} {row.bytes:>14,}"
+            )
+        typer.echo("")
+    typer.echo(
+        f"Per run: {total.directories} directories, {total.files} files, "
+        f"{total.links} links, {total.bytes:,} bytes"
+    )
+    if count > 1:
+        typer.echo(
+            f"All runs: {total.directories * count} directories, {total.files * count} files, "
+            f"{total.links * count} links, {total.bytes * count:,} bytes"
+        )
+
+    if detailed:
+        # Calibrating writes tens of MiB next to the output: only worth it
+        # when nothing else is written (a real compose reports actual time)
+        model = CostModel()
+        source = "built-in defaults; --dry-run --stats calibrates on the target filesystem"
+        if dry_run:
+            try:
+                model = CostModel.calibrate(calibration_dir(output))
+                source = f"calibrated in {model.calibrated_in}"
+            except OSError:
+                source = "built-in defaults (could not calibrate next to the output directory)"
+        seconds = estimate.projected_seconds(model)
+        typer.echo(
+            f"Projected time: {seconds:.3f} s per run, {seconds * count:.3f} s total "
+            f"(serial; {source})"
+        )
+        typer.echo(
+            f"  Cost model: mkdir {model.mkdir * 1e6:.1f} us, file {model.file * 1e6:.1f} us, "
+            f"link {model.link * 1e6:.1f} us, symlink {model.symlink * 1e6:.1f} us, "
+            f"stat {model.stat * 1e6:.1f} us, "
+            f"fsync {model.fsync * 1e3:.2f} ms, {1 / model.byte / 1e6 if model.byte else 0:.0f} MB/s"
+        )
+
+
+@app.command(name="bundle")
+def bundle_cmd(
+    wf_spec: Path = typer.Argument(
+        ...,
+        help="Path to wf-spec folder containing wf.yaml",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    output: Path = typer.Option(
+        ...,
+        "--output",
+        "-o",
+        help="Bundle file to write (e.g. wf-spec.bundle.zip)",
+        resolve_path=True,
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Skip the on-disk wf.yaml parse cache (~/.cache/chainglass/)",
+    ),
+    max_errors: int = typer.Option(
+        DEFAULT_MAX_ERRORS,
+        "--max-errors",
+        min=0,
+        help="Schema errors to report for wf.yaml (0 = all)",
+    ),
+) -> None:
+    """Pack a validated wf-spec into a single-file bundle for compose --bundle.
+
+    The bundle holds the parsed workflow, rendered stage configs and every
+    prompt, schema and template compose copies, in one uncompressed zip.
+    Composing from it opens one file instead of walking the wf-spec tree.
+    Re-run after editing the wf-spec.
+
+    Example:
+        chainglass bundle ./wf-spec --output ./wf-spec.bundle.zip
+        chainglass compose --bundle ./wf-spec.bundle.zip --output ./runs
+    """
+    try:
+        plan = write_bundle(
+            wf_spec,
+            output,
+            use_cache=not no_cache,
+            max_errors=_error_limit(max_errors, False),
+        )
+    except ValidationError as e:
+        typer.echo(f"Validation failed:\n", err=True)
+        for error in e.result.errors:
+            typer.echo(f"  {error}\n", err=True)
+        raise typer.Exit(code=1)
+    except BundleError as e:
+        typer.echo(f"Bundle failed: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"Created: {output}")
+    typer.echo(
+        f"Stages: {len(plan.stage_order)}, files per run: {plan.file_count} "
+        f"({len({source.sha256 for source in plan.sources.values()})} distinct sources), "
+        f"size: {output.stat().st_size} bytes"
+    )
+
+
 @app.command(name="finalize")
 def finalize_cmd(
     stage_id: str = typer.Argument(
@@ -121,6 +402,7 @@ def finalize_cmd(
     result = stage.finalize()
 
     if result.success:
+        _compact_wf_run(stage.wf_run_path)
         typer.echo(f"Finalized: {stage_id}")
         if result.parameters:
             typer.echo("Published parameters:")
@@ -149,6 +431,23 @@ def validate_cmd(
         dir_okay=True,
         resolve_path=True,
     ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        "-i",
+        help="Only re-check outputs changed since the last validate (uses .validation-manifest.json)",
+    ),
+    max_errors: int = typer.Option(
+        DEFAULT_MAX_ERRORS,
+        "--max-errors",
+        min=0,
+        help="Schema errors to report per output (0 = all)",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first schema error (same as --max-errors 1)",
+    ),
 ) -> None:
     """Validate stage outputs after LLM execution.
 
@@ -160,6 +459,12 @@ def validate_cmd(
 
     Example:
         chainglass validate explore --run-dir ./run/run-2026-01-18-001
+
+    Re-validating while fixing outputs:
+        chainglass validate explore --run-dir ./run/run-2026-01-18-001 --incremental
+
+    Schema errors are listed up to --max-errors per output (default 20);
+    --fail-fast stops at the first one.
     """
     stage_path = run_dir / "stages" / stage_id
 
@@ -171,7 +476,9 @@ def validate_cmd(
         )
         raise typer.Exit(code=1)
 
-    result = validate_stage(stage_path)
+    result = validate_stage(
+        stage_path, incremental=incremental, max_errors=_error_limit(max_errors, fail_fast)
+    )
 
     if result.status == "pass":
         typer.echo(f"Validated: {stage_id}")
@@ -224,6 +531,261 @@ def validate_cmd(
         raise typer.Exit(code=1)
 
 
+@app.command(name="validate-run")
+def validate_run_cmd(
+    run_dir: Path = typer.Option(
+        ...,
+        "--run-dir",
+        "-r",
+        help="Path to run directory containing stages/",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Worker processes (default: CPU count)",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        "-i",
+        help="Only re-check outputs changed since the last validate (per-stage manifests)",
+    ),
+    max_errors: int = typer.Option(
+        DEFAULT_MAX_ERRORS,
+        "--max-errors",
+        min=0,
+        help="Schema errors to report per output (0 = all)",
+    ),
+    fail_fast: bool = typer.Option(
+        False,
+        "--fail-fast",
+        help="Stop at the first schema error (same as --max-errors 1)",
+    ),
+) -> None:
+    """Validate outputs of every stage in a run folder.
+
+    Runs the same checks as 'chainglass validate' for all stages under
+    run/stages/ in one process pool, and prints a single JSON document with
+    each stage's result and timing. Exits 1 if any stage fails.
+
+    Example:
+        chainglass validate-run --run-dir ./run/run-2026-01-18-001 --jobs 8
+    """
+    import json
+
+    result = validate_run(
+        run_dir,
+        jobs=jobs,
+        incremental=incremental,
+        max_errors=_error_limit(max_errors, fail_fast),
+    )
+    typer.echo(json.dumps(result.to_dict(), indent=2))
+
+    if result.status == "fail":
+        raise typer.Exit(code=1)
+
+
+@app.command(name="plan")
+def plan_cmd(
+    run_dir: Path = typer.Option(
+        ...,
+        "--run-dir",
+        "-r",
+        help="Path to run directory containing stages/",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print the plan as JSON",
+    ),
+) -> None:
+    """Show the stage execution plan derived from from_stage dependencies.
+
+    Stages are grouped into levels: every stage in a level depends only on
+    stages in earlier levels, so stages within a level can run concurrently.
+
+    Example:
+        chainglass plan --run-dir ./run/run-2026-01-18-001
+    """
+    import json
+
+    run = Run(run_dir)
+    graph = run.graph
+    try:
+        levels = graph.levels()
+    except CycleError as e:
+        typer.echo(f"Planning failed: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    statuses = run.statuses()
+    if as_json:
+        plan = {
+            "run_id": run.run_id,
+            "levels": [
+                [
+                    {
+                        "id": stage_id,
+                        "status": statuses.get(stage_id),
+                        "depends_on": graph.upstream[stage_id],
+                    }
+                    for stage_id in level
+                ]
+                for level in levels
+            ],
+            "missing": graph.missing,
+        }
+        typer.echo(json.dumps(plan, indent=2))
+    else:
+        typer.echo(f"Plan for {run.run_id}: {len(graph.stage_ids)} stages, {len(levels)} levels")
+        for number, level in enumerate(levels, start=1):
+            entries = ", ".join(f"{s} ({statuses.get(s) or 'unknown'})" for s in level)
+            typer.echo(f"  Level {number}: {entries}")
+        for stage_id, unknown in graph.missing.items():
+            typer.echo(
+                f"Warning: stage '{stage_id}' references unknown stage(s): {', '.join(unknown)}",
+                err=True,
+            )
+
+    if graph.missing:
+        raise typer.Exit(code=1)
+
+
+@app.command(name="ready")
+def ready_cmd(
+    run_dir: Path = typer.Option(
+        ...,
+        "--run-dir",
+        "-r",
+        help="Path to run directory containing stages/",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print ready stage ids as a JSON list",
+    ),
+) -> None:
+    """List stages that can start now.
+
+    A stage is ready when it is not completed or in progress and every
+    stage it takes inputs or parameters from is completed (finalized).
+    Ready stages are independent of each other and can run concurrently.
+
+    Example:
+        chainglass ready --run-dir ./run/run-2026-01-18-001
+    """
+    import json
+
+    run = Run(run_dir)
+    cycle = run.graph.find_cycle()
+    if cycle:
+        typer.echo(f"Planning failed: {CycleError(cycle)}", err=True)
+        raise typer.Exit(code=1)
+
+    ready = run.ready()
+    if as_json:
+        typer.echo(json.dumps(ready))
+    else:
+        for stage_id in ready:
+            typer.echo(stage_id)
+
+
+@app.command(name="execute")
+def execute_cmd(
+    run_dir: Path = typer.Option(
+        ...,
+        "--run-dir",
+        "-r",
+        help="Path to run directory containing stages/",
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    agent_cmd: str = typer.Option(
+        ...,
+        "--agent-cmd",
+        help="Shell command that performs a stage ({stage_id}, {stage_dir}, {run_dir} are substituted)",
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of stages to run concurrently",
+    ),
+    link: str = typer.Option(
+        DEFAULT_LINK_STRATEGY,
+        "--link",
+        help=f"How inputs are placed: {', '.join(LINK_STRATEGIES)} (falls back to copy)",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Echo agent output as it is produced",
+    ),
+    as_json: bool = typer.Option(
+        False,
+        "--json",
+        help="Print the execution result as JSON",
+    ),
+) -> None:
+    """Execute all pending stages of a run in dependency order.
+
+    For each stage whose upstream stages are completed: prepare-wf-stage,
+    preflight, accept, run the agent command, then finalize. Up to --jobs
+    stages run at once. Stages downstream of a failure are blocked.
+
+    The agent command runs in the stage folder with CHAINGLASS_STAGE_ID,
+    CHAINGLASS_STAGE_DIR and CHAINGLASS_RUN_DIR set; its output is saved
+    to run/agent.log.
+
+    Example:
+        chainglass execute -r ./run/run-2026-01-18-001 -j 4 --agent-cmd 'my-agent {stage_dir}'
+    """
+    import json
+
+    def progress(stage_id: str, event: str, message: str) -> None:
+        if event == "output":
+            if verbose:
+                typer.echo(f"[{stage_id}] | {message}", err=True)
+        else:
+            typer.echo(f"[{stage_id}] {event}: {message}", err=True)
+
+    try:
+        result = execute(run_dir, agent_cmd, jobs=jobs, on_event=progress, link=link)
+    except CycleError as e:
+        typer.echo(f"Execution failed: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    if as_json:
+        typer.echo(json.dumps(result.to_dict(), indent=2))
+    else:
+        for record in result.stages:
+            if record.errors:
+                typer.echo(f"\n{record.stage_id} ({record.status}):", err=True)
+                for error in record.errors:
+                    typer.echo(f"  {error}", err=True)
+        typer.echo(f"Execution {result.status}: {result.summary} ({result.duration_ms / 1000:.1f}s)")
+
+    if result.status == "fail":
+        raise typer.Exit(code=1)
+
+
 @app.command(name="preflight")
 def preflight_cmd(
     stage_id: str = typer.Argument(
@@ -309,7 +871,8 @@ def handback_cmd(
 
     Reads handback.json from the stage output-data folder, validates it
     against the schema, and echoes the handback reason and description.
-    For error handbacks, also displays the error code description.
+    For error handbacks, also displays the error code description. The
+    handback reason and time are recorded on the stage's wf-run.json entry.
 
     This command always exits 0. The handback reason is communicated
     via the JSON output structure (reason: "success" | "error" | "question").
@@ -355,8 +918,7 @@ def handback_cmd(
     schema_path = stage_path / "schemas" / "handback.schema.json"
     if schema_path.exists():
         try:
-            schema = json.loads(schema_path.read_text())
-            jsonschema.validate(handback, schema)
+            validate_instance(handback, schema_path)
         except json.JSONDecodeError:
             # Schema file is invalid - log but continue
             typer.echo(
@@ -406,9 +968,12 @@ def handback_cmd(
             for key, value in context.items():
                 typer.echo(f"  {key}: {value}")
 
-    # Load and report accept.json status (ST006)
-    from datetime import datetime, timezone
+    # Record the handback in wf-run.json (no-op if the run has no wf-run.json)
+    stage = Stage(stage_path)
+    handed_back_at = stage.record_handback(reason)
+    _compact_wf_run(stage.wf_run_path)
 
+    # Load and report accept.json status (ST006)
     accept_path = stage_path / "run" / "output-data" / "accept.json"
     accept_timestamp = None
     if accept_path.exists():
@@ -419,8 +984,7 @@ def handback_cmd(
             # Display state transition (ST007)
             typer.echo(f"State: {accept_state} → orchestrator")
             typer.echo(f"Accepted at: {accept_timestamp}")
-            now = datetime.now(timezone.utc).isoformat()
-            typer.echo(f"Handed back: {now}")
+            typer.echo(f"Handed back: {handed_back_at}")
         except json.JSONDecodeError:
             typer.echo("Accept: PRESENT (invalid JSON)")
     else:
@@ -456,7 +1020,8 @@ def accept_cmd(
 
     Writes accept.json to the stage output-data folder, signaling that the
     orchestrator has granted control to the agent. The agent should read this
-    file to confirm permission before executing stage work.
+    file to confirm permission before executing stage work. The stage is
+    marked in_progress in wf-run.json with the same timestamp as started_at.
 
     This command is idempotent - calling it multiple times overwrites the
     accept.json file with a new timestamp.
@@ -466,9 +1031,6 @@ def accept_cmd(
     Example:
         chainglass accept explore --run-dir ./run/run-2026-01-18-001
     """
-    import json
-    from datetime import datetime, timezone
-
     stage_path = run_dir / "stages" / stage_id
 
     if not stage_path.exists():
@@ -479,18 +1041,10 @@ def accept_cmd(
         )
         raise typer.Exit(code=1)
 
-    # Create output-data directory if needed
-    output_data_path = stage_path / "run" / "output-data"
-    output_data_path.mkdir(parents=True, exist_ok=True)
-
     # Write accept.json
-    accept_path = output_data_path / "accept.json"
-    timestamp = datetime.now(timezone.utc).isoformat()
-    accept_data = {
-        "state": "agent",
-        "timestamp": timestamp,
-    }
-    accept_path.write_text(json.dumps(accept_data, indent=2))
+    stage = Stage(stage_path)
+    timestamp = stage.accept()
+    _compact_wf_run(stage.wf_run_path)
 
     # Echo confirmation
     typer.echo(f"Accept: {stage_id}")
@@ -523,6 +1077,11 @@ def prepare_wf_stage_cmd(
         "-n",
         help="Validate without copying files or writing params.json",
     ),
+    link: str = typer.Option(
+        DEFAULT_LINK_STRATEGY,
+        "--link",
+        help=f"How inputs are placed: {', '.join(LINK_STRATEGIES)} (falls back to copy)",
+    ),
 ) -> None:
     """Prepare a stage by copying inputs from prior stages.
 
@@ -535,10 +1094,16 @@ def prepare_wf_stage_cmd(
 
     Dry-run mode:
         chainglass prepare-wf-stage specify --run-dir ./run --dry-run
+
+    Large inputs can be linked instead of copied (hardlinked inputs share
+    the upstream file: editing one edits both):
+        chainglass prepare-wf-stage specify --run-dir ./run --link hardlink
     """
-    result = prepare_wf_stage(stage_id, run_dir, dry_run=dry_run)
+    result = prepare_wf_stage(stage_id, run_dir, dry_run=dry_run, link=link)
 
     if result.success:
+        if not dry_run:
+            _compact_wf_run(run_dir / "wf-run.json")
         if dry_run:
             typer.echo(f"Dry-run: {stage_id} ready for preparation")
         else:
@@ -548,6 +1113,11 @@ def prepare_wf_stage_cmd(
             typer.echo("Files copied:")
             for file_info in result.files_copied:
                 typer.echo(f"  {file_info}")
+            if not dry_run:
+                typer.echo(
+                    f"Bytes copied: {result.bytes_copied} "
+                    f"(linked without copying: {result.bytes_linked})"
+                )
 
         if result.params_resolved:
             typer.echo("Parameters resolved:")
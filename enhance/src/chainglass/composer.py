@@ -1,17 +1,73 @@
 """Composer module for creating run folders from wf-spec.
 
 Implements the A.10 Compose Algorithm from the plan.
+
+Composition is split into planning and execution. plan_compose() turns a
+validated workflow into a ComposePlan: every directory, every file copy
+and every rendered stage-config.yaml a run needs. Each wf-spec source is
+stat'ed and (if small) read once per plan, however many stages copy it.
+execute_plan() materializes a plan into a run folder, creating
+directories parents-first and then running the file writes in batches on
+a thread pool (they are independent and I/O-bound).
+compose_many() reuses one parse, validation and plan for N runs;
+compose_runs() builds runs from a plan loaded some other way (see
+chainglass.bundle).
+
+Shared templates and schemas are copied into every stage folder by
+default. With link="hardlink", "symlink" or "reflink", each file whose
+content the plan copies more than once is written once per run to a
+content-addressed store, .blobs/<sha256> in the run folder, and linked
+into the stage folders (see chainglass.linking; falls back to copying).
+The stage folder layout is the same either way. Hardlinked files share
+one inode: an agent editing one in place edits it for every stage.
 """
 
-import json
+import hashlib
+import os
 import shutil
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from chainglass import yamlio
+from chainglass.cache import DEFAULT_MAX_ERRORS
+from chainglass.graph import StageGraph
+from chainglass.linking import BLOBS_DIRNAME, LINK_STRATEGIES, link_file
+from chainglass.manifest import file_sha256
+from chainglass.runindex import write_run_index
 from chainglass.validator import ValidationError, validate_or_raise
+from chainglass.wfrun import WfRunStore
+
+# Thread pool size for compose file operations (I/O-bound, so above the CPU count)
+COMPOSE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Below this many file operations a run is composed without a thread pool
+PARALLEL_MIN_FILES = 64
+
+# File operations per thread pool task
+FILE_OPS_PER_TASK = 32
+
+# wf-spec files up to this size are read once per plan and written from memory
+INLINE_COPY_MAX_BYTES = 1024 * 1024
+
+# Subdirectories created in every stage folder
+STAGE_SUBDIRS = (
+    "inputs",
+    "prompt",
+    "run/output-files",
+    "run/output-data",
+    "run/runtime-inputs",
+    "schemas",
+)
+
+
+# Next run ordinal per (output directory, date), so repeated composes skip the scan
+_next_ordinals: dict[tuple[Path, str], int] = {}
+_ordinal_lock = threading.Lock()
 
 
 class CompositionError(Exception):
@@ -20,7 +76,54 @@ class CompositionError(Exception):
     pass
 
 
-def compose(wf_spec_path: Path, output_path: Path) -> Path:
+@dataclass
+class ComposePlan:
+    """Everything compose creates for one workflow, independent of the run folder.
+
+    Paths in directories, copies and files are relative to the run folder.
+    """
+
+    wf_spec_path: Path
+    workflow: dict[str, Any]
+    stage_order: list[str]  # wf-run.json order (dependency levels, by id)
+    stage_configs: dict[str, dict[str, Any]] = field(default_factory=dict)  # by id
+    directories: list[Path] = field(default_factory=list)  # Parents before children
+    files: dict[Path, str] = field(default_factory=dict)  # Generated text files
+    copies: list[tuple[Path, Path]] = field(default_factory=list)  # (target, wf-spec source)
+    sources: dict[Path, "SourceFile"] = field(default_factory=dict)  # Each source read once
+    shared: dict[str, "SourceFile"] = field(default_factory=dict)  # sha256 -> copied 2+ times
+
+    @property
+    def file_count(self) -> int:
+        """Files written per run (excluding wf-run.json and run-index.json)."""
+        return len(self.files) + len(self.copies)
+
+    def add_copy(self, source: Path, target: Path) -> None:
+        """Plan a copy of a wf-spec file (read once per plan, however often it is copied)."""
+        if source not in self.sources:
+            self.sources[source] = _read_source(source)
+        self.copies.append((target, source))
+
+
+@dataclass
+class SourceFile:
+    """A wf-spec file to copy: its bytes (if small enough to keep) and metadata."""
+
+    path: Path
+    content: bytes | None  # None: larger than INLINE_COPY_MAX_BYTES, copied from disk
+    mode: int
+    times_ns: tuple[int, int]  # (atime_ns, mtime_ns), preserved like shutil.copy2
+    sha256: str  # Content digest: the file's name in .blobs/
+    size: int
+
+
+def compose(
+    wf_spec_path: Path,
+    output_path: Path,
+    use_cache: bool = False,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+    link: str = "copy",
+) -> Path:
     """Create a run folder from a wf-spec folder.
 
     Implements the A.10 Compose Algorithm:
@@ -36,11 +139,19 @@ def compose(wf_spec_path: Path, output_path: Path) -> Path:
        e. Copy stage-specific schemas from wf-spec/stages/{stage.id}/schemas/
        f. For each shared_template in wf.yaml:
           - Copy source to target location in stage
-    5. Return path to created run folder
+    5. Write run-index.json indexing every stage config
+    6. Return path to created run folder
+
+    Step 4 is planned up front (plan_compose) and its file operations run
+    on a thread pool (execute_plan). Use compose_many() for several runs.
 
     Args:
         wf_spec_path: Path to the wf-spec folder
         output_path: Path to the output directory
+        use_cache: Use the on-disk wf.yaml parse cache (see chainglass.cache)
+        max_errors: wf.yaml schema errors to report on failure (None or 0 = all)
+        link: How files shared by several stages are placed: "copy", or
+            "hardlink", "symlink" or "reflink" to one copy in .blobs/
 
     Returns:
         Path to the created run folder
@@ -49,141 +160,375 @@ def compose(wf_spec_path: Path, output_path: Path) -> Path:
         ValidationError: If wf-spec validation fails
         CompositionError: If composition fails
     """
+    _check_link(link)
     wf_spec_path = Path(wf_spec_path).resolve()
     output_path = Path(output_path).resolve()
 
     # Step 1: Validate and load wf.yaml
     try:
-        workflow = validate_or_raise(wf_spec_path)
+        workflow = validate_or_raise(wf_spec_path, use_cache=use_cache, max_errors=max_errors)
     except ValidationError:
         raise  # Re-raise validation errors as-is
 
-    # Step 2: Create run folder with unique ordinal
-    run_folder = _create_run_folder(output_path)
+    # Steps 2-5: Create the run folder from the plan
+    plan = plan_compose(wf_spec_path, workflow)
+    return _compose_run(plan, output_path, link=link)
 
-    try:
-        # Step 3: Write wf-run.json
-        _write_wf_run_json(run_folder, workflow, wf_spec_path)
-
-        # Step 4: Process each stage
-        stages = workflow.get("stages", [])
-        shared_templates = workflow.get("shared_templates", [])
-
-        # Sort stages by id for deterministic ordering
-        for stage in sorted(stages, key=lambda s: s["id"]):
-            _compose_stage(
-                run_folder=run_folder,
-                stage=stage,
-                wf_spec_path=wf_spec_path,
-                shared_templates=shared_templates,
-            )
 
+def compose_many(
+    wf_spec_path: Path,
+    output_path: Path,
+    count: int,
+    use_cache: bool = False,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+    workers: int = COMPOSE_WORKERS,
+    link: str = "copy",
+) -> list[Path]:
+    """Create count run folders from one wf-spec.
+
+    wf.yaml is parsed, validated and planned once; the runs share one
+    thread pool. All-or-nothing: if any run fails, every run folder
+    created by this call is removed.
+
+    Args:
+        wf_spec_path: Path to the wf-spec folder
+        output_path: Path to the output directory
+        count: Number of runs to create
+        use_cache: Use the on-disk wf.yaml parse cache (see chainglass.cache)
+        max_errors: wf.yaml schema errors to report on failure (None or 0 = all)
+        workers: Threads for file operations
+        link: How files shared by several stages are placed (see compose())
+
+    Returns:
+        Paths to the created run folders, in creation order
+
+    Raises:
+        ValidationError: If wf-spec validation fails
+        CompositionError: If composition fails
+    """
+    _check_link(link)
+    wf_spec_path = Path(wf_spec_path).resolve()
+    workflow = validate_or_raise(wf_spec_path, use_cache=use_cache, max_errors=max_errors)
+    plan = plan_compose(wf_spec_path, workflow)
+    return compose_runs(plan, output_path, count, workers=workers, link=link)
+
+
+def compose_runs(
+    plan: ComposePlan,
+    output_path: Path,
+    count: int = 1,
+    workers: int = COMPOSE_WORKERS,
+    link: str = "copy",
+) -> list[Path]:
+    """Create count run folders from an existing plan (e.g. a loaded bundle).
+
+    All-or-nothing, like compose_many().
+
+    Args:
+        plan: Plan from plan_compose() or chainglass.bundle.load_bundle()
+        output_path: Path to the output directory
+        count: Number of runs to create
+        workers: Threads for file operations (shared by all runs when count > 1)
+        link: How files shared by several stages are placed (see compose())
+
+    Returns:
+        Paths to the created run folders, in creation order
+
+    Raises:
+        CompositionError: If composition fails
+    """
+    _check_link(link)
+    output_path = Path(output_path).resolve()
+    if count == 1:
+        return [_compose_run(plan, output_path, link=link)]
+
+    run_folders: list[Path] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        try:
+            for _ in range(count):
+                run_folders.append(_compose_run(plan, output_path, pool, link))
+        except BaseException:  # Including Ctrl-C: never leave a partial batch
+            for run_folder in run_folders:
+                shutil.rmtree(run_folder, ignore_errors=True)
+            raise
+    return run_folders
+
+
+def plan_compose(wf_spec_path: Path, workflow: dict[str, Any]) -> ComposePlan:
+    """Plan every directory, copy and generated file for a validated workflow.
+
+    Source files are checked here, once per plan; sources that don't exist
+    are skipped (as compose always has).
+    """
+    wf_spec_path = Path(wf_spec_path).resolve()
+    stages = sorted(workflow.get("stages", []), key=lambda s: s["id"])
+    shared_templates = workflow.get("shared_templates", [])
+
+    # List stages in execution order: dependency levels, by id within a level
+    # (validation has already rejected dependency cycles)
+    stage_order = StageGraph.from_workflow({"stages": stages}).order()
+    plan = ComposePlan(wf_spec_path=wf_spec_path, workflow=workflow, stage_order=stage_order)
+
+    # Shared templates are the same for every stage: resolve them once
+    templates = [
+        (wf_spec_path / template["source"], Path(template["target"]))
+        for template in shared_templates
+        if (wf_spec_path / template["source"]).exists()
+    ]
+
+    directories = {Path("stages")}
+    for stage in stages:
+        stage_id = stage["id"]
+        stage_dir = Path("stages") / stage_id
+        spec_stage_dir = wf_spec_path / "stages" / stage_id
+
+        # Step 4a-b: Stage folder and subdirectories
+        directories.add(stage_dir)
+        directories.update(stage_dir / subdir for subdir in STAGE_SUBDIRS)
+
+        # Step 4c: Extract stage config (written as stage-config.yaml)
+        stage_config = _stage_config(stage)
+        plan.stage_configs[stage_id] = stage_config
+        plan.files[stage_dir / "stage-config.yaml"] = _render_stage_config(
+            stage_config, wf_spec_path
+        )
+
+        # Step 4d: Copy prompt/main.md
+        src_prompt = spec_stage_dir / "prompt" / "main.md"
+        if src_prompt.exists():
+            plan.add_copy(src_prompt, stage_dir / "prompt" / "main.md")
+
+        # Step 4e: Copy stage-specific schemas
+        src_schemas_dir = spec_stage_dir / "schemas"
+        if src_schemas_dir.exists():
+            for schema_file in sorted(src_schemas_dir.iterdir()):
+                if schema_file.is_file():
+                    plan.add_copy(schema_file, stage_dir / "schemas" / schema_file.name)
+
+        # Step 4f: Copy shared templates
+        for src, target in templates:
+            plan.add_copy(src, stage_dir / target)
+            directories.add(stage_dir / target.parent)
+
+    # One copy per target: when a stage schema and a shared template share a
+    # target, the one planned last (the template) wins, as it did with copy2
+    targets = dict(plan.copies)
+    plan.copies = list(targets.items())
+    used = set(targets.values())
+    plan.sources = {path: source for path, source in plan.sources.items() if path in used}
+
+    # Content copied into more than one place can be linked from .blobs/
+    seen: set[str] = set()
+    for _, source in plan.copies:
+        source_file = plan.sources[source]
+        if source_file.sha256 in seen:
+            plan.shared.setdefault(source_file.sha256, source_file)
+        seen.add(source_file.sha256)
+
+    # Every ancestor inside the run folder, parents first
+    for directory in list(directories):
+        directories.update(p for p in directory.parents if p != Path("."))
+    plan.directories = sorted(directories, key=lambda p: (len(p.parts), str(p)))
+    return plan
+
+
+def execute_plan(
+    plan: ComposePlan,
+    run_folder: Path,
+    pool: ThreadPoolExecutor | None = None,
+    link: str = "copy",
+) -> None:
+    """Materialize a plan into an existing, empty run folder.
+
+    Args:
+        plan: Plan from plan_compose()
+        run_folder: Run folder to populate
+        pool: Thread pool for file operations (default: a pool sized
+            COMPOSE_WORKERS for large plans, none for small ones)
+        link: How files shared by several stages are placed (see compose())
+    """
+    # Step 3: Write wf-run.json
+    _write_wf_run_json(run_folder, plan)
+
+    # Step 4: Directories parents-first, one mkdir each
+    for directory in plan.directories:
+        os.mkdir(run_folder / directory)
+
+    # Shared content once per run, before anything links to it
+    blobs_dir = run_folder / BLOBS_DIRNAME
+    if link != "copy" and plan.shared:
+        os.mkdir(blobs_dir)
+        for digest, source_file in plan.shared.items():
+            _copy_source(source_file, blobs_dir / digest)
+
+    # Then every file independently: generated configs and wf-spec copies,
+    # in batches so each pool task amortizes its scheduling overhead
+    operations: list[tuple[Path, str | Path]] = list(plan.files.items()) + plan.copies
+    batches = [
+        operations[i : i + FILE_OPS_PER_TASK]
+        for i in range(0, len(operations), FILE_OPS_PER_TASK)
+    ]
+
+    def run_batch(batch: list[tuple[Path, str | Path]]) -> None:
+        for target, content in batch:
+            if isinstance(content, str):
+                (run_folder / target).write_text(content)
+                continue
+            source_file = plan.sources[content]
+            if link != "copy" and source_file.sha256 in plan.shared:
+                link_file(blobs_dir / source_file.sha256, run_folder / target, link, replace=False)
+            else:
+                _copy_source(source_file, run_folder / target)
+
+    if pool is None and len(operations) < PARALLEL_MIN_FILES:
+        for batch in batches:
+            run_batch(batch)
+    elif pool is None:
+        with ThreadPoolExecutor(max_workers=COMPOSE_WORKERS) as own_pool:
+            list(own_pool.map(run_batch, batches))
+    else:
+        list(pool.map(run_batch, batches))  # Re-raises the first failure
+
+    # Step 5: Write run-index.json (after the configs, whose fingerprints it records)
+    write_run_index(run_folder, plan.stage_configs)
+
+
+def _read_source(path: Path) -> SourceFile:
+    """Stat and hash a wf-spec file and, if small, keep its content in memory."""
+    stat_result = path.stat()
+    if stat_result.st_size <= INLINE_COPY_MAX_BYTES:
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+    else:
+        content = None
+        digest = file_sha256(path)
+    return SourceFile(
+        path=path,
+        content=content,
+        mode=stat.S_IMODE(stat_result.st_mode),
+        times_ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns),
+        sha256=digest,
+        size=stat_result.st_size,
+    )
+
+
+def _copy_source(source: SourceFile, target: Path) -> None:
+    """Copy a wf-spec file with its mode and times (like shutil.copy2, without xattrs)."""
+    if source.content is None:
+        shutil.copy2(source.path, target)
+        return
+    with open(target, "wb") as f:
+        f.write(source.content)
+    os.chmod(target, source.mode)
+    os.utime(target, ns=source.times_ns)
+
+
+def _check_link(link: str) -> None:
+    """Raise CompositionError for an unknown link strategy."""
+    if link not in LINK_STRATEGIES:
+        raise CompositionError(
+            f"Unknown link strategy: {link}\n"
+            f"Action: Use one of: {', '.join(LINK_STRATEGIES)}."
+        )
+
+
+def _compose_run(
+    plan: ComposePlan,
+    output_path: Path,
+    pool: ThreadPoolExecutor | None = None,
+    link: str = "copy",
+) -> Path:
+    """Create one run folder from a plan (removed again if anything fails)."""
+    # Step 2: Create run folder with unique ordinal
+    try:
+        run_folder = _create_run_folder(output_path)
+    except OSError as e:
+        raise CompositionError(
+            f"Cannot create a run folder in {output_path}: {e}\n"
+            f"Action: Check that the output directory is writable and has free space."
+        ) from e
+    try:
+        execute_plan(plan, run_folder, pool, link)
     except Exception as e:
         # Clean up on failure
         if run_folder.exists():
             shutil.rmtree(run_folder)
         raise CompositionError(f"Failed to compose run folder: {e}") from e
-
     return run_folder
 
 
 def _create_run_folder(output_path: Path) -> Path:
-    """Create a unique run folder with date-ordinal naming."""
+    """Create a unique run folder with date-ordinal naming.
+
+    The next ordinal comes from one scan of output_path (the highest
+    run-{date}-NNN plus one), remembered per process so later composes
+    skip the scan. os.mkdir is the atomic claim: if another process
+    created that folder first, rescan and try the next ordinal, so
+    concurrent composes into the same directory never collide.
+    """
     output_path.mkdir(parents=True, exist_ok=True)
 
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    ordinal = 1
+    prefix = f"run-{today}-"
+    key = (output_path, today)
+
+    with _ordinal_lock:
+        ordinal = _next_ordinals.get(key) or _scan_next_ordinal(output_path, prefix)
+        while True:
+            run_folder = output_path / f"{prefix}{ordinal:03d}"
+            try:
+                os.mkdir(run_folder)
+                break
+            except FileExistsError:
+                # Taken by a concurrent compose (or created by hand)
+                ordinal = max(ordinal + 1, _scan_next_ordinal(output_path, prefix))
+        _next_ordinals[key] = ordinal + 1
+    return run_folder
 
-    # Find unique ordinal
-    while True:
-        run_name = f"run-{today}-{ordinal:03d}"
-        run_folder = output_path / run_name
-        if not run_folder.exists():
-            break
-        ordinal += 1
 
-    run_folder.mkdir(parents=True)
-    return run_folder
+def _scan_next_ordinal(output_path: Path, prefix: str) -> int:
+    """One past the highest ordinal of the {prefix}NNN entries in output_path."""
+    highest = 0
+    with os.scandir(output_path) as entries:
+        for entry in entries:
+            suffix = entry.name[len(prefix) :]
+            if entry.name.startswith(prefix) and suffix.isdigit():
+                highest = max(highest, int(suffix))
+    return highest + 1
 
 
-def _write_wf_run_json(run_folder: Path, workflow: dict[str, Any], wf_spec_path: Path) -> None:
+def _write_wf_run_json(run_folder: Path, plan: ComposePlan) -> None:
     """Write wf-run.json with run metadata."""
-    metadata = workflow.get("metadata", {})
-    stages = workflow.get("stages", [])
+    # Also starts wf-run.events.jsonl with a snapshot of the initial state
+    WfRunStore(run_folder / "wf-run.json").create(initial_wf_run(run_folder.name, plan))
+
 
-    wf_run = {
-        "run_id": run_folder.name,
+def initial_wf_run(run_id: str, plan: ComposePlan) -> dict[str, Any]:
+    """The wf-run.json document compose writes for a new run."""
+    metadata = plan.workflow.get("metadata", {})
+
+    return {
+        "run_id": run_id,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "workflow": {
             "name": metadata.get("name", "unknown"),
-            "version": workflow.get("version", "1.0"),
-            "source": str(wf_spec_path),
+            "version": plan.workflow.get("version", "1.0"),
+            "source": str(plan.wf_spec_path),
         },
         "stages": [
             {
-                "id": stage["id"],
+                "id": stage_id,
                 "status": "pending",
                 "started_at": None,
                 "completed_at": None,
             }
-            for stage in sorted(stages, key=lambda s: s["id"])
+            for stage_id in plan.stage_order
         ],
     }
 
-    wf_run_path = run_folder / "wf-run.json"
-    with open(wf_run_path, "w") as f:
-        json.dump(wf_run, f, indent=2)
-
 
-def _compose_stage(
-    run_folder: Path,
-    stage: dict[str, Any],
-    wf_spec_path: Path,
-    shared_templates: list[dict[str, str]],
-) -> None:
-    """Compose a single stage in the run folder."""
-    stage_id = stage["id"]
-    stage_dir = run_folder / "stages" / stage_id
-
-    # Step 4a-b: Create stage folder and subdirectories
-    subdirs = [
-        "inputs",
-        "prompt",
-        "run/output-files",
-        "run/output-data",
-        "run/runtime-inputs",
-        "schemas",
-    ]
-    for subdir in subdirs:
-        (stage_dir / subdir).mkdir(parents=True, exist_ok=True)
-
-    # Step 4c: Extract stage config and write to stage-config.yaml
-    _write_stage_config(stage_dir, stage, wf_spec_path)
-
-    # Step 4d: Copy prompt/main.md
-    src_prompt = wf_spec_path / "stages" / stage_id / "prompt" / "main.md"
-    dst_prompt = stage_dir / "prompt" / "main.md"
-    if src_prompt.exists():
-        shutil.copy2(src_prompt, dst_prompt)
-
-    # Step 4e: Copy stage-specific schemas
-    src_schemas_dir = wf_spec_path / "stages" / stage_id / "schemas"
-    if src_schemas_dir.exists():
-        for schema_file in sorted(src_schemas_dir.iterdir()):
-            if schema_file.is_file():
-                shutil.copy2(schema_file, stage_dir / "schemas" / schema_file.name)
-
-    # Step 4f: Copy shared templates
-    for template in shared_templates:
-        src = wf_spec_path / template["source"]
-        dst = stage_dir / template["target"]
-        if src.exists():
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-
-
-def _write_stage_config(stage_dir: Path, stage: dict[str, Any], wf_spec_path: Path) -> None:
-    """Extract stage config from wf.yaml and write as stage-config.yaml."""
+def _stage_config(stage: dict[str, Any]) -> dict[str, Any]:
+    """Extract stage config from a wf.yaml stage definition."""
     # Extract relevant fields for stage config
     stage_config = {
         "id": stage["id"],
@@ -202,11 +547,17 @@ def _write_stage_config(stage_dir: Path, stage: dict[str, Any], wf_spec_path: Pa
     if "output_parameters" in stage:
         stage_config["output_parameters"] = stage["output_parameters"]
 
-    # Write with header comment
-    config_path = stage_dir / "stage-config.yaml"
-    with open(config_path, "w") as f:
-        f.write(f"# Extracted from wf.yaml during compose\n")
-        f.write(f"# Source: {wf_spec_path}/wf.yaml\n")
-        f.write(f"# Stage: {stage['id']}\n\n")
-        # Use sort_keys=False to preserve logical field ordering
-        yaml.dump(stage_config, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    return stage_config
+
+
+def _render_stage_config(stage_config: dict[str, Any], wf_spec_path: Path) -> str:
+    """stage-config.yaml text: header comment plus the config as YAML."""
+    header = (
+        f"# Extracted from wf.yaml during compose\n"
+        f"# Source: {wf_spec_path}/wf.yaml\n"
+        f"# Stage: {stage_config['id']}\n\n"
+    )
+    # Use sort_keys=False to preserve logical field ordering
+    return header + yamlio.dump(
+        stage_config, default_flow_style=False, sort_keys=False, allow_unicode=True
+    )
@@ -0,0 +1,213 @@
+"""JSON document loading for stage outputs.
+
+A DocumentStore reads and parses each JSON file at most once, so one
+validate_stage() call can hand the same parsed object to schema
+validation, output parameter extraction and accept/handback inspection.
+
+A JsonCache is the long-lived counterpart used by Stage objects: a
+process-wide LRU bounded by the total size of the cached files, whose
+entries are keyed by (path, mtime_ns, size) and revalidated with one stat
+per lookup, so rewritten outputs are re-read and memory stays bounded.
+
+Parsing uses orjson when it is installed. Anything orjson rejects is
+re-parsed with the standard json module, so accepted documents, parsed
+values and json.JSONDecodeError messages are exactly those of json.loads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Default budget for the shared JsonCache (sum of cached file sizes)
+JSON_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def loads(content: bytes | str) -> Any:
+    """Parse JSON (orjson fast path, json.loads semantics).
+
+    Raises:
+        json.JSONDecodeError: If content is not valid JSON
+    """
+    if HAS_ORJSON:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass  # NaN, >64-bit ints, etc. - let json decide (and word the error)
+    return json.loads(content)
+
+
+class DocumentStore:
+    """Per-call cache of parsed JSON files: each path is read and parsed once.
+
+    Parse failures are remembered too, so a broken file is not re-read by
+    every consumer. Counters make the I/O visible to benchmarks.
+
+    Args:
+        track_digests: Also record the sha256 of every file read
+    """
+
+    def __init__(self, track_digests: bool = False) -> None:
+        self.track_digests = track_digests
+        self._documents: dict[Path, Any] = {}
+        self._errors: dict[Path, json.JSONDecodeError] = {}
+        self._digests: dict[Path, str] = {}
+        self._sizes: dict[Path, int] = {}
+        self.requests = 0  # load() calls
+        self.parse_count = 0  # Files actually parsed
+        self.bytes_read = 0  # Bytes actually read from disk
+        self.bytes_requested = 0  # Bytes a read-per-request approach would read
+
+    def load(self, path: Path) -> Any:
+        """Return the parsed JSON document at path.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        key = Path(path).resolve()
+        self.requests += 1
+        if key in self._documents:
+            self.bytes_requested += self._sizes[key]
+            return self._documents[key]
+        if key in self._errors:
+            self.bytes_requested += self._sizes[key]
+            raise self._errors[key]
+
+        content = key.read_bytes()
+        self._sizes[key] = len(content)
+        self.bytes_read += len(content)
+        self.bytes_requested += len(content)
+        if self.track_digests:
+            self._digests[key] = hashlib.sha256(content).hexdigest()
+
+        self.parse_count += 1
+        try:
+            document = loads(content)
+        except json.JSONDecodeError as e:
+            self._errors[key] = e
+            raise
+        self._documents[key] = document
+        return document
+
+    def digest(self, path: Path) -> str | None:
+        """sha256 of the bytes that were parsed (None if not read or not tracked)."""
+        return self._digests.get(Path(path).resolve())
+
+    def stats(self) -> dict[str, int]:
+        """I/O counters for diagnostics and benchmarks."""
+        return {
+            "requests": self.requests,
+            "parse_count": self.parse_count,
+            "bytes_read": self.bytes_read,
+            "bytes_requested": self.bytes_requested,
+        }
+
+
+def file_fingerprint(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+class JsonCache:
+    """Size-bounded LRU cache of parsed JSON files, revalidated by stat.
+
+    An entry is reused only while the file's (mtime_ns, size) is unchanged;
+    otherwise the file is re-read. Least recently used entries are evicted
+    once the cached files exceed max_bytes in total (a file larger than the
+    whole budget is returned but not cached). Thread-safe.
+
+    Cached documents are shared: callers must not mutate them.
+
+    Args:
+        max_bytes: Budget for the sum of cached file sizes
+    """
+
+    def __init__(self, max_bytes: int = JSON_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Path, tuple[tuple[int, int], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, path: Path) -> Any:
+        """Return the parsed JSON document at path (re-read if it changed).
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        key = Path(path).resolve()
+        stat_result = key.stat()
+        fingerprint = (stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        content = key.read_bytes()
+        document = loads(content)
+        # Fingerprint of what was read (the file may have changed since stat)
+        fingerprint = file_fingerprint(key)
+        if fingerprint is None or fingerprint[1] != len(content):
+            return document  # Rewritten mid-read - don't cache
+
+        with self._lock:
+            self._discard(key)
+            if len(content) <= self.max_bytes:
+                self._entries[key] = (fingerprint, document)
+                self.total_bytes += len(content)
+                while self.total_bytes > self.max_bytes:
+                    (_, size), _ = self._entries.popitem(last=False)[1]
+                    self.total_bytes -= size
+                    self.evictions += 1
+        return document
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Drop one file's entry, or every entry if path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                self._discard(Path(path).resolve())
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _discard(self, key: Path) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[0][1]  # fingerprint size
+
+
+# Shared by every Stage in the process
+shared_json_cache = JsonCache()
@@ -0,0 +1,289 @@
+"""Compose cost estimates: what a run will create, and how long it will take.
+
+estimate_compose() walks a ComposePlan (from plan_compose() or a bundle)
+without touching the filesystem and counts, per stage and per run, the
+directories, files and bytes compose will create. With link != "copy",
+shared files are counted once in .blobs/ plus one link per stage.
+
+CostModel projects a wall-clock time from those counts with per-operation
+costs: one mkdir, one file written (create, chmod/utime, close), one
+byte written, one link, one stat and one fsync. The defaults were measured on local ext4
+(Python-level overhead included, as compose pays it too);
+CostModel.calibrate() measures the same operations in a scratch folder on
+the target filesystem, which is what matters on network mounts. It writes
+a few tens of MiB, so the CLI only calibrates for `compose --dry-run
+--stats`, not for every real compose. The
+projection counts filesystem operations only, serially: Python and JSON
+overhead make local composes somewhat slower than projected, while the
+thread pool makes high-latency filesystems faster.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from chainglass.composer import ComposePlan, CompositionError, initial_wf_run
+from chainglass.linking import LINK_STRATEGIES
+from chainglass.runindex import build_run_index
+
+# Operations timed per kind by CostModel.calibrate()
+CALIBRATION_OPS = 200
+
+# Calibration passes per operation kind (the fastest is kept)
+CALIBRATION_ROUNDS = 3
+
+# fsyncs timed per calibration round
+CALIBRATION_FSYNCS = 5
+
+# Size of the file written to time per-byte cost
+CALIBRATION_BYTES = 8 * 1024 * 1024
+
+# Files compose writes at the run root besides run-index.json and .blobs/
+_RUN_METADATA_FILES = ("wf-run.json", "wf-run.events.jsonl", "wf-run.json.lock")
+
+
+@dataclass
+class CostModel:
+    """Seconds per filesystem operation."""
+
+    mkdir: float = 25e-6
+    file: float = 40e-6  # Create, write, chmod/utime and close one file (excluding bytes)
+    byte: float = 0.4e-9  # ~2.5 GB/s
+    link: float = 25e-6  # Hardlink (reflinks cost about a file)
+    symlink: float = 45e-6  # Including the relative target compose computes
+    stat: float = 5e-6  # run-index.json fingerprints each stage-config.yaml
+    fsync: float = 2e-3  # wf-run.json is fsync'ed once per run
+    calibrated_in: str | None = None  # Directory measured in (None: built-in defaults)
+
+    @classmethod
+    def calibrate(
+        cls, directory: Path, ops: int = CALIBRATION_OPS, rounds: int = CALIBRATION_ROUNDS
+    ) -> "CostModel":
+        """Measure each operation in a scratch folder created (and removed) in directory.
+
+        Each operation kind is timed over ops operations, rounds times; the
+        fastest round is kept (the first is often slowed by cold caches).
+
+        Raises:
+            OSError: If the scratch folder cannot be created
+        """
+        scratch = Path(tempfile.mkdtemp(dir=directory, prefix=".chainglass-calibrate-"))
+        payload = os.urandom(CALIBRATION_BYTES)
+        times_ns = (time.time_ns(), time.time_ns())
+        kinds = ("mkdir", "file", "byte", "link", "symlink", "stat", "fsync")
+        best = dict.fromkeys(kinds, float("inf"))
+        try:
+            for round_number in range(rounds):
+                round_dir = scratch / str(round_number)
+                os.mkdir(round_dir)
+
+                start = time.perf_counter()
+                for i in range(ops):
+                    os.mkdir(round_dir / f"d{i}")
+                best["mkdir"] = min(best["mkdir"], (time.perf_counter() - start) / ops)
+
+                start = time.perf_counter()
+                for i in range(ops):
+                    path = round_dir / f"d{i}" / "f"
+                    with open(path, "wb") as f:
+                        f.write(b"x")
+                    os.chmod(path, 0o644)
+                    os.utime(path, ns=times_ns)
+                best["file"] = min(best["file"], (time.perf_counter() - start) / ops)
+
+                start = time.perf_counter()
+                with open(round_dir / "bytes", "wb") as f:
+                    f.write(payload)
+                elapsed = max(time.perf_counter() - start - best["file"], 0.0)
+                best["byte"] = min(best["byte"], elapsed / CALIBRATION_BYTES)
+
+                try:
+                    start = time.perf_counter()
+                    for i in range(ops):
+                        os.link(round_dir / "d0" / "f", round_dir / f"d{i}" / "l")
+                    best["link"] = min(best["link"], (time.perf_counter() - start) / ops)
+                except OSError:
+                    best["link"] = best["file"]  # No hardlinks here: compose copies instead
+
+                try:
+                    start = time.perf_counter()
+                    for i in range(ops):
+                        target = round_dir / f"d{i}" / "s"
+                        os.symlink(os.path.relpath(round_dir / "d0" / "f", target.parent), target)
+                    best["symlink"] = min(best["symlink"], (time.perf_counter() - start) / ops)
+                except OSError:
+                    best["symlink"] = best["file"]
+
+                start = time.perf_counter()
+                for i in range(ops):
+                    os.stat(round_dir / f"d{i}" / "f")
+                best["stat"] = min(best["stat"], (time.perf_counter() - start) / ops)
+
+                start = time.perf_counter()
+                with open(round_dir / "fsync", "wb") as f:
+                    for _ in range(CALIBRATION_FSYNCS):
+                        f.write(b"x")
+                        f.flush()
+                        os.fsync(f.fileno())
+                elapsed = time.perf_counter() - start
+                best["fsync"] = min(best["fsync"], elapsed / CALIBRATION_FSYNCS)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        return cls(**best, calibrated_in=str(directory))
+
+    def seconds(
+        self,
+        directories: int,
+        files: int,
+        bytes_written: int,
+        links: int,
+        stats: int = 0,
+        fsyncs: int = 0,
+        link: str = "hardlink",
+    ) -> float:
+        """Projected serial time for the given operation counts (links made with link)."""
+        link_cost = {"hardlink": self.link, "symlink": self.symlink}.get(link, self.file)
+        return (
+            directories * self.mkdir
+            + files * self.file
+            + bytes_written * self.byte
+            + links * link_cost
+            + stats * self.stat
+            + fsyncs * self.fsync
+        )
+
+
+@dataclass
+class StageStats:
+    """What compose creates for one stage folder (or, as stage_id "(run)", the run root)."""
+
+    stage_id: str
+    directories: int = 0
+    files: int = 0  # Files written (generated configs and copies)
+    bytes: int = 0  # Bytes written
+    links: int = 0  # Files linked from .blobs/ (link != "copy")
+
+
+@dataclass
+class ComposeStats:
+    """Estimated output of composing one plan count times."""
+
+    link: str
+    count: int
+    stages: list[StageStats] = field(default_factory=list)
+    run: StageStats = field(default_factory=lambda: StageStats(stage_id="(run)"))
+    stat_calls: int = 0  # Per run, besides creating files
+    fsyncs: int = 0  # Per run
+
+    @property
+    def per_run(self) -> StageStats:
+        """Totals for one run folder."""
+        total = StageStats(stage_id="(total)")
+        for part in [*self.stages, self.run]:
+            total.directories += part.directories
+            total.files += part.files
+            total.bytes += part.bytes
+            total.links += part.links
+        return total
+
+    def projected_seconds(self, model: CostModel) -> float:
+        """Projected time for one run folder."""
+        total = self.per_run
+        return model.seconds(
+            total.directories,
+            total.files,
+            total.bytes,
+            total.links,
+            stats=self.stat_calls,
+            fsyncs=self.fsyncs,
+            link=self.link,
+        )
+
+
+def estimate_compose(plan: ComposePlan, link: str = "copy", count: int = 1) -> ComposeStats:
+    """Count the directories, files and bytes composing plan will create.
+
+    Reads nothing from disk: sizes come from the plan. Metadata file sizes
+    (wf-run.json, its event log, run-index.json) are rendered in memory and
+    may differ by a few bytes from the real ones (timestamps, run id).
+
+    Args:
+        plan: Plan from plan_compose() or chainglass.bundle.load_bundle()
+        link: Link strategy compose will use (see composer.compose())
+        count: Number of runs (compose --count)
+
+    Raises:
+        CompositionError: If link is not one of LINK_STRATEGIES (as compose would)
+    """
+    if link not in LINK_STRATEGIES:
+        raise CompositionError(
+            f"Unknown link strategy: {link}\n"
+            f"Action: Use one of: {', '.join(LINK_STRATEGIES)}."
+        )
+    stats = ComposeStats(link=link, count=count)
+    by_stage: dict[str, StageStats] = {}
+
+    def part_for(path: Path) -> StageStats:
+        if len(path.parts) >= 2 and path.parts[0] == "stages":
+            stage_id = path.parts[1]
+            if stage_id not in by_stage:
+                by_stage[stage_id] = StageStats(stage_id=stage_id)
+            return by_stage[stage_id]
+        return stats.run
+
+    stats.run.directories += 1  # The run folder itself
+    for directory in plan.directories:
+        part_for(directory).directories += 1
+
+    for target, text in plan.files.items():
+        part = part_for(target)
+        part.files += 1
+        part.bytes += len(text.encode())
+
+    linked = link != "copy" and bool(plan.shared)
+    for target, source in plan.copies:
+        part = part_for(target)
+        source_file = plan.sources[source]
+        if linked and source_file.sha256 in plan.shared:
+            part.links += 1
+        else:
+            part.files += 1
+            part.bytes += source_file.size
+
+    if linked:
+        stats.run.directories += 1  # .blobs/
+        stats.run.files += len(plan.shared)
+        stats.run.bytes += sum(source.size for source in plan.shared.values())
+
+    # Run metadata, rendered as compose writes it
+    run_id = "run-0000-00-00-000"
+    wf_run = initial_wf_run(run_id, plan)
+    snapshot = {"ts": wf_run["created_at"], "event": "snapshot", "wf_run": wf_run}
+    fingerprints = {  # Realistic widths: (mtime_ns, size) of each stage-config.yaml
+        stage_id: (time.time_ns(), len(plan.files[Path("stages", stage_id, "stage-config.yaml")]))
+        for stage_id in plan.stage_configs
+    }
+    index = build_run_index(Path(run_id), plan.stage_configs, fingerprints=fingerprints)
+    stats.stat_calls = len(fingerprints)
+    stats.fsyncs = 1
+    stats.run.files += len(_RUN_METADATA_FILES) + 1
+    stats.run.bytes += (
+        len(json.dumps({**wf_run, "event_log_offset": 0}, indent=2))
+        + len(json.dumps(snapshot, separators=(",", ":"), default=str)) + 1
+        + len(json.dumps(index, separators=(",", ":"), default=str))
+    )
+
+    stats.stages = [by_stage[stage_id] for stage_id in plan.stage_order if stage_id in by_stage]
+    return stats
+
+
+def calibration_dir(output_path: Path) -> Path:
+    """Nearest existing ancestor of output_path (output_path itself is never used)."""
+    candidate = Path(output_path).resolve().parent
+    while not candidate.is_dir() and candidate != candidate.parent:
+        candidate = candidate.parent
+    return candidate
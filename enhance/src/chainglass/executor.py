@@ -0,0 +1,329 @@
+"""Executor module for the execute command.
+
+Drives a whole run folder: walks the stage dependency graph and, for each
+stage whose upstream stages are completed, performs
+
+    prepare-wf-stage -> preflight -> accept -> agent command -> finalize
+
+Up to `jobs` stages run concurrently. The agent command is the only
+external step; it runs as an asyncio subprocess so several agents can
+work in parallel. prepare/preflight/accept/finalize run in-process in
+worker threads, so they never stall the event loop that drains agent
+output; WfRunStore's lock keeps their wf-run.json updates from
+overlapping.
+
+The agent command is a shell command. {stage_id}, {stage_dir} and
+{run_dir} are replaced with shell-quoted values, and the same values are
+exported as CHAINGLASS_STAGE_ID, CHAINGLASS_STAGE_DIR and
+CHAINGLASS_RUN_DIR. It runs with the stage folder as working directory;
+its combined stdout/stderr is written to run/agent.log and streamed to
+the progress callback line by line.
+"""
+
+import asyncio
+import os
+import shlex
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from chainglass.graph import CycleError
+from chainglass.linking import DEFAULT_LINK_STRATEGY
+from chainglass.preflight import preflight
+from chainglass.preparer import prepare_wf_stage
+from chainglass.run import Run
+from chainglass.stage import Stage
+from chainglass.wfrun import WfRunStore
+
+# Agent output is read in chunks of this size and split into lines
+AGENT_READ_SIZE = 64 * 1024
+
+# Progress callback: (stage_id, event, message)
+# Events: "start", "prepared", "agent", "output", "completed", "failed", "blocked", "skipped"
+EventCallback = Callable[[str, str, str], None]
+
+
+@dataclass
+class StageExecution:
+    """Outcome of one stage in an execute run."""
+
+    stage_id: str
+    status: Literal["completed", "failed", "blocked", "skipped"]
+    exit_code: int | None = None  # Agent exit code (None if the agent never ran)
+    duration_ms: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ExecutionResult:
+    """Result of executing a run folder."""
+
+    status: Literal["pass", "fail"]
+    run_dir: str
+    stages: list[StageExecution] = field(default_factory=list)
+    duration_ms: float = 0.0
+    summary: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON-serializable dict."""
+        return {
+            "status": self.status,
+            "run_dir": self.run_dir,
+            "stages": [asdict(s) for s in self.stages],
+            "duration_ms": self.duration_ms,
+            "summary": self.summary,
+        }
+
+
+def execute(
+    run_dir: Path,
+    agent_cmd: str,
+    jobs: int = 1,
+    on_event: EventCallback | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
+) -> ExecutionResult:
+    """
+    Execute every pending stage of a run folder in dependency order.
+
+    Stages already completed (status "completed" or output-params.json
+    published) are skipped. When a stage fails, every stage downstream of
+    it is reported as blocked; independent stages keep running.
+
+    Args:
+        run_dir: Path to the run directory (containing wf-run.json and stages/)
+        agent_cmd: Shell command that performs a stage's work
+        jobs: Maximum number of stages running at once
+        on_event: Optional progress callback (stage_id, event, message)
+        link: How prepare places upstream outputs (see chainglass.linking)
+
+    Returns:
+        ExecutionResult with one StageExecution per stage, in run order
+
+    Raises:
+        CycleError: If the stage dependencies form a cycle
+    """
+    start = time.perf_counter()
+    run = Run(run_dir)
+    emit = on_event or (lambda stage_id, event, message: None)
+
+    try:
+        records = asyncio.run(_execute(run, agent_cmd, max(1, jobs), emit, link))
+    finally:
+        # Fold this run's transitions from wf-run.events.jsonl into wf-run.json
+        WfRunStore(run.path / "wf-run.json").compact()
+
+    ordered = [records[stage_id] for stage_id in run.stage_ids if stage_id in records]
+    counts: dict[str, int] = {}
+    for record in ordered:
+        counts[record.status] = counts.get(record.status, 0) + 1
+    failed = counts.get("failed", 0) + counts.get("blocked", 0)
+    summary = ", ".join(
+        f"{counts[s]} {s}" for s in ("completed", "skipped", "failed", "blocked") if s in counts
+    )
+
+    return ExecutionResult(
+        status="fail" if failed else "pass",
+        run_dir=str(run.path),
+        stages=ordered,
+        duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        summary=summary or "no stages",
+    )
+
+
+async def _execute(
+    run: Run, agent_cmd: str, jobs: int, emit: EventCallback, link: str
+) -> dict[str, StageExecution]:
+    """Schedule stages as their upstreams complete, at most `jobs` at a time."""
+    graph = run.graph
+    cycle = graph.find_cycle()
+    if cycle:
+        raise CycleError(cycle)
+
+    records: dict[str, StageExecution] = {}
+    completed = run.completed()
+    for stage_id in graph.stage_ids:
+        if stage_id in completed:
+            records[stage_id] = StageExecution(stage_id=stage_id, status="skipped")
+            emit(stage_id, "skipped", "already completed")
+
+    def block_downstream(stage_id: str, reason: str) -> None:
+        pending = list(graph.downstream[stage_id])
+        while pending:
+            downstream_id = pending.pop()
+            if downstream_id in records:
+                continue
+            records[downstream_id] = StageExecution(
+                stage_id=downstream_id, status="blocked", errors=[reason]
+            )
+            emit(downstream_id, "blocked", reason)
+            pending.extend(graph.downstream[downstream_id])
+
+    for stage_id, unknown in graph.missing.items():
+        if stage_id in records:
+            continue
+        reason = (
+            f"References unknown stage(s): {', '.join(unknown)}\n"
+            f"Action: Fix the from_stage references in wf.yaml and re-compose."
+        )
+        records[stage_id] = StageExecution(stage_id=stage_id, status="blocked", errors=[reason])
+        emit(stage_id, "blocked", reason)
+        block_downstream(stage_id, f"Upstream stage '{stage_id}' is blocked")
+
+    running: dict[asyncio.Task, str] = {}
+    try:
+        while True:
+            ready = graph.ready(completed, exclude=set(records) | set(running.values()))
+            for stage_id in ready[: jobs - len(running)]:
+                task = asyncio.create_task(_run_stage(run, stage_id, agent_cmd, emit, link))
+                running[task] = stage_id
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage_id = running.pop(task)
+                record = task.result()
+                records[stage_id] = record
+                if record.status == "completed":
+                    completed.add(stage_id)
+                else:
+                    block_downstream(stage_id, f"Upstream stage '{stage_id}' failed")
+    finally:
+        # Interrupted (e.g. Ctrl-C): stop agents still running
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return records
+
+
+async def _run_stage(
+    run: Run, stage_id: str, agent_cmd: str, emit: EventCallback, link: str
+) -> StageExecution:
+    """Prepare, preflight, accept, run the agent and finalize one stage.
+
+    The in-process steps run in worker threads (asyncio.to_thread) so a
+    large prepare or a finalize validating big outputs doesn't stall other
+    stages' agents; WfRunStore serializes their wf-run.json updates. Any
+    exception is recorded as a failed stage rather than aborting execute.
+    """
+    start = time.perf_counter()
+    stage = run.get_stage(stage_id)
+    record = StageExecution(stage_id=stage_id, status="failed")
+
+    async def fail(errors: list[str]) -> StageExecution:
+        try:
+            await asyncio.to_thread(stage.set_status, "failed")
+        except Exception as e:
+            errors = [*errors, f"Could not record the failed status in wf-run.json: {e}"]
+        record.errors.extend(errors)
+        record.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        emit(stage_id, "failed", errors[0].splitlines()[0] if errors else "")
+        return record
+
+    try:
+        emit(stage_id, "start", "preparing")
+        prepared = await asyncio.to_thread(
+            prepare_wf_stage, stage_id, run.path, run=run, link=link
+        )
+        if not prepared.success:
+            return await fail(prepared.errors)
+
+        checked = await asyncio.to_thread(preflight, stage.path)
+        if checked.status == "fail":
+            return await fail(
+                [
+                    f"{e.check.upper()}: {e.path}\n  {e.message}\n  Action: {e.action}"
+                    for e in checked.errors
+                ]
+            )
+        emit(
+            stage_id,
+            "prepared",
+            f"{len(prepared.files_copied)} file(s), {len(prepared.params_resolved)} param(s)",
+        )
+
+        await asyncio.to_thread(stage.accept)  # Also marks the stage in_progress in wf-run.json
+
+        command = _agent_command(agent_cmd, stage, run.path)
+        emit(stage_id, "agent", command)
+        try:
+            record.exit_code = await _run_agent(command, stage, run.path, emit)
+        except asyncio.CancelledError:
+            stage.set_status("failed")
+            raise
+        except OSError as e:
+            return await fail([f"Could not start agent command: {e}\nAction: Check --agent-cmd."])
+        if record.exit_code != 0:
+            return await fail(
+                [
+                    f"Agent command exited with code {record.exit_code}\n"
+                    f"Action: See {stage.path / 'run' / 'agent.log'} for the agent's output."
+                ]
+            )
+
+        finalized = await asyncio.to_thread(stage.finalize)
+        if not finalized.success:
+            return await fail(finalized.errors)
+    except Exception as e:
+        return await fail(
+            [
+                f"Stage '{stage_id}' raised {type(e).__name__}: {e}\n"
+                f"Action: Fix the stage folder and run execute again."
+            ]
+        )
+
+    record.status = "completed"
+    record.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    emit(stage_id, "completed", f"{len(finalized.parameters)} output param(s)")
+    return record
+
+
+def _agent_command(agent_cmd: str, stage: Stage, run_dir: Path) -> str:
+    """Substitute {stage_id}, {stage_dir} and {run_dir} (shell-quoted)."""
+    # str.replace, not str.format: shell commands often contain other braces
+    return (
+        agent_cmd.replace("{stage_id}", shlex.quote(stage.stage_id))
+        .replace("{stage_dir}", shlex.quote(str(stage.path)))
+        .replace("{run_dir}", shlex.quote(str(run_dir)))
+    )
+
+
+async def _run_agent(command: str, stage: Stage, run_dir: Path, emit: EventCallback) -> int:
+    """Run the agent command, logging and streaming its output; return the exit code."""
+    env = {
+        **os.environ,
+        "CHAINGLASS_STAGE_ID": stage.stage_id,
+        "CHAINGLASS_STAGE_DIR": str(stage.path),
+        "CHAINGLASS_RUN_DIR": str(run_dir),
+    }
+    log_path = stage.path / "run" / "agent.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    process = await asyncio.create_subprocess_shell(
+        command,
+        cwd=stage.path,
+        env=env,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        with open(log_path, "wb") as log:
+            pending = b""
+            while chunk := await process.stdout.read(AGENT_READ_SIZE):
+                log.write(chunk)
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    emit(stage.stage_id, "output", line.decode(errors="replace").rstrip("\r"))
+            if pending:
+                emit(stage.stage_id, "output", pending.decode(errors="replace").rstrip("\r"))
+        return await process.wait()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
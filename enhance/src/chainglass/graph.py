@@ -0,0 +1,160 @@
+"""Stage dependency DAG built from from_stage references.
+
+A stage depends on every stage named by from_stage in its inputs
+(required and optional) and parameters. The same structure appears in
+wf.yaml stage definitions and in the stage-config.yaml files compose
+extracts from them, so a StageGraph can be built from either.
+
+Levels group stages whose upstreams are all in earlier levels: every
+stage in a level can run concurrently once the previous levels are done.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+
+class CycleError(Exception):
+    """Raised when stage dependencies form a cycle."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        super().__init__(
+            f"Stage dependencies form a cycle: {' -> '.join(cycle)}\n"
+            f"Action: Remove one of the from_stage references so the stages can be ordered."
+        )
+
+
+def stage_dependencies(config: Mapping[str, Any]) -> set[str]:
+    """Stage ids referenced by from_stage in a stage definition's inputs and parameters."""
+    referenced = set()
+    inputs = config.get("inputs") or {}
+    for group in ("required", "optional"):
+        for input_def in inputs.get(group) or []:
+            if isinstance(input_def, dict) and input_def.get("from_stage"):
+                referenced.add(input_def["from_stage"])
+    for param in config.get("parameters") or []:
+        if isinstance(param, dict) and param.get("from_stage"):
+            referenced.add(param["from_stage"])
+    return referenced
+
+
+class StageGraph:
+    """Directed acyclic graph of stage dependencies.
+
+    Args:
+        dependencies: stage_id -> upstream stage ids. Key order is the
+            tie-break order within a level (e.g. wf.yaml or wf-run.json order).
+    """
+
+    def __init__(self, dependencies: Mapping[str, Iterable[str]]) -> None:
+        self.stage_ids = list(dependencies)
+        self._position = {stage_id: i for i, stage_id in enumerate(self.stage_ids)}
+        self.upstream: dict[str, list[str]] = {}
+        self.missing: dict[str, list[str]] = {}  # stage_id -> unknown from_stage ids
+        for stage_id, upstream in dependencies.items():
+            known = sorted(
+                {u for u in upstream if u in self._position}, key=self._position.__getitem__
+            )
+            unknown = sorted({u for u in upstream if u not in self._position})
+            self.upstream[stage_id] = known
+            if unknown:
+                self.missing[stage_id] = unknown
+        self.downstream: dict[str, list[str]] = {stage_id: [] for stage_id in self.stage_ids}
+        for stage_id in self.stage_ids:
+            for upstream_id in self.upstream[stage_id]:
+                self.downstream[upstream_id].append(stage_id)
+
+    @classmethod
+    def from_workflow(cls, workflow: Mapping[str, Any]) -> "StageGraph":
+        """Build from a parsed wf.yaml (stages in wf.yaml order)."""
+        return cls(
+            {
+                stage["id"]: stage_dependencies(stage)
+                for stage in workflow.get("stages", [])
+                if isinstance(stage, dict) and "id" in stage
+            }
+        )
+
+    def find_cycle(self) -> list[str] | None:
+        """Return one dependency cycle as [a, b, ..., a], or None if acyclic."""
+        visiting, done = set(), set()
+        path: list[str] = []
+
+        # Iterative DFS so deep chains don't hit the recursion limit
+        for root in self.stage_ids:
+            if root in done:
+                continue
+            stack = [(root, iter(self.upstream[root]))]
+            visiting.add(root)
+            path.append(root)
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child in visiting:
+                        return path[path.index(child) :] + [child]
+                    if child not in done:
+                        visiting.add(child)
+                        path.append(child)
+                        stack.append((child, iter(self.upstream[child])))
+                        break
+                else:
+                    stack.pop()
+                    path.pop()
+                    visiting.discard(node)
+                    done.add(node)
+        return None
+
+    def levels(self) -> list[list[str]]:
+        """Topological levels: each stage's upstreams are all in earlier levels.
+
+        Raises:
+            CycleError: If the dependencies form a cycle
+        """
+        remaining = {stage_id: len(self.upstream[stage_id]) for stage_id in self.stage_ids}
+        current = [stage_id for stage_id in self.stage_ids if remaining[stage_id] == 0]
+        levels = []
+        placed = 0
+        while current:
+            levels.append(current)
+            placed += len(current)
+            following = set()
+            for stage_id in current:
+                for downstream_id in self.downstream[stage_id]:
+                    remaining[downstream_id] -= 1
+                    if remaining[downstream_id] == 0:
+                        following.add(downstream_id)
+            current = sorted(following, key=self._position.__getitem__)
+        if placed != len(self.stage_ids):
+            raise CycleError(self.find_cycle() or [])
+        return levels
+
+    def order(self) -> list[str]:
+        """All stages in a valid execution order (levels flattened).
+
+        Raises:
+            CycleError: If the dependencies form a cycle
+        """
+        return [stage_id for level in self.levels() for stage_id in level]
+
+    def ready(self, completed: Iterable[str], exclude: Iterable[str] = ()) -> list[str]:
+        """Stages not yet completed whose upstreams are all completed.
+
+        Args:
+            completed: Stage ids that are finished
+            exclude: Stage ids to leave out (e.g. already running)
+
+        Returns:
+            Ready stage ids in graph order
+        """
+        completed = set(completed)
+        skip = completed.union(exclude)
+        return [
+            stage_id
+            for stage_id in self.stage_ids
+            if stage_id not in skip
+            and not self.missing.get(stage_id)
+            and all(u in completed for u in self.upstream[stage_id])
+        ]
+
+    def __repr__(self) -> str:
+        return f"StageGraph({len(self.stage_ids)} stages)"
@@ -0,0 +1,190 @@
+"""File propagation strategies for prepare-wf-stage.
+
+prepare-wf-stage places upstream outputs into a downstream stage's
+inputs/ folder. A plain copy doubles disk usage and I/O for every stage a
+large artifact fans out to, so the placement strategy is configurable:
+
+- copy:     full byte copy (shutil.copy2)
+- reflink:  copy-on-write clone via the Linux FICLONE ioctl (btrfs, XFS,
+            bcachefs, ...); shares blocks until either side is modified,
+            so it is indistinguishable from a copy. Falls back to copy.
+- hardlink: second name for the same inode. Zero bytes written, but an
+            agent editing the input in place also edits the upstream
+            output. Falls back to reflink, then copy (e.g. across devices).
+- symlink:  relative symbolic link to the upstream output. Falls back to
+            copy (e.g. filesystems without symlink support).
+
+compose uses the same strategies for templates and schemas shared by
+several stages, linking them from one copy in <run>/.blobs/; within_stage()
+accepts such links in the path security checks.
+
+Every strategy writes to a temp name in the target directory and
+os.replace()s it into place, so an existing target (including a link
+left by an earlier prepare) is replaced rather than written through.
+Callers that place into fresh folders (compose) pass replace=False to
+create the target directly.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+LINK_STRATEGIES = ("copy", "reflink", "hardlink", "symlink")
+DEFAULT_LINK_STRATEGY = "reflink"
+
+# Strategies tried, in order, for each requested strategy
+_FALLBACKS = {
+    "copy": ("copy",),
+    "reflink": ("reflink", "copy"),
+    "hardlink": ("hardlink", "reflink", "copy"),
+    "symlink": ("symlink", "copy"),
+}
+
+# Content-addressed store in a run folder that compose links shared files from
+BLOBS_DIRNAME = ".blobs"
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# errnos meaning "this filesystem/pair of files can't do that" (try the next strategy)
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EPERM,
+    errno.EMLINK,
+    errno.ENOSYS,
+}
+
+if sys.platform.startswith("linux"):
+    import fcntl
+
+    HAS_REFLINK = True
+else:
+    HAS_REFLINK = False
+
+
+@dataclass
+class LinkResult:
+    """How one file was placed."""
+
+    method: str  # Strategy actually used (after fallback)
+    size: int  # Size of the source file
+    bytes_copied: int  # Bytes written as new data (0 for reflink/hardlink/symlink)
+
+
+def link_file(
+    source: Path,
+    target: Path,
+    strategy: str = DEFAULT_LINK_STRATEGY,
+    replace: bool = True,
+) -> LinkResult:
+    """Place source at target using strategy, falling back as described above.
+
+    Args:
+        source: Existing file to propagate
+        target: Destination path (parent directories are created if replace)
+        strategy: One of LINK_STRATEGIES
+        replace: Replace an existing target atomically; if False, target must
+            not exist yet and is created in place (fewer syscalls)
+
+    Returns:
+        LinkResult with the method used and the bytes actually copied
+
+    Raises:
+        ValueError: If strategy is unknown
+        OSError: If the file cannot be placed even by copying (or, with
+            replace=False, if target already exists)
+    """
+    if strategy not in _FALLBACKS:
+        raise ValueError(
+            f"Unknown link strategy: {strategy}\n"
+            f"Action: Use one of: {', '.join(LINK_STRATEGIES)}."
+        )
+    source = Path(source)
+    target = Path(target)
+    if replace:
+        target.parent.mkdir(parents=True, exist_ok=True)
+    size = source.stat().st_size
+
+    for method in _FALLBACKS[strategy]:
+        if method == "reflink" and not HAS_REFLINK:
+            continue
+        try:
+            if replace:
+                _place(method, source, target)
+            else:
+                _create_new(method, source, target)
+        except OSError as e:
+            if method == "copy" or e.errno not in _UNSUPPORTED:
+                raise
+            continue
+        return LinkResult(
+            method=method, size=size, bytes_copied=size if method == "copy" else 0
+        )
+    raise AssertionError("unreachable: copy is always the last fallback")
+
+
+def within_stage(path: Path, stage_path: Path) -> bool:
+    """Whether path stays inside a stage folder (stage_path must be resolved).
+
+    A file compose symlinked from the run's .blobs/ store counts as inside:
+    the path itself must be in the stage folder and resolve directly into
+    <run>/.blobs/. A path that escapes by '..' is still rejected.
+    """
+    resolved = path.resolve()
+    if resolved.is_relative_to(stage_path):
+        return True
+    return (path.parent.resolve() / path.name).is_relative_to(stage_path) and (
+        resolved.parent == stage_path.parent.parent / BLOBS_DIRNAME
+    )
+
+
+def _place(method: str, source: Path, target: Path) -> None:
+    """Create target via a temp name in its directory, then os.replace it into place."""
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        if method in ("hardlink", "symlink"):
+            os.unlink(tmp)  # os.link/os.symlink need a free name
+        _create(method, source, Path(tmp))
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _create_new(method: str, source: Path, target: Path) -> None:
+    """Create a target that doesn't exist yet, removing a partial copy if that fails."""
+    try:
+        _create(method, source, target)
+    except BaseException:
+        if method in ("copy", "reflink"):
+            try:
+                os.unlink(target)
+            except OSError:
+                pass
+        raise
+
+
+def _create(method: str, source: Path, target: Path) -> None:
+    """Create target from source with one method (symlinks are relative)."""
+    if method == "copy":
+        shutil.copy2(source, target)
+    elif method == "reflink":
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, target)
+    elif method == "hardlink":
+        os.link(source, target)
+    else:
+        os.symlink(os.path.relpath(source, target.parent), target)
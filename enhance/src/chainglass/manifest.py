@@ -0,0 +1,211 @@
+"""Validation manifest for incremental stage validation.
+
+validate_stage(incremental=True) records, per output file, a fingerprint of
+the output, its schema and every schema file the schema reaches through
+external "$ref"s (size, mtime_ns, sha256) together with the checks that
+were produced. On the next call an output whose fingerprints are
+unchanged reuses its recorded checks instead of being re-read and
+re-validated, so an agent fixing outputs in a loop only pays for the files
+it actually changed.
+
+Fingerprints are compared by stat first. A file whose mtime was too close
+to the time it was checked (a "racy" entry, as in git's index) is
+re-hashed rather than trusted on stat alone, so same-size rewrites within
+the filesystem's timestamp granularity are never missed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from chainglass.cache import schema_ref_files
+
+MANIFEST_FILENAME = ".validation-manifest.json"
+
+# Bump when the manifest layout changes (older manifests are ignored)
+MANIFEST_VERSION = 3
+
+# Entries modified within this window of being checked must be re-hashed
+RACY_WINDOW_NS = 2_000_000_000
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in fixed-size chunks (bounded memory for large outputs)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationManifest:
+    """Per-stage record of validated outputs, stored in .validation-manifest.json.
+
+    Args:
+        stage_path: Path to the stage folder (manifest lives at its root)
+    """
+
+    def __init__(self, stage_path: Path) -> None:
+        self.path = Path(stage_path) / MANIFEST_FILENAME
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._used: set[str] = set()
+
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("outputs", {})
+        except (OSError, ValueError, AttributeError):
+            pass  # Missing or corrupt manifest - everything is stale
+
+    def lookup(
+        self,
+        rel_path: str,
+        spec: dict[str, Any],
+        output_path: Path,
+        schema_path: Path | None,
+    ) -> dict[str, Any] | None:
+        """Return the recorded entry if output and schema are unchanged.
+
+        Args:
+            rel_path: Output path relative to the stage (manifest key)
+            spec: The output definition the checks were produced for
+            output_path: Absolute path to the output file
+            schema_path: Absolute path to its schema, if any
+
+        Returns:
+            Entry dict with "checks" and "errors" lists, or None if stale
+        """
+        entry = self.entries.get(rel_path)
+        if not entry or entry.get("spec") != spec:
+            return None
+        if not self._unchanged(entry, "file", output_path):
+            return None
+        if not self._unchanged(entry, "schema", schema_path):
+            return None
+        if not self._refs_unchanged(entry, schema_path):
+            return None
+        # Content verified as of now - later calls can trust stat alone
+        entry["checked_ns"] = time.time_ns()
+        self._used.add(rel_path)
+        return entry
+
+    def record(
+        self,
+        rel_path: str,
+        spec: dict[str, Any],
+        output_path: Path,
+        schema_path: Path | None,
+        checks: list[dict[str, Any]],
+        errors: list[dict[str, Any]],
+        file_sha256: str | None = None,
+    ) -> None:
+        """Store fresh check results for an output (call save() to persist).
+
+        Pass file_sha256 when the validated bytes were already hashed, so the
+        recorded digest is that of the content the checks were produced for.
+        """
+        try:
+            entry = {
+                "spec": spec,
+                "checked_ns": time.time_ns(),
+                "file": self._fingerprint(output_path, file_sha256),
+                "schema": self._fingerprint(schema_path) if schema_path else None,
+                "schema_refs": self._ref_fingerprints(schema_path) if schema_path else {},
+                "checks": checks,
+                "errors": errors,
+            }
+        except OSError:
+            self.entries.pop(rel_path, None)  # File vanished mid-check - don't cache
+            return
+        self.entries[rel_path] = entry
+        self._used.add(rel_path)
+
+    def save(self) -> None:
+        """Write the manifest atomically, dropping outputs no longer validated.
+
+        Best-effort: a read-only stage folder just means no incremental reuse.
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "outputs": {k: v for k, v in self.entries.items() if k in self._used},
+        }
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.path.parent, prefix=".validation-manifest-", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError:
+            pass
+
+    @staticmethod
+    def _fingerprint(path: Path, sha256: str | None = None) -> dict[str, Any]:
+        stat_result = path.stat()
+        return {
+            "size": stat_result.st_size,
+            "mtime_ns": stat_result.st_mtime_ns,
+            "sha256": sha256 or file_sha256(path),
+        }
+
+    @classmethod
+    def _ref_fingerprints(cls, schema_path: Path) -> dict[str, dict[str, Any] | None]:
+        """Fingerprints of the files schema_path $refs (None for a missing file)."""
+        fingerprints: dict[str, dict[str, Any] | None] = {}
+        for path in schema_ref_files(schema_path):
+            try:
+                fingerprints[str(path)] = cls._fingerprint(path)
+            except FileNotFoundError:
+                fingerprints[str(path)] = None
+        return fingerprints
+
+    @classmethod
+    def _refs_unchanged(cls, entry: dict[str, Any], schema_path: Path | None) -> bool:
+        """True if the schema still $refs the same files and none of them changed."""
+        recorded = entry.get("schema_refs") or {}
+        current = [str(path) for path in schema_ref_files(schema_path)] if schema_path else []
+        if sorted(current) != sorted(recorded):
+            return False
+        return all(cls._matches(entry, recorded[ref], Path(ref)) for ref in current)
+
+    @classmethod
+    def _unchanged(cls, entry: dict[str, Any], key: str, path: Path | None) -> bool:
+        """Compare a recorded fingerprint against the file on disk (updates mtime on hash hit)."""
+        return cls._matches(entry, entry.get(key), path)
+
+    @staticmethod
+    def _matches(entry: dict[str, Any], recorded: dict[str, Any] | None, path: Path | None) -> bool:
+        """Compare one recorded fingerprint (None: file absent) against path."""
+        if recorded is None:
+            return path is None or not path.exists()
+        if path is None:
+            return False
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return False
+        if stat_result.st_size != recorded["size"]:
+            return False
+
+        racy = recorded["mtime_ns"] >= entry["checked_ns"] - RACY_WINDOW_NS
+        if stat_result.st_mtime_ns == recorded["mtime_ns"] and not racy:
+            return True
+
+        # Touched, copied or racy: fall back to comparing content
+        try:
+            if file_sha256(path) != recorded["sha256"]:
+                return False
+        except OSError:
+            return False
+        recorded["mtime_ns"] = stat_result.st_mtime_ns
+        return True
@@ -4,8 +4,18 @@ import json
 from pathlib import Path
 from typing import Any
 
-import yaml
-from jsonschema import Draft202012Validator, ValidationError
+from jsonschema import SchemaError
+
+from chainglass import yamlio
+from chainglass.cache import (
+    DEFAULT_MAX_ERRORS,
+    collect_errors,
+    default_cache_dir,
+    get_validator,
+    load_cached_workflow,
+    store_cached_workflow,
+    workflow_cache_key,
+)
 
 
 class WorkflowParseError(Exception):
@@ -16,11 +26,28 @@ class WorkflowParseError(Exception):
         super().__init__(message)
 
 
-def parse_workflow(wf_spec_path: Path) -> dict[str, Any]:
+def parse_workflow(
+    wf_spec_path: Path,
+    use_cache: bool = False,
+    cache_dir: Path | None = None,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> dict[str, Any]:
     """Load and validate wf.yaml from a wf-spec folder.
 
+    With use_cache=True, a validated parse result is persisted in the user
+    cache folder, checked against the content hash of wf.yaml +
+    wf.schema.json. A warm call then skips
+    YAML parsing and schema validation entirely. Only successful parses are
+    cached, so errors are always reported from a fresh parse.
+
+    Schema errors are collected lazily and reporting stops after
+    max_errors, so a badly broken wf.yaml fails fast with a bounded message.
+
     Args:
         wf_spec_path: Path to the wf-spec folder containing wf.yaml
+        use_cache: Read/write the on-disk parse cache
+        cache_dir: Cache folder (default: cache.default_cache_dir())
+        max_errors: Schema errors to report (None or 0 = all)
 
     Returns:
         Parsed and validated workflow definition as a dict
@@ -40,11 +67,20 @@ def parse_workflow(wf_spec_path: Path) -> dict[str, Any]:
             path=wf_yaml_path,
         )
 
+    # Warm path: reuse a previously validated parse of identical inputs
+    cache_key = None
+    if use_cache and schema_path.exists():
+        cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        cache_key = workflow_cache_key(wf_yaml_path, schema_path)
+        cached = load_cached_workflow(cache_dir, wf_yaml_path, cache_key)
+        if cached is not None:
+            return cached
+
     # Parse YAML
     try:
         with open(wf_yaml_path) as f:
-            workflow = yaml.safe_load(f)
-    except yaml.YAMLError as e:
+            workflow = yamlio.load(f)
+    except yamlio.YAMLError as e:
         raise WorkflowParseError(
             f"Invalid YAML in {wf_yaml_path}:\n{e}\n"
             f"Action: Fix the YAML syntax errors in wf.yaml.",
@@ -66,25 +102,32 @@ def parse_workflow(wf_spec_path: Path) -> dict[str, Any]:
             path=schema_path,
         )
 
+    # Compiled validators are cached per process (keyed by path + mtime)
     try:
-        with open(schema_path) as f:
-            schema = json.load(f)
+        validator = get_validator(schema_path)
     except json.JSONDecodeError as e:
         raise WorkflowParseError(
             f"Invalid JSON in schema file: {schema_path}:\n{e}\n"
             f"Action: Fix the JSON syntax errors in wf.schema.json.",
             path=schema_path,
         ) from e
+    except SchemaError as e:
+        raise WorkflowParseError(
+            f"Invalid JSON Schema in {schema_path}:\n{e.message}\n"
+            f"Action: Fix the schema definition in wf.schema.json.",
+            path=schema_path,
+        ) from e
 
     # Validate workflow against schema
-    validator = Draft202012Validator(schema)
-    errors = list(validator.iter_errors(workflow))
+    errors, truncated = collect_errors(validator.iter_errors(workflow), max_errors)
 
     if errors:
         error_messages = []
         for error in errors:
             path_str = ".".join(str(p) for p in error.absolute_path) if error.absolute_path else "(root)"
             error_messages.append(f"  - At '{path_str}': {error.message}")
+        if truncated:
+            error_messages.append(f"  - ... stopped after {max_errors} error(s); more may exist")
 
         raise WorkflowParseError(
             f"Schema validation failed for {wf_yaml_path}:\n"
@@ -93,4 +136,7 @@ def parse_workflow(wf_spec_path: Path) -> dict[str, Any]:
             path=wf_yaml_path,
         )
 
+    if cache_key is not None:
+        store_cached_workflow(cache_dir, wf_yaml_path, cache_key, workflow)
+
     return workflow
@@ -20,7 +20,9 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal
 
-import yaml
+from chainglass import yamlio
+from chainglass.linking import within_stage
+from chainglass.runindex import load_stage_config
 
 
 @dataclass
@@ -108,7 +110,7 @@ def preflight(stage_path: Path) -> PreflightResult:
 
     # Check 2: stage-config.yaml is valid YAML
     try:
-        config = yaml.safe_load(config_path.read_text())
+        config = load_stage_config(stage_path)
         if config is None:
             return PreflightResult(
                 status="fail",
@@ -124,7 +126,7 @@ def preflight(stage_path: Path) -> PreflightResult:
                 ],
                 summary=f"Stage '{stage_path.name}': 0 checks passed, 1 error",
             )
-    except yaml.YAMLError as e:
+    except yamlio.YAMLError as e:
         return PreflightResult(
             status="fail",
             stage_id=stage_path.name,
@@ -156,7 +158,7 @@ def preflight(stage_path: Path) -> PreflightResult:
     for prompt_path in [entry_prompt, main_prompt]:
         full_path = stage_path / prompt_path
         # Security: validate path is within stage
-        if not full_path.resolve().is_relative_to(stage_path):
+        if not within_stage(full_path, stage_path):
             result.status = "fail"
             result.errors.append(
                 PreflightCheck(
@@ -211,9 +213,14 @@ def preflight(stage_path: Path) -> PreflightResult:
         input_name = input_def.get("name", input_path)
         input_desc = input_def.get("description", "")
 
-        # Security: validate path
+        # Security: validate path (a from_stage input may be a symlink placed
+        # by prepare-wf-stage --link symlink; its source is checked in Phase 2)
         full_path = stage_path / input_path
-        if not full_path.resolve().is_relative_to(stage_path):
+        if "from_stage" in input_def:
+            checked_path = full_path.parent.resolve() / full_path.name
+        else:
+            checked_path = full_path.resolve()
+        if not checked_path.is_relative_to(stage_path):
             result.status = "fail"
             result.errors.append(
                 PreflightCheck(
@@ -4,12 +4,14 @@ Copies inputs from prior stages and resolves parameters.
 """
 
 import json
-import shutil
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from chainglass.linking import DEFAULT_LINK_STRATEGY, LINK_STRATEGIES, link_file
+from chainglass.run import Run
 from chainglass.stage import Stage
+from chainglass.wfrun import WfRunStore, utc_now
 
 
 @dataclass
@@ -21,12 +23,16 @@ class PrepareResult:
     params_resolved: dict[str, Any] = field(default_factory=dict)
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    bytes_copied: int = 0  # Bytes written as new data
+    bytes_linked: int = 0  # Bytes placed by reflink/hardlink/symlink without copying
 
 
 def prepare_wf_stage(
     stage_id: str,
     run_dir: Path,
     dry_run: bool = False,
+    run: Run | None = None,
+    link: str = DEFAULT_LINK_STRATEGY,
 ) -> PrepareResult:
     """
     Prepare a stage by copying inputs from prior stages and resolving parameters.
@@ -36,17 +42,22 @@ def prepare_wf_stage(
     2. For each input with from_stage:
        a. Load source stage
        b. Get output file/data path
-       c. Copy to target inputs folder (unless dry_run)
+       c. Copy (or link) to target inputs folder (unless dry_run)
     3. For each parameter with from_stage:
        a. Load source stage
        b. Get parameter from output-params.json
        c. Collect in params dict
     4. Write params.json to inputs folder (unless dry_run)
+    5. Append a "prepare" event to wf-run.events.jsonl (unless dry_run)
 
     Args:
         stage_id: ID of the stage to prepare (e.g., "specify")
         run_dir: Path to the run directory
         dry_run: If True, validate without writing
+        run: Already-loaded Run for run_dir; its Stage objects (and their
+            cached configs) are reused instead of loading each stage again
+        link: How input files are placed: "copy", "reflink", "hardlink" or
+            "symlink" (see chainglass.linking; falls back to copying)
 
     Returns:
         PrepareResult with success status and details
@@ -54,6 +65,14 @@ def prepare_wf_stage(
     run_dir = Path(run_dir).resolve()
     result = PrepareResult(success=True)
 
+    if link not in LINK_STRATEGIES:
+        result.success = False
+        result.errors.append(
+            f"Unknown link strategy: {link}\n"
+            f"Action: Use one of: {', '.join(LINK_STRATEGIES)}."
+        )
+        return result
+
     # Load target stage
     target_path = run_dir / "stages" / stage_id
     if not target_path.exists():
@@ -64,7 +83,7 @@ def prepare_wf_stage(
         )
         return result
 
-    target = Stage(target_path)
+    target = (run and run.get_stage(stage_id)) or Stage(target_path)
 
     # Cache for source stages to avoid reloading
     source_stages: dict[str, Stage] = {}
@@ -89,7 +108,7 @@ def prepare_wf_stage(
             reported_errors.add(from_stage)
             return None
 
-        source = Stage(source_path)
+        source = (run and run.get_stage(from_stage)) or Stage(source_path)
 
         # Check if source stage has been finalized
         if not source.is_finalized:
@@ -150,7 +169,8 @@ def prepare_wf_stage(
         target_path_file = target.path / target_rel_path
 
         # FIX-003: Validate target path stays within target stage
-        target_abs = target_path_file.resolve()
+        # (the file itself may be a symlink left by an earlier symlink prepare)
+        target_abs = target_path_file.parent.resolve() / target_path_file.name
         if not target_abs.is_relative_to(target.path):
             result.errors.append(
                 f"Path traversal detected in input path: {target_rel_path}\n"
@@ -159,11 +179,11 @@ def prepare_wf_stage(
             result.success = False
             continue
 
+        method = "copy"
         if not dry_run:
             # FIX-012: Add error handling for file copy
             try:
-                target_path_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_path, target_path_file)
+                placed = link_file(source_path, target_path_file, link)
             except (IOError, OSError) as e:
                 result.errors.append(
                     f"Failed to copy file '{input_def['name']}':\n"
@@ -173,8 +193,12 @@ def prepare_wf_stage(
                 )
                 result.success = False
                 continue
+            method = placed.method
+            result.bytes_copied += placed.bytes_copied
+            result.bytes_linked += placed.size - placed.bytes_copied
 
-        result.files_copied.append(f"{input_def['name']}: {source_path} -> {target_path_file}")
+        entry = f"{input_def['name']}: {source_path} -> {target_path_file}"
+        result.files_copied.append(entry if method == "copy" else f"{entry} ({method})")
 
     # Step 3: Resolve parameters with from_stage
     parameters = target.config.get("parameters", [])
@@ -235,4 +259,10 @@ def prepare_wf_stage(
     if result.errors:
         result.success = False
 
+    # Step 5: Record the transition in the run's event log
+    if result.success and not dry_run:
+        WfRunStore(target.wf_run_path).update_stage(
+            stage_id, event="prepare", prepared_at=utc_now()
+        )
+
     return result
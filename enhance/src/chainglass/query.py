@@ -0,0 +1,496 @@
+"""Compiled dot-notation queries for output_parameters.
+
+A query such as "summary.findings[0].severity" is parsed once into a tuple
+of steps and cached by query string, so resolving output_parameters for
+every validation does not re-split or re-match the query text.
+
+Path queries keep exactly the semantics of the original resolve_query:
+- "a.b" walks dict keys; a numeric segment ("items.0") indexes a list
+- "key[n]" indexes the list found at key
+- "length" applied to a list returns its length (and ends the query)
+- anything missing, out of range or malformed resolves to None
+
+Extended queries add projections and aggregates:
+- "items[*].name" maps the rest of the query over every list item (or
+  dict value); results that resolve to None are dropped
+- "items[?severity=='critical']" keeps the items whose field compares
+  true against a literal ('str', "str", numbers, true, false, null).
+  Operators: == != < <= > >=; "[?field]" keeps items with a truthy
+  field, and "@" refers to the item itself ("tags[?@=='x']")
+- a final "count()", "sum()", "min()" or "max()" reduces the values (or
+  the items of a list, nulls skipped): "findings[?severity=='critical'].count()"
+
+Projected values flow through generators, so aggregates are computed in
+one pass without building intermediate lists; a projection without an
+aggregate returns the list of values.
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+# Maximum number of compiled queries kept per process (LRU eviction)
+QUERY_CACHE_SIZE = 1024
+
+_SEGMENT_PATTERN = re.compile(r"([^.\[\]]+)(?:\[(\d+)\])?")
+
+# Anything matching this is parsed with the extended grammar
+_EXTENDED_PATTERN = re.compile(r"\[\*\]|\[\?|(?:^|\.)(?:count|sum|min|max)\(\)$")
+
+_AGGREGATE_PATTERN = re.compile(r"(count|sum|min|max)\(\)")
+
+_INDEX_PATTERN = re.compile(r"\d+")
+
+_NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+_COMPARISONS = ("==", "!=", "<=", ">=", "<", ">")
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for malformed extended queries (resolved as None by callers)."""
+
+
+class QueryStep(NamedTuple):
+    """One dot-separated query segment."""
+
+    key: str  # Dict key (or list index, see key_index)
+    key_index: int | None  # int(key) when the segment can index a list
+    index: int | None  # The [n] suffix, if any
+
+
+def _parse_steps(query: str) -> tuple[tuple[QueryStep, ...], bool]:
+    """Split a query into steps; the flag is False if a segment is malformed.
+
+    Steps before a malformed segment are kept: "length" on a list ends a
+    query before later segments are looked at, as it always has.
+    """
+    steps = []
+    for part in query.split("."):
+        match = _SEGMENT_PATTERN.fullmatch(part)
+        if not match:
+            return tuple(steps), False
+        key, index = match.groups()
+        steps.append(QueryStep(key, _int_or_none(key), int(index) if index is not None else None))
+    return tuple(steps), True
+
+
+def _int_or_none(key: str) -> int | None:
+    try:
+        return int(key)
+    except ValueError:
+        return None
+
+
+def _step(current: Any, step: QueryStep) -> tuple[Any, bool]:
+    """Apply one step. Returns (value, done) - done ends the query with value."""
+    if current is None:
+        return None, True
+
+    # Special case: "length" on a list returns len()
+    if step.key == "length" and isinstance(current, list):
+        return len(current), True
+
+    # Navigate to key
+    if isinstance(current, dict):
+        if step.key not in current:
+            return None, True
+        current = current[step.key]
+    elif isinstance(current, list):
+        # For lists, key might be a numeric index without brackets
+        idx = step.key_index
+        if idx is None or idx < 0 or idx >= len(current):
+            return None, True
+        current = current[idx]
+    else:
+        return None, True
+
+    # Handle array index if present
+    if step.index is not None:
+        if not isinstance(current, list) or step.index >= len(current):
+            return None, True
+        current = current[step.index]
+
+    return current, False
+
+
+# =============================================================================
+# Extended grammar: projections, filters and aggregates
+# =============================================================================
+
+
+class _Wildcard(NamedTuple):
+    """[*] - every list item or dict value."""
+
+
+class _Filter(NamedTuple):
+    """[?field op literal] - list items passing a comparison."""
+
+    field: "CompiledQuery | None"  # None = the item itself ("@")
+    op: str | None  # None = truthiness test
+    literal: Any
+
+
+class _Index(NamedTuple):
+    """[n] - one list item."""
+
+    index: int
+
+
+_ExtendedOp = QueryStep | _Index | _Wildcard | _Filter
+
+
+class _ExtendedParser:
+    """Recursive-descent parser for extended queries.
+
+    Unlike path queries, which are split on ".", the extended grammar is
+    tokenized left to right so filter literals may contain dots.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.pos = 0
+
+    def parse(self) -> tuple[tuple[_ExtendedOp, ...], str | None]:
+        """Return (ops, aggregate name or None).
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+        """
+        ops: list[_ExtendedOp] = []
+        while True:
+            name = self._read_name()
+            aggregate = _AGGREGATE_PATTERN.fullmatch(name)
+            if aggregate:
+                if not self._at_end():
+                    self._fail(f"{name} must end the query")
+                return tuple(ops), aggregate.group(1)
+            if name:
+                ops.append(QueryStep(name, _int_or_none(name), None))
+            elif self._peek() != "[":
+                self._fail("empty path segment")
+            while self._peek() == "[":
+                ops.append(self._parse_selector())
+            if self._at_end():
+                return tuple(ops), None
+            if self._peek() != ".":
+                self._fail("expected '.' or '['")
+            self.pos += 1
+
+    def _parse_selector(self) -> _ExtendedOp:
+        self.pos += 1  # "["
+        if self.query.startswith("*]", self.pos):
+            self.pos += 2
+            return _Wildcard()
+        if self._peek() == "?":
+            self.pos += 1
+            selector: _ExtendedOp = self._parse_filter()
+        else:
+            match = _INDEX_PATTERN.match(self.query, self.pos)
+            if not match:
+                self._fail("expected an index, '*' or '?' filter")
+            self.pos = match.end()
+            selector = _Index(int(match.group()))
+        if self._peek() != "]":
+            self._fail("expected ']'")
+        self.pos += 1
+        return selector
+
+    def _parse_filter(self) -> _Filter:
+        self._skip_spaces()
+        start = self.pos
+        while not self._at_end() and self._peek() not in "=!<>] ":
+            self.pos += 1
+        field_text = self.query[start : self.pos]
+        if field_text == "@":
+            field = None
+        else:
+            field = compile_query(field_text)
+            if not field_text or field.extended or not field.valid:
+                self._fail(f"invalid filter field {field_text!r}")
+        self._skip_spaces()
+        if self._peek() == "]":
+            return _Filter(field, None, None)
+
+        for op in _COMPARISONS:
+            if self.query.startswith(op, self.pos):
+                self.pos += len(op)
+                break
+        else:
+            self._fail("expected a comparison operator")
+        self._skip_spaces()
+        literal = self._parse_literal()
+        self._skip_spaces()
+        return _Filter(field, op, literal)
+
+    def _parse_literal(self) -> Any:
+        quote = self._peek()
+        if quote in ("'", '"'):
+            self.pos += 1
+            chars = []
+            while not self._at_end() and self._peek() != quote:
+                if self._peek() == "\\" and self.pos + 1 < len(self.query):
+                    self.pos += 1  # Backslash escapes the next char
+                chars.append(self._peek())
+                self.pos += 1
+            if self._at_end():
+                self._fail("unterminated string literal")
+            self.pos += 1
+            return "".join(chars)
+        for word, value in (("true", True), ("false", False), ("null", None)):
+            if self.query.startswith(word, self.pos):
+                self.pos += len(word)
+                return value
+        match = _NUMBER_PATTERN.match(self.query, self.pos)
+        if not match:
+            self._fail("expected a literal")
+        self.pos = match.end()
+        return json.loads(match.group())
+
+    def _read_name(self) -> str:
+        start = self.pos
+        while not self._at_end() and self._peek() not in ".[]":
+            self.pos += 1
+        return self.query[start : self.pos]
+
+    def _skip_spaces(self) -> None:
+        while self._peek() == " ":
+            self.pos += 1
+
+    def _peek(self) -> str:
+        return self.query[self.pos] if self.pos < len(self.query) else ""
+
+    def _at_end(self) -> bool:
+        return self.pos >= len(self.query)
+
+    def _fail(self, message: str) -> None:
+        raise QuerySyntaxError(f"{message} at position {self.pos} in {self.query!r}")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    """Equality with JSON typing (true is not 1)."""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right) and left == right
+    return left == right
+
+
+def _matches(item: Any, selector: _Filter) -> bool:
+    value = item if selector.field is None else selector.field.evaluate(item)
+    op, literal = selector.op, selector.literal
+    if op is None:
+        return bool(value)
+    if op == "==":
+        return _json_equal(value, literal)
+    if op == "!=":
+        return not _json_equal(value, literal)
+
+    # Ordering only between two numbers or two strings
+    if not (
+        (_is_number(value) and _is_number(literal))
+        or (isinstance(value, str) and isinstance(literal, str))
+    ):
+        return False
+    if op == "<":
+        return value < literal
+    if op == "<=":
+        return value <= literal
+    if op == ">":
+        return value > literal
+    return value >= literal
+
+
+def _apply(values: Iterator[Any], op: _ExtendedOp) -> Iterator[Any]:
+    """Lazily apply one op to a stream of values (None results are dropped)."""
+    if isinstance(op, _Wildcard):
+        for value in values:
+            if isinstance(value, list):
+                yield from (item for item in value if item is not None)
+            elif isinstance(value, dict):
+                yield from (item for item in value.values() if item is not None)
+    elif isinstance(op, _Filter):
+        for value in values:
+            if isinstance(value, list):
+                yield from (item for item in value if item is not None and _matches(item, op))
+    elif isinstance(op, _Index):
+        for value in values:
+            if isinstance(value, list) and op.index < len(value) and value[op.index] is not None:
+                yield value[op.index]
+    else:
+        for value in values:
+            result, _ = _step(value, op)
+            if result is not None:
+                yield result
+
+
+def _aggregate(name: str, values: Iterator[Any]) -> Any:
+    """Reduce a value stream; None if the values can't be combined."""
+    if name == "count":
+        return sum(1 for _ in values)
+
+    if name == "sum":
+        total = 0
+        for value in values:
+            if not _is_number(value):
+                return None
+            total += value
+        return total
+
+    # min/max: all numbers or all strings
+    best = None
+    for value in values:
+        comparable = _is_number(value) or isinstance(value, str)
+        if not comparable or (best is not None and _is_number(value) != _is_number(best)):
+            return None
+        if best is None or (value < best if name == "min" else value > best):
+            best = value
+    return best
+
+
+class CompiledQuery:
+    """A parsed query, evaluated against any number of documents.
+
+    Args:
+        query: Dot-notation query (e.g., "items[0].name", "items.length",
+            "findings[?severity=='critical'].count()")
+    """
+
+    __slots__ = ("query", "steps", "valid", "extended", "ops", "aggregate", "error")
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.extended = bool(query) and _EXTENDED_PATTERN.search(query) is not None
+        self.steps: tuple[QueryStep, ...] = ()
+        self.ops: tuple[_ExtendedOp, ...] = ()
+        self.aggregate: str | None = None
+        self.error: str | None = None  # Syntax error message (extended queries)
+
+        if not self.extended:
+            self.steps, self.valid = _parse_steps(query) if query else ((), False)
+            return
+        try:
+            self.ops, self.aggregate = _ExtendedParser(query).parse()
+            self.valid = True
+        except QuerySyntaxError as e:
+            self.valid = False
+            self.error = str(e)
+
+    def evaluate(self, data: Any) -> Any:
+        """Resolve the query against data (None if the path doesn't exist)."""
+        if data is None:
+            return None
+        if self.extended:
+            return self._evaluate_extended(data) if self.valid else None
+        current = data
+        for step in self.steps:
+            current, done = _step(current, step)
+            if done:
+                return current
+        return current if self.valid else None
+
+    def _evaluate_extended(self, data: Any) -> Any:
+        values: Iterator[Any] = iter((data,))
+        projected = False
+        for op in self.ops:
+            values = _apply(values, op)
+            projected = projected or isinstance(op, (_Wildcard, _Filter))
+
+        if not projected:
+            value = next(values, None)
+            if self.aggregate is None:
+                return value
+            if not isinstance(value, list):
+                return None  # Aggregates need a list or a projection
+            values = (item for item in value if item is not None)
+        if self.aggregate is not None:
+            return _aggregate(self.aggregate, values)
+        return list(values)
+
+    def __repr__(self) -> str:
+        return f"CompiledQuery({self.query!r})"
+
+
+class _TrieNode:
+    """Queries sharing a step prefix (QuerySet internals)."""
+
+    __slots__ = ("ending", "below", "children")
+
+    def __init__(self) -> None:
+        self.ending: list[str] = []  # Queries whose last step leads here
+        self.below: list[str] = []  # Every query through this node (incl. malformed)
+        self.children: dict[QueryStep, _TrieNode] = {}
+
+
+class QuerySet:
+    """Several queries evaluated against one document in a single pass.
+
+    Path queries are arranged in a trie of steps, so a shared prefix such
+    as "summary" in "summary.total" and "summary.critical" is walked once.
+    Extended queries are evaluated one by one against the same document.
+
+    Args:
+        queries: Query strings (duplicates are fine)
+    """
+
+    def __init__(self, queries: tuple[str, ...]) -> None:
+        self.queries = queries
+        self._root = _TrieNode()
+        self._extended: list[CompiledQuery] = []
+        for query in queries:
+            compiled = compile_query(query)
+            if not query:
+                continue  # Empty queries always resolve to None
+            if compiled.extended:
+                self._extended.append(compiled)
+                continue
+            node = self._root
+            for step in compiled.steps:
+                node = node.children.setdefault(step, _TrieNode())
+                node.below.append(query)
+            if compiled.valid:
+                node.ending.append(query)
+            # else: the next segment is malformed - stays None unless a
+            # "length" step ends the query earlier
+
+    def evaluate(self, data: Any) -> dict[str, Any]:
+        """Resolve every query against data.
+
+        Returns:
+            Dict of query string -> value (None where the path doesn't exist)
+        """
+        results: dict[str, Any] = dict.fromkeys(self.queries)
+        if data is not None:
+            self._walk(self._root, data, results)
+            for compiled in self._extended:
+                results[compiled.query] = compiled.evaluate(data)
+        return results
+
+    def _walk(self, node: _TrieNode, current: Any, results: dict[str, Any]) -> None:
+        for query in node.ending:
+            results[query] = current
+        for step, child in node.children.items():
+            value, done = _step(current, step)
+            if not done:
+                self._walk(child, value, results)
+            elif value is not None:
+                for query in child.below:
+                    results[query] = value
+
+    def __repr__(self) -> str:
+        return f"QuerySet({self.queries!r})"
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_query(query: str) -> CompiledQuery:
+    """Return the (cached) CompiledQuery for a query string."""
+    return CompiledQuery(query)
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_queries(queries: tuple[str, ...]) -> QuerySet:
+    """Return the (cached) QuerySet for a tuple of query strings."""
+    return QuerySet(queries)
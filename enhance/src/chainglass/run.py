@@ -0,0 +1,224 @@
+"""Run class: in-memory model of a whole run folder.
+
+A Run loads wf-run.json and every stage's stage-config.yaml once, indexes
+stages by id, and derives the stage dependency graph from the from_stage
+references in each stage's inputs and parameters. An orchestrator can
+then ask for the status, outputs and upstream stages of every stage
+without re-walking the run folder per question.
+
+Cached state is revalidated cheaply: the run state (wf-run.json plus
+wf-run.events.jsonl) is reloaded when either file's (mtime_ns, size)
+changes, output-params.json files are read through the process-wide
+JsonCache, and each Stage reloads its own config if the file is
+rewritten. Call refresh() after stages are added or removed.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from chainglass import yamlio
+from chainglass.documents import file_fingerprint, shared_json_cache
+from chainglass.graph import StageGraph, stage_dependencies
+from chainglass.runindex import load_stage_config
+from chainglass.stage import Stage
+from chainglass.wfrun import WfRunStore
+
+
+class Run:
+    """
+    Represents a run folder created by compose.
+
+    Args:
+        path: Path to the run directory (containing wf-run.json and stages/)
+
+    Example:
+        >>> run = Run(Path("runs/run-2026-01-18-001"))
+        >>> run.stage_ids
+        ['explore', 'specify']
+        >>> run.dependencies("specify")
+        ['explore']
+        >>> run.status("explore")
+        'completed'
+        >>> run.output_params("explore")
+        {'total_findings': 15, 'critical_count': 2}
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path).resolve()
+        self._wf_run: dict[str, Any] | None = None
+        self._wf_run_fingerprint: tuple | None = None
+        self._store = WfRunStore(self.path / "wf-run.json")
+        self._stages: dict[str, Stage] | None = None
+        self._graph: dict[str, list[str]] | None = None
+        self.config_errors: dict[str, str] = {}  # stage_id -> why its config didn't load
+
+    # =========================================================================
+    # wf-run.json
+    # =========================================================================
+
+    @property
+    def wf_run_path(self) -> Path:
+        """Path to wf-run.json."""
+        return self.path / "wf-run.json"
+
+    @property
+    def wf_run(self) -> dict[str, Any]:
+        """Current run state: wf-run.json plus its event log (empty dict if missing or corrupt).
+
+        Reloaded when wf-run.json or wf-run.events.jsonl changes.
+        """
+        fingerprint = (
+            file_fingerprint(self.wf_run_path),
+            file_fingerprint(self._store.events_path),
+        )
+        if self._wf_run is None or fingerprint != self._wf_run_fingerprint:
+            self._wf_run = self._store.read() or {}
+            self._wf_run_fingerprint = fingerprint
+        return self._wf_run
+
+    @property
+    def run_id(self) -> str:
+        """Run ID from wf-run.json (folder name if absent)."""
+        return self.wf_run.get("run_id", self.path.name)
+
+    def status(self, stage_id: str) -> str | None:
+        """Stage status recorded in wf-run.json (None if not listed)."""
+        return self.statuses().get(stage_id)
+
+    def statuses(self) -> dict[str, str | None]:
+        """Status of every stage listed in wf-run.json, in run order."""
+        return {
+            entry["id"]: entry.get("status")
+            for entry in self.wf_run.get("stages", [])
+            if isinstance(entry, dict) and "id" in entry
+        }
+
+    # =========================================================================
+    # Stages
+    # =========================================================================
+
+    @property
+    def stages(self) -> dict[str, Stage]:
+        """Stages by id, in wf-run.json order (then any unlisted stage folders)."""
+        if self._stages is None:
+            self._stages = self._load_stages()
+        return self._stages
+
+    @property
+    def stage_ids(self) -> list[str]:
+        """Stage ids in run order."""
+        return list(self.stages)
+
+    def get_stage(self, stage_id: str) -> Stage | None:
+        """Stage by id (None if the run has no such stage folder)."""
+        return self.stages.get(stage_id)
+
+    def is_finalized(self, stage_id: str) -> bool:
+        """True if the stage has published output-params.json."""
+        return file_fingerprint(self._output_params_path(stage_id)) is not None
+
+    def output_params(self, stage_id: str) -> dict[str, Any]:
+        """Published output parameters of a stage (empty dict if not finalized)."""
+        path = self._output_params_path(stage_id)
+        try:
+            data = shared_json_cache.load(path)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        parameters = data.get("parameters", {}) if isinstance(data, dict) else {}
+        return parameters if isinstance(parameters, dict) else {}
+
+    def refresh(self) -> None:
+        """Forget the stage index and dependency graph (e.g. after re-compose)."""
+        self._stages = None
+        self._graph = None
+        self.config_errors = {}
+
+    # =========================================================================
+    # Dependency graph (from_stage references)
+    # =========================================================================
+
+    @property
+    def dependency_graph(self) -> dict[str, list[str]]:
+        """stage_id -> upstream stage ids it reads inputs/parameters from.
+
+        Upstream ids are listed in run order; references to stages that are
+        not part of the run are kept so callers can report them.
+        """
+        if self._graph is None:
+            order = {stage_id: i for i, stage_id in enumerate(self.stages)}
+            graph = {}
+            for stage_id, stage in self.stages.items():
+                upstream = stage_dependencies(self._config(stage_id, stage))
+                graph[stage_id] = sorted(upstream, key=lambda s: (order.get(s, len(order)), s))
+            self._graph = graph
+        return self._graph
+
+    @property
+    def graph(self) -> StageGraph:
+        """The dependency graph as a StageGraph (levels, cycles, ready stages)."""
+        return StageGraph(self.dependency_graph)
+
+    def completed(self) -> set[str]:
+        """Stages that are done: status "completed" or output-params.json published."""
+        return {
+            stage_id
+            for stage_id in self.stages
+            if self.status(stage_id) == "completed" or self.is_finalized(stage_id)
+        }
+
+    def ready(self) -> list[str]:
+        """Stages that can start now: pending, with every upstream completed."""
+        running = {s for s, status in self.statuses().items() if status == "in_progress"}
+        return self.graph.ready(self.completed(), exclude=running)
+
+    def dependencies(self, stage_id: str) -> list[str]:
+        """Stages that stage_id reads from (empty if unknown)."""
+        return self.dependency_graph.get(stage_id, [])
+
+    def dependents(self, stage_id: str) -> list[str]:
+        """Stages that read from stage_id, in run order."""
+        return [s for s, upstream in self.dependency_graph.items() if stage_id in upstream]
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _load_stages(self) -> dict[str, Stage]:
+        stages_dir = self.path / "stages"
+        try:
+            folders = {p.name for p in stages_dir.iterdir() if p.is_dir()}
+        except OSError:
+            folders = set()
+
+        listed = [s for s in self.statuses() if s in folders]
+        ordered = listed + sorted(folders.difference(listed))
+
+        stages = {}
+        for stage_id in ordered:
+            stage_path = stages_dir / stage_id
+            config = None
+            try:
+                config = load_stage_config(stage_path)
+            except (OSError, yamlio.YAMLError) as e:
+                self.config_errors[stage_id] = str(e)
+            if config is not None and not isinstance(config, dict):
+                self.config_errors[stage_id] = "stage-config.yaml is not a mapping"
+                config = None
+            stages[stage_id] = Stage(stage_path, config=config)
+        return stages
+
+    def _config(self, stage_id: str, stage: Stage) -> dict[str, Any]:
+        """A stage's config, or {} if it cannot be loaded (see config_errors)."""
+        try:
+            return stage.config
+        except ValueError as e:
+            self.config_errors.setdefault(stage_id, str(e))
+            return {}
+
+    def _output_params_path(self, stage_id: str) -> Path:
+        return self.path / "stages" / stage_id / "run" / "output-data" / "output-params.json"
+
+    def __repr__(self) -> str:
+        return f"Run({str(self.path)!r})"
+
@@ -0,0 +1,108 @@
+"""Per-run index of stage configs: run-index.json.
+
+Stage, preflight, validate_stage and Run each used to yaml-load the same
+stage-config.yaml files independently. Compose now also writes one compact
+run-index.json at the run root holding every stage's config, its declared
+output paths and its dependency edges, together with the (mtime_ns, size)
+of the stage-config.yaml each entry was taken from.
+
+load_stage_config() serves a config from the index while that fingerprint
+still matches the file (one stat), and falls back to parsing the YAML when
+the index is missing, unreadable or stale (e.g. stage-config.yaml was
+edited by hand). The parsed index itself goes through the process-wide
+JsonCache, so it is read once per process and re-read only if it changes.
+"""
+
+import copy
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from chainglass import yamlio
+from chainglass.documents import file_fingerprint, shared_json_cache
+from chainglass.graph import stage_dependencies
+
+RUN_INDEX_FILENAME = "run-index.json"
+RUN_INDEX_VERSION = 1
+
+
+def build_run_index(
+    run_folder: Path,
+    configs: Mapping[str, dict[str, Any]],
+    fingerprints: Mapping[str, tuple[int, int] | None] | None = None,
+) -> dict[str, Any]:
+    """Index entries for the given stage configs (already written as stage-config.yaml).
+
+    Args:
+        run_folder: Run directory containing stages/
+        configs: stage_id -> config, in run order
+        fingerprints: stage_id -> stage-config.yaml (mtime_ns, size), if
+            known (default: stat each file)
+
+    Returns:
+        The run-index.json document
+    """
+    stages = {}
+    for stage_id, config in configs.items():
+        if fingerprints is not None:
+            fingerprint = fingerprints.get(stage_id)
+        else:
+            fingerprint = file_fingerprint(run_folder / "stages" / stage_id / "stage-config.yaml")
+        try:
+            json.dumps(config)
+        except (TypeError, ValueError):
+            fingerprint = None  # YAML-only values (e.g. dates): always load from YAML
+        outputs = config.get("outputs") or {}
+        stages[stage_id] = {
+            "config_fingerprint": list(fingerprint) if fingerprint else None,
+            "config": config if fingerprint else None,
+            "outputs": [
+                output["path"]
+                for category in ("files", "data", "runtime")
+                for output in outputs.get(category) or []
+                if isinstance(output, dict) and "path" in output
+            ],
+            "depends_on": sorted(stage_dependencies(config)),
+        }
+    return {"version": RUN_INDEX_VERSION, "run_id": run_folder.name, "stages": stages}
+
+
+def write_run_index(run_folder: Path, configs: Mapping[str, dict[str, Any]]) -> Path:
+    """Write run-index.json for a composed run and return its path."""
+    index_path = run_folder / RUN_INDEX_FILENAME
+    index_path.write_text(json.dumps(build_run_index(run_folder, configs), separators=(",", ":")))
+    return index_path
+
+
+def load_run_index(run_dir: Path) -> dict[str, Any] | None:
+    """The run's parsed run-index.json (shared - do not mutate), or None if unusable."""
+    try:
+        index = shared_json_cache.load(Path(run_dir) / RUN_INDEX_FILENAME)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != RUN_INDEX_VERSION:
+        return None
+    return index
+
+
+def load_stage_config(stage_path: Path) -> Any:
+    """Parsed stage-config.yaml, from run-index.json when it is fresh.
+
+    Behaves like yamlio.load(stage-config.yaml): returns None for an empty
+    file and the caller gets its own copy to modify.
+
+    Raises:
+        FileNotFoundError: If stage-config.yaml does not exist
+        yamlio.YAMLError: If stage-config.yaml is not valid YAML
+    """
+    stage_path = Path(stage_path)
+    config_path = stage_path / "stage-config.yaml"
+    index = load_run_index(stage_path.parent.parent)
+    if index is not None:
+        entry = index.get("stages", {}).get(stage_path.name)
+        if isinstance(entry, dict) and entry.get("config_fingerprint") is not None:
+            fingerprint = file_fingerprint(config_path)
+            if fingerprint is not None and list(fingerprint) == entry["config_fingerprint"]:
+                return copy.deepcopy(entry.get("config"))
+    return yamlio.load(config_path.read_text())
@@ -6,13 +6,15 @@ reading everything from stage-config.yaml. Validation is separate from loading.
 
 import json
 from dataclasses import dataclass, field
-from functools import cached_property
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from chainglass import yamlio
+from chainglass.documents import file_fingerprint, shared_json_cache
+from chainglass.query import compile_query
+from chainglass.runindex import load_stage_config
 from chainglass.validator import ValidationResult
+from chainglass.wfrun import WfRunStore, utc_now
 
 
 def resolve_query(data: dict | list | Any, query: str) -> Any:
@@ -24,63 +26,17 @@ def resolve_query(data: dict | list | Any, query: str) -> Any:
         resolve_query({"items": [{"name": "x"}]}, "items[0].name") → "x"
         resolve_query({"a": {"b": {"c": 2}}}, "a.b.c") → 2
         resolve_query({"items": [1, 2, 3]}, "items.length") → 3
+        resolve_query({"items": [{"n": 1}, {"n": 2}]}, "items[*].n.sum()") → 3
+        resolve_query({"items": [{"s": "high"}]}, "items[?s=='high'].count()") → 1
+
+    See chainglass.query for the full grammar (wildcards, filters, aggregates).
 
     Returns None if path doesn't exist (no exceptions for missing keys).
     """
-    import re
-
-    if data is None or query is None or query == "":
+    if query is None:
         return None
-
-    current = data
-
-    # Split query into segments, handling array indexing
-    # Pattern: property name optionally followed by [index]
-    # Examples: "a", "items[0]", "components[1]"
-    segment_pattern = re.compile(r"([^.\[\]]+)(?:\[(\d+)\])?")
-
-    parts = query.split(".")
-    for part in parts:
-        if current is None:
-            return None
-
-        match = segment_pattern.fullmatch(part)
-        if not match:
-            return None
-
-        key, index = match.groups()
-
-        # Special case: "length" on a list returns len()
-        if key == "length" and isinstance(current, list):
-            return len(current)
-
-        # Navigate to key
-        if isinstance(current, dict):
-            if key not in current:
-                return None
-            current = current[key]
-        elif isinstance(current, list):
-            # For lists, key might be a numeric index without brackets
-            try:
-                idx = int(key)
-                if idx < 0 or idx >= len(current):
-                    return None
-                current = current[idx]
-            except ValueError:
-                return None
-        else:
-            return None
-
-        # Handle array index if present
-        if index is not None:
-            if not isinstance(current, list):
-                return None
-            idx = int(index)
-            if idx < 0 or idx >= len(current):
-                return None
-            current = current[idx]
-
-    return current
+    # Parsed once per query string (see chainglass.query)
+    return compile_query(query).evaluate(data)
 
 
 class Stage:
@@ -93,6 +49,8 @@ class Stage:
 
     Args:
         path: Path to stage folder (e.g., "run/stages/explore")
+        config: Already-loaded stage-config.yaml contents (e.g. from a Run);
+            still reloaded if the file changes afterwards
 
     Example:
         >>> stage = Stage(Path("run/stages/explore"))
@@ -106,10 +64,15 @@ class Stage:
         True
     """
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, config: dict | None = None):
         self.path = Path(path).resolve()
-        self._config: dict | None = None
-        self._json_cache: dict[Path, Any] = {}  # FIX-008: JSON caching
+        self._config = config
+        self._config_fingerprint = (
+            file_fingerprint(self.path / "stage-config.yaml") if config is not None else None
+        )
+        # FIX-008: JSON caching - bounded, process-wide, revalidated by stat
+        self._json_cache = shared_json_cache
+        self._completion: tuple[tuple, bool] | None = None  # (fingerprint, is_complete)
 
     # =========================================================================
     # Path Discovery (derived from stage folder location)
@@ -136,17 +99,22 @@ class Stage:
 
     @property
     def config(self) -> dict:
-        """Load stage-config.yaml (lazy, cached)."""
-        if self._config is None:
-            config_path = self.path / "stage-config.yaml"
+        """Load stage-config.yaml (lazy, cached; reloaded if the file changes).
+
+        Served from the run's run-index.json when it is fresh.
+        """
+        config_path = self.path / "stage-config.yaml"
+        fingerprint = file_fingerprint(config_path)
+        if self._config is None or fingerprint != self._config_fingerprint:
             try:
-                loaded = yaml.safe_load(config_path.read_text())
+                loaded = load_stage_config(self.path)
                 if loaded is None:
                     raise ValueError(f"stage-config.yaml is empty: {config_path}")
                 self._config = loaded
+                self._config_fingerprint = fingerprint
             except FileNotFoundError:
                 raise ValueError(f"stage-config.yaml not found: {config_path}")
-            except yaml.YAMLError as e:
+            except yamlio.YAMLError as e:
                 raise ValueError(f"Invalid YAML in {config_path}: {e}")
         return self._config
 
@@ -209,10 +177,26 @@ class Stage:
 
         return result
 
-    @cached_property
+    @property
     def is_complete(self) -> bool:
-        """Convenience: True if validate() passes."""
-        return self.validate().valid
+        """Convenience: True if validate() passes.
+
+        Cached until stage-config.yaml or any file validate() looks at
+        changes (checked with one stat per file).
+        """
+        fingerprint = self._completion_fingerprint()
+        if self._completion is None or self._completion[0] != fingerprint:
+            self._completion = (fingerprint, self.validate().valid)
+        return self._completion[1]
+
+    def _completion_fingerprint(self) -> tuple:
+        """Stat fingerprints of every file validate() depends on."""
+        outputs = self.config.get("outputs", {})
+        paths = [self.path / "stage-config.yaml"]
+        paths.extend(self.path / o["path"] for o in outputs.get("files", []))
+        paths.extend(self.path / o["path"] for o in outputs.get("data", []))
+        paths.extend(self.path / p["source"] for p in self.config.get("output_parameters", []))
+        return tuple(file_fingerprint(p) for p in paths)
 
     @property
     def is_finalized(self) -> bool:
@@ -259,36 +243,66 @@ class Stage:
             return result
 
         # Step 2: Update wf-run.json status
-        self._update_wf_run_status("completed")
+        self._update_wf_run_status("completed", event="finalize")
 
         result.parameters = validation.output_params
         return result
 
-    def _update_wf_run_status(self, status: str) -> None:
-        """Update this stage's status in wf-run.json."""
-        from datetime import datetime, timezone
+    def accept(self) -> str:
+        """Write accept.json granting control to the agent, and mark the stage in_progress.
 
-        # FIX-007: Check wf-run.json exists
-        if not self.wf_run_path.exists():
-            return  # Silent no-op if wf-run.json missing
+        Creates run/output-data/ if needed. Idempotent: calling it again
+        overwrites accept.json with a new timestamp. The same timestamp is
+        recorded as started_at in wf-run.json.
 
-        try:
-            wf_run = json.loads(self.wf_run_path.read_text())
-        except json.JSONDecodeError:
-            return  # Silent no-op if wf-run.json is corrupted
-        stage_found = False  # FIX-011: Track if stage found
-        for stage in wf_run.get("stages", []):
-            if stage["id"] == self.stage_id:
-                stage["status"] = status
-                if status == "completed":
-                    stage["completed_at"] = datetime.now(timezone.utc).isoformat()
-                stage_found = True
-                break
+        Returns:
+            The ISO-8601 timestamp written
+        """
+        output_data_path = self.path / "run" / "output-data"
+        output_data_path.mkdir(parents=True, exist_ok=True)
+        timestamp = utc_now()
+        accept_data = {
+            "state": "agent",
+            "timestamp": timestamp,
+        }
+        (output_data_path / "accept.json").write_text(json.dumps(accept_data, indent=2))
+        WfRunStore(self.wf_run_path).set_status(
+            self.stage_id, "in_progress", timestamp, event="accept"
+        )
+        return timestamp
+
+    def record_handback(self, reason: str) -> str:
+        """Record in wf-run.json that the agent handed control back.
+
+        Sets handback (the handback reason) and handed_back_at on this
+        stage's entry; the status itself is left to finalize.
 
-        if not stage_found:
-            return  # FIX-011: Silent no-op if stage not in wf-run.json
+        Returns:
+            The ISO-8601 timestamp recorded
+        """
+        timestamp = utc_now()
+        WfRunStore(self.wf_run_path).update_stage(
+            self.stage_id, event="handback", handback=reason, handed_back_at=timestamp
+        )
+        return timestamp
+
+    def set_status(self, status: str) -> None:
+        """Record this stage's status in wf-run.json (e.g. "in_progress", "failed").
+
+        "in_progress" also stamps started_at, "completed" stamps completed_at.
+        No-op if wf-run.json is missing, corrupt, or doesn't list the stage.
+        """
+        self._update_wf_run_status(status)
 
-        self.wf_run_path.write_text(json.dumps(wf_run, indent=2))
+    def _update_wf_run_status(self, status: str, event: str = "status") -> None:
+        """Record this stage's status in wf-run.json.
+
+        Appends an event to the run's wf-run.events.jsonl through WfRunStore,
+        so stages finalizing in parallel never overwrite each other's updates.
+        FIX-007/FIX-011: silent no-op if wf-run.json is missing; stages it
+        doesn't list are ignored.
+        """
+        WfRunStore(self.wf_run_path).set_status(self.stage_id, status, event=event)
 
     # =========================================================================
     # Output Access (graceful - returns None/empty if not present)
@@ -359,11 +373,7 @@ class Stage:
             return None
 
         # FIX-008: Use cache
-        resolved_path = source_path.resolve()
-        if resolved_path not in self._json_cache:
-            self._json_cache[resolved_path] = json.loads(source_path.read_text())
-
-        data = self._json_cache[resolved_path]
+        data = self._json_cache.load(source_path)
         return resolve_query(data, query)
 
 
@@ -0,0 +1,201 @@
+"""Streaming validation for very large JSON array outputs.
+
+Some stages emit multi-hundred-MB data files whose top level is an array
+(e.g. findings). Loading them with json.loads holds the full text and the
+parsed tree in memory at once. Here the array is decoded incrementally,
+one item at a time, and each item is validated against the schema's
+"items" subschema, so memory is bounded by the read buffer plus the
+largest single item.
+
+Only schemas whose array-level constraints can be checked while streaming
+are eligible (see is_streamable); everything else is validated by the
+regular full-document path.
+"""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.protocols import Validator
+
+# Outputs at least this large are streamed automatically (unless streaming: false)
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Root keywords that are either annotations or checkable item-by-item
+_STREAMABLE_KEYWORDS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "$defs",
+    "definitions",
+    "title",
+    "description",
+    "examples",
+    "default",
+    "type",
+    "items",
+    "minItems",
+    "maxItems",
+}
+
+_WHITESPACE = " \t\n\r"
+
+
+class NotAnArrayError(ValueError):
+    """The document's top-level value is not a JSON array."""
+
+
+def should_stream(output: dict[str, Any], output_path: Path) -> bool:
+    """Decide whether an output is validated in streaming mode.
+
+    An explicit `streaming: true/false` in the stage-config output wins;
+    otherwise files of STREAMING_THRESHOLD_BYTES or more are streamed.
+    """
+    streaming = output.get("streaming")
+    if streaming is not None:
+        return bool(streaming)
+    try:
+        return output_path.stat().st_size >= STREAMING_THRESHOLD_BYTES
+    except OSError:
+        return False
+
+
+def is_streamable(schema: Any) -> bool:
+    """True if the schema constrains a top-level array only through
+    type/items/minItems/maxItems (plus annotations and definitions)."""
+    if not isinstance(schema, dict) or not isinstance(schema.get("items"), (dict, bool)):
+        return False
+    schema_type = schema.get("type", "array")
+    if schema_type != "array" and schema_type != ["array"]:
+        return False
+    return set(schema) <= _STREAMABLE_KEYWORDS
+
+
+def iter_array_items(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one at a time.
+
+    Raises:
+        NotAnArrayError: If the top-level value is not an array (nothing yielded)
+        json.JSONDecodeError: On malformed JSON (message includes the char offset)
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        offset = 0  # Absolute char offset of buf[0]
+        eof = False
+
+        def fill(min_size: int = chunk_size) -> bool:
+            """Append more text (doubling for large items); False at EOF."""
+            nonlocal buf, pos, offset, eof
+            if eof:
+                return False
+            # Drop consumed text so the buffer only holds the current item
+            buf = buf[pos:]
+            offset += pos
+            pos = 0
+            chunk = f.read(max(min_size, len(buf)))
+            if not chunk:
+                eof = True
+                return False
+            buf += chunk
+            return True
+
+        def skip_ws() -> str | None:
+            """Advance past whitespace; return the next char (None at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return None
+
+        def error(message: str) -> json.JSONDecodeError:
+            char = offset + pos
+            return json.JSONDecodeError(f"{message} (char {char})", buf, pos)
+
+        first = skip_ws()
+        if first != "[":
+            raise NotAnArrayError("top-level value is not an array")
+        pos += 1
+
+        expect_item = False  # True after a comma
+        while True:
+            char = skip_ws()
+            if char is None:
+                raise error("Unterminated array")
+            if char == "]" and not expect_item:
+                pos += 1
+                break
+
+            # Decode one item; retry with more text if it may be truncated
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                    if end < len(buf) or eof:
+                        break  # A following char proves the value is complete
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise error(e.msg) from None
+                if not fill():
+                    continue  # EOF reached - final attempt decides
+            pos = end
+            yield item
+
+            char = skip_ws()
+            if char == ",":
+                pos += 1
+                expect_item = True
+            elif char == "]":
+                pos += 1
+                break
+            elif char is None:
+                raise error("Unterminated array")
+            else:
+                raise error("Expecting ',' delimiter")
+
+        if skip_ws() is not None:
+            raise error("Extra data")
+
+
+def iter_stream_errors(validator: Validator, path: Path) -> Iterator[ValidationError]:
+    """Validate a top-level array file item-by-item, yielding errors lazily.
+
+    Items are checked against the schema's "items" subschema in the context
+    of the full schema (so local "$ref"s resolve); error paths include the
+    item index. minItems/maxItems are checked once the array is consumed.
+
+    Raises:
+        NotAnArrayError: If the document is not an array
+        json.JSONDecodeError: On malformed JSON
+    """
+    schema = validator.schema
+    items_schema = schema["items"]
+    count = 0
+    for index, item in enumerate(iter_array_items(path)):
+        count += 1
+        yield from validator.descend(item, items_schema, path=index, schema_path="items")
+
+    min_items = schema.get("minItems")
+    if min_items is not None and count < min_items:
+        yield ValidationError(
+            f"array has {count} items, fewer than minItems {min_items}",
+            validator="minItems",
+            validator_value=min_items,
+            schema=schema,
+        )
+    max_items = schema.get("maxItems")
+    if max_items is not None and count > max_items:
+        yield ValidationError(
+            f"array has {count} items, more than maxItems {max_items}",
+            validator="maxItems",
+            validator_value=max_items,
+            schema=schema,
+        )
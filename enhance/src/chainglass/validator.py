@@ -12,15 +12,37 @@ Also implements stage output validation per A.12 algorithm:
 """
 
 import json
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, Literal
 
 import jsonschema
-import yaml
 
+from chainglass.cache import (
+    DEFAULT_MAX_ERRORS,
+    collect_errors,
+    get_validator,
+    validate_instance,
+)
+from chainglass.documents import DocumentStore, file_fingerprint
+from chainglass.graph import CycleError, StageGraph
+from chainglass.linking import within_stage
+from chainglass.manifest import ValidationManifest, file_sha256
 from chainglass.parser import WorkflowParseError, parse_workflow
+from chainglass.query import compile_queries, compile_query
+from chainglass.runindex import load_stage_config
+from chainglass.streaming import (
+    NotAnArrayError,
+    is_streamable,
+    iter_stream_errors,
+    should_stream,
+)
 
 
 @dataclass
@@ -30,6 +52,7 @@ class ValidationResult:
     valid: bool
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    workflow: dict[str, Any] | None = None  # Parsed wf.yaml (set once Phase 1 passes)
 
 
 # =============================================================================
@@ -123,6 +146,35 @@ class StageValidationResult:
         return result
 
 
+@dataclass
+class RunValidationResult:
+    """Aggregated result of validating every stage in a run folder."""
+
+    status: Literal["pass", "fail"]
+    run_dir: str
+    stages: list[StageValidationResult] = field(default_factory=list)
+    durations_ms: dict[str, float] = field(default_factory=dict)  # stage_id -> time
+    duration_ms: float = 0.0  # Wall-clock time for the whole run
+    summary: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON-serializable dict (one payload per stage)."""
+        return {
+            "status": self.status,
+            "run_dir": self.run_dir,
+            "stages": [
+                {
+                    "stage_id": stage.stage_id,
+                    "duration_ms": self.durations_ms.get(stage.stage_id, 0.0),
+                    "result": stage.to_dict(),
+                }
+                for stage in self.stages
+            ],
+            "duration_ms": self.duration_ms,
+            "summary": self.summary,
+        }
+
+
 class ValidationError(Exception):
     """Raised when wf-spec validation fails."""
 
@@ -137,7 +189,86 @@ class ValidationError(Exception):
         return "\n".join(lines)
 
 
-def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
+class _SpecFileIndex:
+    """In-memory index of the files and directories Phase 2 checks.
+
+    Built from one os.scandir walk so Phase 2 existence checks become set
+    lookups instead of one stat() round trip each (expensive on network
+    filesystems). Only the wf-spec root and the top-level subtrees named in
+    subtrees are walked (e.g. stages/, schemas/, templates/), not unrelated
+    folders. With workers > 1, directories at the same depth are scanned
+    concurrently in a thread pool.
+
+    Symlinks are indexed only if their target exists, like Path.exists().
+    Lookups that miss the index (including paths outside the walked
+    subtrees) fall back to Path.exists(), so results always match a direct
+    filesystem check; only the rare missing-file case pays for a syscall.
+    """
+
+    def __init__(self, root: Path, subtrees: Iterable[str], workers: int | None = None) -> None:
+        self.root = root
+        self.paths: set[str] = set()
+        self._subtrees = set(subtrees)
+        self._seen_links: set[str] = set()
+
+        frontier = [(root, "")]
+        pool = ThreadPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+        try:
+            while frontier:
+                scanned = pool.map(self._scan, frontier) if pool else map(self._scan, frontier)
+                frontier = []
+                for entries, subdirs in scanned:
+                    self.paths.update(entries)
+                    frontier.extend(subdirs)
+        finally:
+            if pool:
+                pool.shutdown()
+
+    def _scan(self, directory: tuple[Path, str]) -> tuple[list[str], list[tuple[Path, str]]]:
+        """List one directory: (relative entry paths, subdirectories to descend)."""
+        dir_path, prefix = directory
+        entries: list[str] = []
+        subdirs: list[tuple[Path, str]] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel = prefix + entry.name
+                    try:
+                        # is_dir() follows symlinks; a broken symlink is neither
+                        is_dir = entry.is_dir()
+                        if entry.is_symlink():
+                            if not (is_dir or entry.is_file() or os.path.exists(entry.path)):
+                                continue  # Broken symlink: does not exist
+                    except OSError:
+                        continue
+                    entries.append(rel)
+                    if not is_dir or (not prefix and entry.name not in self._subtrees):
+                        continue
+                    if entry.is_symlink():
+                        # Follow directory symlinks once (guards against loops)
+                        real = os.path.realpath(entry.path)
+                        if real in self._seen_links:
+                            continue
+                        self._seen_links.add(real)
+                    subdirs.append((Path(entry.path), rel + "/"))
+        except OSError:
+            pass  # Unreadable directory - lookups below it fall back to exists()
+        return entries, subdirs
+
+    def exists(self, rel_path: str) -> bool:
+        """True if rel_path (relative to the wf-spec folder) exists."""
+        key = Path(os.path.normpath(rel_path)).as_posix()
+        if key in self.paths:
+            return True
+        return (self.root / rel_path).exists()
+
+
+def validate_wf_spec(
+    wf_spec_path: Path,
+    use_cache: bool = False,
+    workers: int | None = None,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> ValidationResult:
     """Validate wf-spec folder completeness.
 
     Two-phase validation:
@@ -149,9 +280,16 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
        - All shared templates exist
        - All shared schemas exist
        - For each stage: prompt/main.md exists, all schemas exist
+       - output_parameters queries are syntactically valid
+       - from_stage references name known stages and form no cycle
+       All checks resolve against a single directory scan of the checked
+       subtrees of wf-spec/.
 
     Args:
         wf_spec_path: Path to the wf-spec folder
+        use_cache: Use the on-disk wf.yaml parse cache for Phase 1
+        workers: Scan wf-spec/ with this many threads (for slow filesystems)
+        max_errors: Schema errors to report for wf.yaml (None or 0 = all)
 
     Returns:
         ValidationResult with valid=True if all checks pass, else errors populated
@@ -164,22 +302,26 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
     # Must fail-fast because we need valid wf.yaml to check stage files
     # =========================================================================
     try:
-        workflow = parse_workflow(wf_spec_path)
+        workflow = parse_workflow(wf_spec_path, use_cache=use_cache, max_errors=max_errors)
     except WorkflowParseError as e:
         result.valid = False
         result.errors.append(str(e))
         return result  # Fail fast - can't continue without valid wf.yaml
 
+    result.workflow = workflow
+
     # =========================================================================
     # PHASE 2: Collect-All File Existence Checks
     # Collect ALL errors so users see complete picture in one run
     # =========================================================================
-
     # Check shared templates from shared_templates config
     shared_templates = workflow.get("shared_templates", [])
+    subtrees = {"schemas", "stages"}
+    subtrees.update(Path(t["source"]).parts[0] for t in shared_templates if t.get("source"))
+    spec_files = _SpecFileIndex(wf_spec_path, subtrees, workers=workers)
     for template in shared_templates:
         source = wf_spec_path / template["source"]
-        if not source.exists():
+        if not spec_files.exists(template["source"]):
             result.valid = False
             result.errors.append(
                 f"Missing required file: {source}\n"
@@ -191,7 +333,7 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
     shared_schemas = ["wf-result.schema.json"]  # Required shared schema
     for schema_name in shared_schemas:
         schema_path = wf_spec_path / "schemas" / schema_name
-        if not schema_path.exists():
+        if not spec_files.exists(f"schemas/{schema_name}"):
             result.valid = False
             result.errors.append(
                 f"Missing required schema: {schema_path}\n"
@@ -206,7 +348,7 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
         stage_dir = wf_spec_path / "stages" / stage_id
 
         # Check stage directory exists
-        if not stage_dir.exists():
+        if not spec_files.exists(f"stages/{stage_id}"):
             result.valid = False
             result.errors.append(
                 f"Missing stage directory: {stage_dir}\n"
@@ -216,7 +358,7 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
 
         # Check prompt/main.md exists
         prompt_path = stage_dir / "prompt" / "main.md"
-        if not prompt_path.exists():
+        if not spec_files.exists(f"stages/{stage_id}/prompt/main.md"):
             result.valid = False
             result.errors.append(
                 f"Missing required file: {prompt_path}\n"
@@ -241,7 +383,7 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
                         continue
                     # Stage-specific schema
                     schema_path = stage_dir / "schemas" / schema_name
-                    if not schema_path.exists():
+                    if not spec_files.exists(f"stages/{stage_id}/schemas/{schema_name}"):
                         result.valid = False
                         result.errors.append(
                             f"Missing stage schema: {schema_path}\n"
@@ -249,16 +391,50 @@ def validate_wf_spec(wf_spec_path: Path) -> ValidationResult:
                             f"See: Stage output definition in wf.yaml."
                         )
 
+        # Check output_parameters queries parse (syntax errors would
+        # otherwise silently publish nothing)
+        for param in stage.get("output_parameters", []):
+            query_error = compile_query(param.get("query", "")).error
+            if query_error:
+                result.valid = False
+                result.errors.append(
+                    f"Invalid output_parameter query in stage '{stage_id}': {query_error}\n"
+                    f"Action: Fix the query for '{param.get('name')}' in wf.yaml."
+                )
+
+    # Check from_stage references name existing stages and don't form a cycle
+    graph = StageGraph.from_workflow(workflow)
+    for stage_id, unknown in graph.missing.items():
+        for from_stage in unknown:
+            result.valid = False
+            result.errors.append(
+                f"Unknown from_stage '{from_stage}' in stage '{stage_id}'\n"
+                f"Action: Use the id of a stage defined in wf.yaml, or remove the reference."
+            )
+    cycle = graph.find_cycle()
+    if cycle:
+        result.valid = False
+        result.errors.append(str(CycleError(cycle)))
+
     return result
 
 
-def validate_or_raise(wf_spec_path: Path) -> dict[str, Any]:
+def validate_or_raise(
+    wf_spec_path: Path,
+    use_cache: bool = False,
+    workers: int | None = None,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> dict[str, Any]:
     """Validate wf-spec and return workflow dict, or raise ValidationError.
 
-    Convenience function that combines validation and parsing.
+    Convenience function that combines validation and parsing. The workflow
+    parsed during Phase 1 is returned directly (wf.yaml is parsed once).
 
     Args:
         wf_spec_path: Path to the wf-spec folder
+        use_cache: Use the on-disk wf.yaml parse cache
+        workers: Thread count for the wf-spec directory scan (Phase 2)
+        max_errors: Schema errors to report for wf.yaml (None or 0 = all)
 
     Returns:
         Parsed workflow definition dict
@@ -266,12 +442,13 @@ def validate_or_raise(wf_spec_path: Path) -> dict[str, Any]:
     Raises:
         ValidationError: If validation fails
     """
-    result = validate_wf_spec(wf_spec_path)
+    result = validate_wf_spec(
+        wf_spec_path, use_cache=use_cache, workers=workers, max_errors=max_errors
+    )
     if not result.valid:
         raise ValidationError(result)
 
-    # Re-parse to get workflow dict (validation already passed)
-    return parse_workflow(wf_spec_path)
+    return result.workflow
 
 
 # =============================================================================
@@ -279,7 +456,12 @@ def validate_or_raise(wf_spec_path: Path) -> dict[str, Any]:
 # =============================================================================
 
 
-def validate_stage(stage_path: Path) -> StageValidationResult:
+def validate_stage(
+    stage_path: Path,
+    incremental: bool = False,
+    documents: DocumentStore | None = None,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> StageValidationResult:
     """Validate stage outputs per A.12 algorithm.
 
     This function is designed to be called by an LLM at the end of stage
@@ -295,15 +477,28 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
     4. Write output-params.json on success
     5. Generate summary
 
+    With incremental=True, per-output results are recorded in
+    .validation-manifest.json and reused on later calls for outputs whose
+    file and schema fingerprints are unchanged (see chainglass.manifest).
+
+    Each JSON file is read and parsed once per call (via a DocumentStore)
+    and shared by schema validation, parameter extraction and the
+    accept/handback checks.
+
+    Schema errors are collected lazily, up to max_errors per output; the
+    last reported error's action notes when an output has more.
+    max_errors=1 is a fail-fast mode reporting only the most relevant
+    error, as jsonschema.validate() would.
+
     Args:
         stage_path: Path to stage folder (e.g., "run/stages/explore")
+        incremental: Skip re-validating outputs unchanged since the last call
+        documents: Document store to read JSON through (default: a fresh one)
+        max_errors: Schema errors to report per output (None or 0 = all)
 
     Returns:
         StageValidationResult with status, checks, errors, and output_params
     """
-    # Import here to avoid circular import
-    from chainglass.stage import resolve_query
-
     stage_path = Path(stage_path).resolve()
 
     # Load stage-config.yaml
@@ -324,50 +519,81 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
             summary=f"Stage '{stage_path.name}': 0 checks passed, 1 error",
         )
 
-    config = yaml.safe_load(config_path.read_text()) or {}
+    config = load_stage_config(stage_path) or {}
     stage_id = config.get("id", stage_path.name)
 
     result = StageValidationResult(status="pass", stage_id=stage_id)
+    manifest = ValidationManifest(stage_path) if incremental else None
+    if documents is None:
+        documents = DocumentStore(track_digests=incremental)
 
     # Validate outputs from all categories: files, data, runtime
     outputs_config = config.get("outputs", {})
 
     # Category: files
     for output in outputs_config.get("files", []):
-        _validate_output_file(stage_path, output, result, has_schema=False)
+        _validate_output(
+            stage_path, output, result, documents, manifest, max_errors, has_schema=False
+        )
 
     # Category: data
     for output in outputs_config.get("data", []):
         is_required = output.get("required", True)
-        _validate_output_file(
-            stage_path, output, result, has_schema=True, required=is_required
+        _validate_output(
+            stage_path,
+            output,
+            result,
+            documents,
+            manifest,
+            max_errors,
+            has_schema=True,
+            required=is_required,
         )
 
     # Category: runtime (if present in config)
     for output in outputs_config.get("runtime", []):
         is_required = output.get("required", False)  # Runtime often optional
-        _validate_output_file(
-            stage_path, output, result, has_schema=True, required=is_required
+        _validate_output(
+            stage_path,
+            output,
+            result,
+            documents,
+            manifest,
+            max_errors,
+            has_schema=True,
+            required=is_required,
         )
 
+    if manifest:
+        manifest.save()
+
     # Extract output_parameters if validation passed
     if result.status == "pass":
         output_params = config.get("output_parameters", [])
         if output_params:
-            extracted = {}
+            # Group queries by source so each document is walked once
+            queries_by_source: dict[str, list[str]] = {}
             for param in output_params:
                 source_path = stage_path / param["source"]
                 # Security: validate source path is within stage
                 if not source_path.resolve().is_relative_to(stage_path):
                     continue  # Skip malicious source
-                if source_path.exists():
-                    try:
-                        data = json.loads(source_path.read_text())
-                        value = resolve_query(data, param["query"])
-                        if value is not None:
-                            extracted[param["name"]] = value
-                    except (json.JSONDecodeError, KeyError):
-                        pass  # Already validated, shouldn't happen
+                if source_path.exists() and "query" in param:
+                    queries_by_source.setdefault(param["source"], []).append(param["query"])
+
+            values: dict[str, dict[str, Any]] = {}
+            for source, queries in queries_by_source.items():
+                try:
+                    data = documents.load(stage_path / source)
+                except json.JSONDecodeError:
+                    continue  # Already validated, shouldn't happen
+                values[source] = compile_queries(tuple(queries)).evaluate(data)
+
+            extracted = {}
+            for param in output_params:
+                value = values.get(param["source"], {}).get(param.get("query"))
+                if value is not None and "name" in param:
+                    extracted[param["name"]] = value
 
             if extracted:
                 # Write output-params.json
@@ -396,7 +622,7 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
         # Load accept.json
         accept_info = AcceptInfo(present=True)
         try:
-            accept_data = json.loads(accept_path.read_text())
+            accept_data = documents.load(accept_path)
             accept_info.state = accept_data.get("state")
             accept_info.timestamp = accept_data.get("timestamp")
 
@@ -404,8 +630,7 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
             schema_path = stage_path / "schemas" / "accept.schema.json"
             if schema_path.exists():
                 try:
-                    schema = json.loads(schema_path.read_text())
-                    jsonschema.validate(accept_data, schema)
+                    validate_instance(accept_data, schema_path)
                 except json.JSONDecodeError:
                     accept_info.valid = False
                     accept_info.warning = "accept.schema.json is invalid JSON"
@@ -433,7 +658,7 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
         # Load and validate handback
         handback_info = HandbackInfo(present=True)
         try:
-            handback_data = json.loads(handback_path.read_text())
+            handback_data = documents.load(handback_path)
             handback_info.reason = handback_data.get("reason")
             handback_info.description = handback_data.get("description")
 
@@ -447,8 +672,7 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
             schema_path = stage_path / "schemas" / "handback.schema.json"
             if schema_path.exists():
                 try:
-                    schema = json.loads(schema_path.read_text())
-                    jsonschema.validate(handback_data, schema)
+                    validate_instance(handback_data, schema_path)
                 except json.JSONDecodeError:
                     handback_info.valid = False
                     handback_info.warning = "handback.schema.json is invalid JSON"
@@ -496,10 +720,176 @@ def validate_stage(stage_path: Path) -> StageValidationResult:
     return result
 
 
+def validate_run(
+    run_dir: Path,
+    jobs: int | None = None,
+    incremental: bool = False,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> RunValidationResult:
+    """Validate every stage under run_dir/stages/ in one process tree.
+
+    Stages are validated in parallel across a process pool (validation is
+    CPU-bound JSON parsing and schema checks), avoiding one interpreter
+    start per stage when an orchestrator checks a whole run.
+
+    Args:
+        run_dir: Path to the run directory containing stages/
+        jobs: Worker processes (default: CPU count; 1 = validate in-process)
+        incremental: Reuse per-stage validation manifests (see validate_stage)
+        max_errors: Schema errors to report per output (None or 0 = all)
+
+    Returns:
+        RunValidationResult with per-stage results and timings, in stage-id
+        order. A stage whose validation raises is reported as failed (check
+        "stage_error"); the other stages are still validated.
+    """
+    run_dir = Path(run_dir).resolve()
+    started = time.perf_counter()
+
+    stages_dir = run_dir / "stages"
+    stage_paths = (
+        sorted(p for p in stages_dir.iterdir() if p.is_dir()) if stages_dir.is_dir() else []
+    )
+
+    worker = partial(_timed_validate_stage, incremental=incremental, max_errors=max_errors)
+    if jobs == 1 or len(stage_paths) <= 1:
+        timed = [worker(p) for p in stage_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            timed = list(pool.map(worker, stage_paths))
+
+    result = RunValidationResult(status="pass", run_dir=str(run_dir))
+    for stage_result, duration_ms in timed:
+        result.stages.append(stage_result)
+        result.durations_ms[stage_result.stage_id] = duration_ms
+        if stage_result.status == "fail":
+            result.status = "fail"
+    result.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    failed = [s.stage_id for s in result.stages if s.status == "fail"]
+    result.summary = f"Run '{run_dir.name}': {len(result.stages) - len(failed)} stages passed, {len(failed)} failed"
+    if failed:
+        result.summary += f" ({', '.join(failed)})"
+    return result
+
+
+def _timed_validate_stage(
+    stage_path: Path,
+    incremental: bool = False,
+    max_errors: int | None = DEFAULT_MAX_ERRORS,
+) -> tuple[StageValidationResult, float]:
+    """validate_stage() plus elapsed milliseconds (process-pool worker).
+
+    An exception (e.g. a malformed stage-config.yaml) becomes a failed
+    result for this stage, so one broken stage cannot abort the run report.
+    """
+    started = time.perf_counter()
+    try:
+        stage_result = validate_stage(stage_path, incremental=incremental, max_errors=max_errors)
+    except Exception as e:
+        stage_result = StageValidationResult(
+            status="fail",
+            stage_id=Path(stage_path).name,
+            errors=[
+                StageValidationCheck(
+                    check="stage_error",
+                    path="stage-config.yaml",
+                    status="FAIL",
+                    message=f"Validation raised {type(e).__name__}: {e}",
+                    action="Fix the stage folder (e.g. the YAML in stage-config.yaml) and re-validate.",
+                )
+            ],
+            summary=f"Stage '{Path(stage_path).name}': 0 checks passed, 1 error",
+        )
+    return stage_result, round((time.perf_counter() - started) * 1000, 3)
+
+
+def _validate_output(
+    stage_path: Path,
+    output: dict,
+    result: StageValidationResult,
+    documents: DocumentStore,
+    manifest: ValidationManifest | None,
+    max_errors: int | None,
+    has_schema: bool,
+    required: bool = True,
+) -> None:
+    """Validate one output, reusing manifest results when it is unchanged.
+
+    Without a manifest this is exactly _validate_output_file(). With one,
+    checks for an existing output inside the stage are looked up by
+    fingerprint first and recorded after a fresh validation.
+    """
+    if manifest is None:
+        _validate_output_file(
+            stage_path, output, result, documents, max_errors, has_schema, required
+        )
+        return
+
+    output_path = stage_path / output["path"]
+    schema_ref = output.get("schema") if has_schema else None
+    schema_path = stage_path / schema_ref if schema_ref else None
+
+    # Only cache outputs that can be fingerprinted: existing files inside the stage
+    cacheable = output_path.resolve().is_relative_to(stage_path) and (
+        schema_path is None or within_stage(schema_path, stage_path)
+    )
+    if not cacheable:
+        _validate_output_file(
+            stage_path, output, result, documents, max_errors, has_schema, required
+        )
+        return
+
+    spec = {
+        "output": output,
+        "has_schema": has_schema,
+        "required": required,
+        "max_errors": max_errors,
+    }
+    entry = manifest.lookup(output["path"], spec, output_path, schema_path)
+    if entry is not None:
+        result.checks.extend(StageValidationCheck(**c) for c in entry["checks"])
+        result.errors.extend(StageValidationCheck(**e) for e in entry["errors"])
+        if entry["errors"]:
+            result.status = "fail"
+        return
+
+    # Streamed outputs are never held in memory, so the DocumentStore has no
+    # digest for them: hash them before validating, not after
+    before = file_fingerprint(output_path)
+    streamed_sha256 = None
+    if before is not None and should_stream(output, output_path):
+        try:
+            streamed_sha256 = file_sha256(output_path)
+        except OSError:
+            before = None
+
+    fresh = StageValidationResult(status="pass", stage_id=result.stage_id)
+    _validate_output_file(stage_path, output, fresh, documents, max_errors, has_schema, required)
+    result.checks.extend(fresh.checks)
+    result.errors.extend(fresh.errors)
+    if fresh.status == "fail":
+        result.status = "fail"
+
+    # Record only if the file was not rewritten while it was being checked
+    if before is not None and file_fingerprint(output_path) == before:
+        manifest.record(
+            output["path"],
+            spec,
+            output_path,
+            schema_path,
+            checks=[dict(c.__dict__) for c in fresh.checks],
+            errors=[dict(e.__dict__) for e in fresh.errors],
+            file_sha256=documents.digest(output_path) or streamed_sha256,
+        )
+
+
 def _validate_output_file(
     stage_path: Path,
     output: dict,
     result: StageValidationResult,
+    documents: DocumentStore,
+    max_errors: int | None,
     has_schema: bool,
     required: bool = True,
 ) -> None:
@@ -509,8 +899,11 @@ def _validate_output_file(
 
     Args:
         stage_path: Path to stage folder
-        output: Output definition dict with path, schema (optional)
+        output: Output definition dict with path, schema (optional),
+            streaming (optional; see chainglass.streaming)
         result: StageValidationResult to update
+        documents: Store the output JSON is read through (parsed once per call)
+        max_errors: Schema errors to report for this output (None or 0 = all)
         has_schema: Whether this output type can have schemas
         required: Whether the file is required
     """
@@ -574,7 +967,7 @@ def _validate_output_file(
         schema_path = stage_path / schema_ref
 
         # Security: Check for path traversal on schema
-        if not schema_path.resolve().is_relative_to(stage_path):
+        if not within_stage(schema_path, stage_path):
             result.status = "fail"
             result.errors.append(
                 StageValidationCheck(
@@ -602,9 +995,10 @@ def _validate_output_file(
             )
             return
 
-        # Load schema first (separate error handling)
+        # Load schema first (separate error handling); compiled validators are
+        # shared across stages and calls (see chainglass.cache)
         try:
-            schema = json.loads(schema_path.read_text())
+            validator = get_validator(schema_path)
         except json.JSONDecodeError as e:
             result.status = "fail"
             result.errors.append(
@@ -619,18 +1013,23 @@ def _validate_output_file(
             )
             return
 
-        # Then load and validate data
+        # Then load and validate data. Large top-level arrays (or outputs
+        # marked `streaming: true`) are validated item-by-item with bounded
+        # memory; everything else is parsed once through the document store.
+        # Either way errors are produced lazily and stop after max_errors.
         try:
-            data = json.loads(output_path.read_text())
-            jsonschema.validate(data, schema)
-            result.checks.append(
-                StageValidationCheck(
-                    check="schema_valid",
-                    path=rel_path,
-                    schema=schema_ref,
-                    status="PASS",
+            errors = None
+            if should_stream(output, output_path) and is_streamable(validator.schema):
+                try:
+                    errors, truncated = collect_errors(
+                        iter_stream_errors(validator, output_path), max_errors
+                    )
+                except NotAnArrayError:
+                    pass  # Not an array after all - validate the whole document
+            if errors is None:
+                errors, truncated = collect_errors(
+                    validator.iter_errors(documents.load(output_path)), max_errors
                 )
-            )
         except json.JSONDecodeError as e:
             result.status = "fail"
             result.errors.append(
@@ -643,8 +1042,21 @@ def _validate_output_file(
                     action="Fix the JSON syntax error in the data file.",
                 )
             )
-        except jsonschema.ValidationError as e:
-            result.status = "fail"
+            return
+
+        if not errors:
+            result.checks.append(
+                StageValidationCheck(
+                    check="schema_valid",
+                    path=rel_path,
+                    schema=schema_ref,
+                    status="PASS",
+                )
+            )
+            return
+
+        result.status = "fail"
+        for e in errors:
             json_path_str = ".".join(str(p) for p in e.absolute_path) or ""
             result.errors.append(
                 StageValidationCheck(
@@ -657,3 +1069,9 @@ def _validate_output_file(
                     action=f"Fix the JSON structure. Error at '{json_path_str}': {e.message}. See {schema_ref} for required format.",
                 )
             )
+        if truncated:
+            # A note on the last error, not an extra error entry
+            result.errors[-1].action += (
+                f" Validation stopped after {max_errors} error(s); more may exist "
+                f"(pass max_errors=0, or --max-errors 0 on the CLI, to list all errors)."
+            )
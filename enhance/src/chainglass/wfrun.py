@@ -0,0 +1,355 @@
+"""Lock-protected, append-only updates of a run's wf-run.json.
+
+Stages that finalize in parallel (separate processes, or the executor's
+concurrent jobs) all record state transitions for the same run. Rewriting
+wf-run.json for each one costs O(stages) per update, loses history, and
+without coordination loses updates outright.
+
+State transitions (accept, prepare, handback, finalize, status changes)
+are instead appended as one JSON line each to wf-run.events.jsonl next to
+wf-run.json. An append is a single O_APPEND write, so concurrent writers
+never overwrite each other. wf-run.json is a snapshot: it records the
+byte offset of the log it includes ("event_log_offset"), and the current
+state is the snapshot plus the log entries after that offset.
+
+Each time the log grows past a multiple of COMPACT_EVERY_BYTES, the writer
+that crossed the boundary folds the tail into wf-run.json (compaction).
+The log itself is never truncated; it starts with a "snapshot" event
+holding the composed wf-run.json, so rebuild() reproduces wf-run.json
+from the log alone.
+
+wf-run.json on disk is therefore only eventually consistent: between
+compactions it lags the log. WfRunStore.read() (and Run.wf_run) always
+return the current state. For readers of the file itself (scripts,
+external orchestrators), every CLI command that records a transition
+(accept, handback, finalize, prepare-wf-stage) and execute compact before
+returning, so the file is current once the command exits and no other
+writer is active.
+
+Writers hold a shared fcntl lock on a sidecar lock file (wf-run.json.lock)
+while appending; compaction and transaction() take it exclusively, so a
+snapshot never misses an append in flight. wf-run.json is written through
+a temp file and os.replace, so readers need no lock. On platforms without
+fcntl the lock is skipped; appends and replaces stay atomic.
+
+Log lines:
+    {"ts": "...", "event": "finalize", "stages": {"explore": {"status": "completed", ...}}}
+    {"ts": "...", "event": "snapshot", "wf_run": {...}}
+"""
+
+import copy
+import json
+import os
+import stat
+import tempfile
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Fold the log into wf-run.json each time it grows by this much
+COMPACT_EVERY_BYTES = 64 * 1024
+
+EVENTS_FILENAME = "wf-run.events.jsonl"
+
+
+def utc_now() -> str:
+    """Current UTC time as an ISO-8601 string (the format used in wf-run.json)."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def status_fields(status: str, timestamp: str | None = None) -> dict[str, Any]:
+    """wf-run.json stage fields for a status transition.
+
+    "in_progress" stamps started_at (and clears completed_at); "completed"
+    stamps completed_at. Other statuses only change the status.
+    """
+    fields: dict[str, Any] = {"status": status}
+    if status == "in_progress":
+        fields["started_at"] = timestamp or utc_now()
+        fields["completed_at"] = None
+    elif status == "completed":
+        fields["completed_at"] = timestamp or utc_now()
+    return fields
+
+
+def apply_event(wf_run: dict[str, Any] | None, event: dict[str, Any]) -> dict[str, Any] | None:
+    """Apply one log event to a wf-run document and return the result.
+
+    A "snapshot" event replaces the document; any other event merges its
+    per-stage fields into the listed stages. Stage ids the document doesn't
+    list are ignored, as are events before the first snapshot.
+    """
+    if event.get("event") == "snapshot":
+        snapshot = event.get("wf_run")
+        return copy.deepcopy(snapshot) if isinstance(snapshot, dict) else wf_run
+    updates = event.get("stages")
+    if wf_run is None or not isinstance(updates, dict):
+        return wf_run
+    for entry in wf_run.get("stages", []):
+        if isinstance(entry, dict) and isinstance(updates.get(entry.get("id")), dict):
+            entry.update(updates[entry["id"]])
+    return wf_run
+
+
+class WfRunStore:
+    """
+    Serialized, append-only access to one wf-run.json and its event log.
+
+    Args:
+        path: Path to wf-run.json
+
+    Example:
+        >>> store = WfRunStore(run_dir / "wf-run.json")
+        >>> store.set_status("explore", "completed", event="finalize")
+        True
+        >>> store.read()["stages"][0]["status"]
+        'completed'
+        >>> store.compact()
+        True
+        >>> store.rebuild() == store.read()
+        True
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.events_path = self.path.with_name(EVENTS_FILENAME)
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def read(self) -> dict[str, Any] | None:
+        """Current state: the snapshot plus log events appended since it was written.
+
+        Returns None if wf-run.json is missing or corrupt. Lock-free: the
+        snapshot is replaced atomically and the log is append-only.
+        """
+        state = self._read_snapshot()
+        if state is None:
+            return None
+        for event in self.events(state.get("event_log_offset", 0)):
+            state = apply_event(state, event)
+        return state
+
+    def events(self, offset: int = 0) -> Iterator[dict[str, Any]]:
+        """Log events from a byte offset on (nothing if there is no log).
+
+        Lines that don't parse are skipped; an unterminated final line is a
+        write still in progress (or cut short by a crash) and is not read.
+        """
+        try:
+            with open(self.events_path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(event, dict):
+                        yield event
+        except OSError:
+            return
+
+    def rebuild(self) -> dict[str, Any] | None:
+        """Reconstruct wf-run.json from the log alone (None if the log has no snapshot).
+
+        Deterministic: the result equals what compaction writes at the same
+        log size, including event_log_offset.
+        """
+        state = None
+        for event in self.events():
+            state = apply_event(state, event)
+        if state is not None:
+            state["event_log_offset"] = self._log_size()
+        return state
+
+    # =========================================================================
+    # Writing
+    # =========================================================================
+
+    def create(self, wf_run: dict[str, Any]) -> None:
+        """Write a new run's wf-run.json and start its log with a snapshot of it."""
+        with self._locked(exclusive=True):
+            self._write_snapshot(copy.deepcopy(wf_run))
+
+    def append(self, event: str, updates: Mapping[str, Mapping[str, Any]]) -> bool:
+        """Append one event updating one or more stages: a single O(1) log write.
+
+        Args:
+            event: Event name (e.g. "accept", "prepare", "handback", "finalize")
+            updates: stage_id -> fields to set on that stage's entry
+
+        Returns:
+            False if wf-run.json is missing (nothing is recorded). Stage ids
+            wf-run.json doesn't list are ignored when the log is replayed.
+        """
+        if not self.path.exists():
+            return False  # Don't start a log for a run that has no wf-run.json
+        if not self.events_path.exists():
+            self.compact()  # Run composed before the log existed: seed it with a snapshot
+
+        line = {
+            "ts": utc_now(),
+            "event": event,
+            "stages": {stage_id: dict(fields) for stage_id, fields in updates.items()},
+        }
+        with self._locked(exclusive=False):
+            start, end = self._append_line(line)
+        if start // COMPACT_EVERY_BYTES != end // COMPACT_EVERY_BYTES:
+            self.compact(wait=False)
+        return True
+
+    def update_stages(
+        self, updates: Mapping[str, Mapping[str, Any]], event: str = "update"
+    ) -> bool:
+        """Merge fields into several stage entries with one appended event."""
+        return self.append(event, updates)
+
+    def update_stage(self, stage_id: str, event: str = "update", **fields: Any) -> bool:
+        """Merge fields into one stage entry."""
+        return self.append(event, {stage_id: fields})
+
+    def set_status(
+        self,
+        stage_id: str,
+        status: str,
+        timestamp: str | None = None,
+        event: str = "status",
+    ) -> bool:
+        """Record a status transition (see status_fields)."""
+        return self.append(event, {stage_id: status_fields(status, timestamp)})
+
+    def compact(self, wait: bool = True) -> bool:
+        """Fold the log tail into wf-run.json.
+
+        Args:
+            wait: Block until other writers are done; if False, give up when
+                the lock is busy (another writer is appending or compacting)
+
+        Returns:
+            True if wf-run.json was rewritten
+        """
+        if not self.path.exists():
+            return False
+        with self._locked(exclusive=True, wait=wait) as acquired:
+            if not acquired:
+                return False
+            state = self.read()
+            if state is None:
+                return False
+            if self._log_size() == 0:
+                self._write_snapshot(state)
+            else:
+                state["event_log_offset"] = self._log_size()
+                self._write(state)
+            return True
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, Any] | None]:
+        """Hold the exclusive lock across an arbitrary read-modify-write.
+
+        Yields the current state (None if wf-run.json is missing or corrupt).
+        Changes made to it are logged as a snapshot event and written to
+        wf-run.json when the block exits normally.
+        """
+        if not self.path.exists():
+            yield None
+            return
+        with self._locked(exclusive=True):
+            state = self.read()
+            yield state
+            if state is not None:
+                self._write_snapshot(state)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _read_snapshot(self) -> dict[str, Any] | None:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _log_size(self) -> int:
+        try:
+            return self.events_path.stat().st_size
+        except OSError:
+            return 0
+
+    def _write_snapshot(self, state: dict[str, Any]) -> None:
+        """Log state as a snapshot event, then write it as wf-run.json (exclusive lock held)."""
+        state.pop("event_log_offset", None)
+        self._append_line({"ts": utc_now(), "event": "snapshot", "wf_run": state})
+        state["event_log_offset"] = self._log_size()
+        self._write(state)
+
+    def _append_line(self, event: dict[str, Any]) -> tuple[int, int]:
+        """Append one JSON line with a single write; return its (start, end) offsets."""
+        data = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+        fd = os.open(self.events_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            written = os.write(fd, data)
+            while written < len(data):  # Short writes are rare on regular files
+                written += os.write(fd, data[written:])
+            end = os.lseek(fd, 0, os.SEEK_CUR)  # O_APPEND leaves the offset after our line
+        finally:
+            os.close(fd)
+        return end - len(data), end
+
+    @contextmanager
+    def _locked(self, exclusive: bool, wait: bool = True) -> Iterator[bool]:
+        """Hold the sidecar lock (shared for appends); yields False if not wait and busy."""
+        if not HAS_FCNTL:
+            yield True
+            return
+        operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        if not wait:
+            operation |= fcntl.LOCK_NB
+        with open(self.lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, operation)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _write(self, data: dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".wf-run.", suffix=".tmp")
+        try:
+            # mkstemp creates 0600; keep the mode readers of wf-run.json expect
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except OSError:
+                mode = 0o644
+            os.chmod(tmp_path, mode)
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def __repr__(self) -> str:
+        return f"WfRunStore({str(self.path)!r})"
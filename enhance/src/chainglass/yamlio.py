@@ -0,0 +1,43 @@
+"""YAML load/dump helpers used by every chainglass module.
+
+Picks the libyaml-backed CSafeLoader/CSafeDumper when PyYAML was built with
+libyaml, and falls back transparently to the pure-Python SafeLoader and
+SafeDumper otherwise. Both variants accept the same (safe) YAML subset.
+"""
+
+from typing import IO, Any
+
+import yaml
+from yaml import YAMLError
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    HAS_LIBYAML = False
+
+__all__ = ["HAS_LIBYAML", "YAMLError", "dump", "load"]
+
+
+def load(stream: str | bytes | IO) -> Any:
+    """Parse YAML (equivalent to yaml.safe_load).
+
+    Args:
+        stream: YAML text, bytes, or an open file
+
+    Raises:
+        YAMLError: If the content is not valid YAML
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump(data: Any, stream: IO | None = None, **kwargs: Any) -> str | None:
+    """Serialize data to YAML (equivalent to yaml.safe_dump).
+
+    Returns the YAML text when stream is None, otherwise writes to stream.
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
@@ -0,0 +1,45 @@
+"""Shared fixtures: runs composed from the sample wf-spec."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from chainglass.composer import compose
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_SPEC = ROOT / "sample" / "sample_1" / "wf-spec"
+VALID_FIXTURES = ROOT / "sample" / "sample_1" / "test-fixtures" / "valid-stage"
+STUB_AGENT = ROOT / "tools" / "stub_agent.py"
+
+
+@pytest.fixture
+def explore_outputs() -> Path:
+    """Valid run/ outputs for the sample's explore stage."""
+    return VALID_FIXTURES / "stages" / "explore" / "run"
+
+
+@pytest.fixture
+def sample_spec() -> Path:
+    """The sample wf-spec folder (read-only: copy it before editing)."""
+    return SAMPLE_SPEC
+
+
+@pytest.fixture
+def stub_agent_cmd():
+    """Builds an execute --agent-cmd running tools/stub_agent.py on the valid-stage fixtures."""
+
+    def build(*args: str) -> str:
+        return " ".join(
+            [sys.executable, str(STUB_AGENT), "--fixtures", str(VALID_FIXTURES), *args]
+        )
+
+    return build
+
+
+@pytest.fixture
+def run_dir(tmp_path: Path) -> Path:
+    """A freshly composed sample run, with explore's user input in place."""
+    run = compose(SAMPLE_SPEC, tmp_path / "runs")
+    (run / "stages" / "explore" / "inputs" / "user-description.md").write_text("hello\n")
+    return run
@@ -0,0 +1,65 @@
+"""Bundles: round trip, and crafted bundles must not write outside the run folder."""
+
+import json
+import zipfile
+
+import pytest
+
+from chainglass.bundle import MANIFEST_NAME, BundleError, load_bundle, write_bundle
+from chainglass.composer import compose_runs
+
+
+def _rewrite_manifest(bundle_path, edit):
+    """Rewrite bundle.json in place with edit(manifest) applied."""
+    with zipfile.ZipFile(bundle_path) as archive:
+        entries = {name: archive.read(name) for name in archive.namelist()}
+    manifest = json.loads(entries[MANIFEST_NAME])
+    edit(manifest)
+    entries[MANIFEST_NAME] = json.dumps(manifest).encode()
+    with zipfile.ZipFile(bundle_path, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+
+
+def test_bundle_round_trip(sample_spec, tmp_path):
+    bundle_path = tmp_path / "wf-spec.bundle.zip"
+    plan = write_bundle(sample_spec, bundle_path)
+    loaded = load_bundle(bundle_path)
+
+    assert loaded.files == plan.files
+    assert loaded.copies == plan.copies
+    assert loaded.directories == plan.directories
+    (run,) = compose_runs(loaded, tmp_path / "runs")
+    assert (run / "stages" / "explore" / "prompt" / "main.md").is_file()
+
+
+@pytest.mark.parametrize("target", ["/tmp/evil.md", "../evil.md", "stages/../../evil.md", ""])
+@pytest.mark.parametrize("field", ["files", "copies", "directories"])
+def test_bundle_rejects_targets_outside_the_run_folder(sample_spec, tmp_path, field, target):
+    bundle_path = tmp_path / "wf-spec.bundle.zip"
+    write_bundle(sample_spec, bundle_path)
+
+    def edit(manifest):
+        if field == "files":
+            manifest["files"][target] = "pwned\n"
+        elif field == "copies":
+            manifest["copies"][0][0] = target
+        else:
+            manifest["directories"].append(target)
+
+    _rewrite_manifest(bundle_path, edit)
+    with pytest.raises(BundleError, match="Unsafe target path"):
+        load_bundle(bundle_path)
+
+
+def test_bundle_rejects_non_digest_blob_names(sample_spec, tmp_path):
+    bundle_path = tmp_path / "wf-spec.bundle.zip"
+    write_bundle(sample_spec, bundle_path)
+
+    def edit(manifest):
+        path = next(iter(manifest["shared"].values()))
+        manifest["shared"] = {"../../evil": path}
+
+    _rewrite_manifest(bundle_path, edit)
+    with pytest.raises(BundleError, match="does not match"):
+        load_bundle(bundle_path)
@@ -0,0 +1,82 @@
+"""compose: run folders from the sample wf-spec."""
+
+import json
+import shutil
+
+import pytest
+
+from chainglass import composer
+from chainglass.composer import CompositionError, compose, compose_many, plan_compose
+from chainglass.linking import LINK_STRATEGIES
+from chainglass.validator import validate_or_raise, validate_stage
+
+
+def test_compose_many_rolls_back_when_a_run_folder_cannot_be_created(sample_spec, tmp_path, monkeypatch):
+    output = tmp_path / "runs"
+    create_run_folder = composer._create_run_folder
+    calls = []
+
+    def failing_create_run_folder(output_path):
+        calls.append(output_path)
+        if len(calls) == 3:
+            raise PermissionError(13, "Permission denied", str(output_path))
+        return create_run_folder(output_path)
+
+    monkeypatch.setattr(composer, "_create_run_folder", failing_create_run_folder)
+    with pytest.raises(CompositionError, match="Cannot create a run folder"):
+        compose_many(sample_spec, output, 5)
+
+    assert len(calls) == 3
+    assert list(output.iterdir()) == []
+
+
+@pytest.fixture
+def spec_with_ref(sample_spec, tmp_path):
+    """The sample wf-spec with wf-result.schema.json $ref'ing a sibling shared schema."""
+    spec = tmp_path / "wf-spec"
+    shutil.copytree(sample_spec, spec)
+    schema_path = spec / "schemas" / "wf-result.schema.json"
+    schema = json.loads(schema_path.read_text())
+    schema["properties"]["handback"] = {"$ref": "handback.schema.json"}
+    schema_path.write_text(json.dumps(schema, indent=2))
+    return spec
+
+
+@pytest.mark.parametrize("link", LINK_STRATEGIES)
+def test_linked_schemas_resolve_sibling_refs(spec_with_ref, explore_outputs, tmp_path, link):
+    run = compose(spec_with_ref, tmp_path / "runs", link=link)
+    stage = run / "stages" / "explore"
+    shutil.copytree(explore_outputs, stage / "run", dirs_exist_ok=True)
+    (stage / "run" / "output-data" / "output-params.json").unlink(missing_ok=True)
+    assert validate_stage(stage).status == "pass"
+
+    wf_result_path = stage / "run" / "output-data" / "wf-result.json"
+    wf_result = json.loads(wf_result_path.read_text())
+    wf_result["handback"] = {"reason": "bogus", "description": "x"}
+    wf_result_path.write_text(json.dumps(wf_result))
+
+    result = validate_stage(stage)
+    assert result.status == "fail"
+    assert [e.json_path for e in result.errors] == ["handback.reason"]
+
+
+@pytest.mark.parametrize("link", LINK_STRATEGIES)
+def test_shared_template_wins_over_a_stage_schema_with_its_target(sample_spec, tmp_path, link):
+    spec = tmp_path / "wf-spec"
+    shutil.copytree(sample_spec, spec)
+    (spec / "stages" / "explore" / "schemas" / "handback.schema.json").write_text("{}")
+
+    run = compose(spec, tmp_path / "runs", link=link)
+    composed = run / "stages" / "explore" / "schemas" / "handback.schema.json"
+    assert composed.read_bytes() == (spec / "schemas" / "handback.schema.json").read_bytes()
+
+
+def test_plan_writes_each_target_once(sample_spec, tmp_path):
+    spec = tmp_path / "wf-spec"
+    shutil.copytree(sample_spec, spec)
+    (spec / "stages" / "explore" / "schemas" / "handback.schema.json").write_text("{}")
+
+    plan = plan_compose(spec, validate_or_raise(spec))
+    targets = list(plan.files) + [target for target, _ in plan.copies]
+    assert len(targets) == len(set(targets))
+    assert (spec / "stages" / "explore" / "schemas" / "handback.schema.json").resolve() not in plan.sources
@@ -0,0 +1,49 @@
+"""compose --dry-run/--stats estimates."""
+
+import pytest
+from typer.testing import CliRunner
+
+from chainglass.cli import app
+from chainglass.composer import CompositionError, compose_runs, plan_compose
+from chainglass.estimate import CostModel, estimate_compose
+from chainglass.validator import validate_or_raise
+
+
+def _walk_counts(run):
+    """(directories, files, links) under a composed run folder."""
+    directories = files = links = 0
+    for path in run.rglob("*"):
+        if path.is_symlink():
+            links += 1
+        elif path.is_dir():
+            directories += 1
+        else:
+            files += 1
+    return directories + 1, files, links  # The run folder itself counts
+
+
+def test_estimate_matches_symlinked_compose(sample_spec, tmp_path):
+    plan = plan_compose(sample_spec, validate_or_raise(sample_spec))
+    (run,) = compose_runs(plan, tmp_path / "runs", link="symlink")
+    total = estimate_compose(plan, link="symlink").per_run
+
+    assert (total.directories, total.files, total.links) == _walk_counts(run)
+
+
+def test_estimate_rejects_unknown_link(sample_spec):
+    plan = plan_compose(sample_spec, validate_or_raise(sample_spec))
+    with pytest.raises(CompositionError, match="Unknown link strategy"):
+        estimate_compose(plan, link="teleport")
+
+
+def test_stats_without_dry_run_does_not_calibrate(sample_spec, tmp_path, monkeypatch):
+    def no_calibration(*args, **kwargs):
+        raise AssertionError("a real compose must not calibrate")
+
+    monkeypatch.setattr(CostModel, "calibrate", no_calibration)
+    output = tmp_path / "runs"
+    result = CliRunner().invoke(app, ["compose", str(sample_spec), "-o", str(output), "--stats"])
+
+    assert result.exit_code == 0, result.output
+    assert "built-in defaults" in result.output
+    assert "Actual time:" in result.output
@@ -0,0 +1,50 @@
+"""execute: stages run in DAG order through tools/stub_agent.py."""
+
+import json
+
+from chainglass import executor
+from chainglass.executor import execute
+
+
+def test_execute_completes_every_stage(run_dir, stub_agent_cmd):
+    events = []
+    result = execute(
+        run_dir, stub_agent_cmd(), jobs=2, on_event=lambda *event: events.append(event)
+    )
+
+    assert result.status == "pass", result.to_dict()
+    assert [(s.stage_id, s.status) for s in result.stages] == [
+        ("explore", "completed"),
+        ("specify", "completed"),
+    ]
+    wf_run = json.loads((run_dir / "wf-run.json").read_text())
+    assert {s["id"]: s["status"] for s in wf_run["stages"]} == {
+        "explore": "completed",
+        "specify": "completed",
+    }
+    assert ("explore", "completed", "4 output param(s)") in events
+
+
+def test_execute_failing_agent_blocks_downstream(run_dir, stub_agent_cmd):
+    result = execute(run_dir, stub_agent_cmd("--fail", "explore"))
+
+    assert result.status == "fail"
+    statuses = {s.stage_id: s.status for s in result.stages}
+    assert statuses == {"explore": "failed", "specify": "blocked"}
+    assert result.stages[0].exit_code == 1
+
+
+def test_execute_records_stage_exception_as_failed(run_dir, stub_agent_cmd, monkeypatch):
+    def broken_preflight(stage_path):
+        raise RuntimeError("preflight exploded")
+
+    monkeypatch.setattr(executor, "preflight", broken_preflight)
+    result = execute(run_dir, stub_agent_cmd())
+
+    assert result.status == "fail"
+    explore, specify = result.stages
+    assert explore.status == "failed"
+    assert "RuntimeError: preflight exploded" in explore.errors[0]
+    assert specify.status == "blocked"
+    wf_run = json.loads((run_dir / "wf-run.json").read_text())
+    assert wf_run["stages"][0]["status"] == "failed"
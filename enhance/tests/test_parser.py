@@ -0,0 +1,28 @@
+"""wf.yaml parsing and the on-disk parse cache."""
+
+import json
+import shutil
+
+import pytest
+
+from chainglass.cache import clear_caches
+from chainglass.parser import WorkflowParseError, parse_workflow
+
+
+def test_parse_cache_misses_when_a_refd_schema_changes(sample_spec, tmp_path):
+    spec = tmp_path / "wf-spec"
+    shutil.copytree(sample_spec, spec)
+    schema_path = spec / "schemas" / "wf.schema.json"
+    schema = json.loads(schema_path.read_text())
+    schema["properties"]["version"] = {"$ref": "version.schema.json"}
+    schema_path.write_text(json.dumps(schema))
+    version_schema = spec / "schemas" / "version.schema.json"
+    version_schema.write_text(json.dumps({"type": "string"}))
+    cache_dir = tmp_path / "cache"
+
+    assert parse_workflow(spec, use_cache=True, cache_dir=cache_dir)["version"] == "1.0"
+
+    version_schema.write_text(json.dumps({"type": "string", "pattern": "^2\\\\."}))
+    clear_caches()
+    with pytest.raises(WorkflowParseError, match="version"):
+        parse_workflow(spec, use_cache=True, cache_dir=cache_dir)
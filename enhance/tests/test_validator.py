@@ -0,0 +1,38 @@
+"""validate: stage outputs, incremental manifests."""
+
+import json
+
+from chainglass import validator, yamlio
+from chainglass.validator import validate_stage
+
+
+def test_streamed_output_rewritten_during_validation_is_not_cached(tmp_path, monkeypatch):
+    stage = tmp_path / "stage"
+    (stage / "schemas").mkdir(parents=True)
+    (stage / "run" / "output-data").mkdir(parents=True)
+    (stage / "stage-config.yaml").write_text(yamlio.dump({
+        "id": "stream",
+        "outputs": {"data": [{
+            "name": "items.json",
+            "path": "run/output-data/items.json",
+            "schema": "schemas/items.schema.json",
+            "streaming": True,
+        }]},
+    }))
+    (stage / "schemas" / "items.schema.json").write_text(
+        json.dumps({"type": "array", "items": {"type": "integer"}})
+    )
+    items_path = stage / "run" / "output-data" / "items.json"
+    items_path.write_text("[1, 2, 3]")
+
+    iter_stream_errors = validator.iter_stream_errors
+
+    def rewriting_iter_stream_errors(schema_validator, path):
+        yield from iter_stream_errors(schema_validator, path)
+        path.write_text('["a", "b"]')  # The agent rewrites the output mid-check
+
+    monkeypatch.setattr(validator, "iter_stream_errors", rewriting_iter_stream_errors)
+    assert validate_stage(stage, incremental=True).status == "pass"
+
+    monkeypatch.setattr(validator, "iter_stream_errors", iter_stream_errors)
+    assert validate_stage(stage, incremental=True).status == "fail"
@@ -0,0 +1,112 @@
+"""wf-run.json under concurrent writers: no lost updates, valid JSON."""
+
+import json
+import multiprocessing
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from chainglass import wfrun, yamlio
+from chainglass.stage import Stage
+from chainglass.wfrun import WfRunStore
+
+FINALIZERS = 64
+
+
+def _finalize(stage_path: str, barrier) -> bool:
+    """Accept and finalize one stage once every worker is ready."""
+    stage = Stage(Path(stage_path))
+    barrier.wait()
+    stage.accept()
+    return stage.finalize().success
+
+
+def _clone_explore(run_dir: Path, outputs: Path, count: int) -> list[Path]:
+    """Add count copies of the explore stage (valid outputs included) to run_dir."""
+    template = run_dir / "stages" / "explore"
+    config = yamlio.load((template / "stage-config.yaml").read_text())
+    stage_paths = []
+    for i in range(count):
+        stage_id = f"explore-{i:02d}"
+        stage_path = run_dir / "stages" / stage_id
+        shutil.copytree(template, stage_path)
+        shutil.copytree(outputs, stage_path / "run", dirs_exist_ok=True)
+        (stage_path / "run" / "output-data" / "output-params.json").unlink(missing_ok=True)
+        (stage_path / "stage-config.yaml").write_text(yamlio.dump({**config, "id": stage_id}))
+        stage_paths.append(stage_path)
+
+    with WfRunStore(run_dir / "wf-run.json").transaction() as wf_run:
+        wf_run["stages"].extend(
+            {"id": path.name, "status": "pending", "completed_at": None} for path in stage_paths
+        )
+    return stage_paths
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method"
+)
+def test_parallel_finalizers_lose_no_updates(run_dir, explore_outputs, monkeypatch):
+    # Compact often, so compactions race with appends from other finalizers
+    monkeypatch.setattr(wfrun, "COMPACT_EVERY_BYTES", 1024)
+    stage_paths = _clone_explore(run_dir, explore_outputs, FINALIZERS)
+
+    context = multiprocessing.get_context("fork")
+    with context.Manager() as manager:
+        barrier = manager.Barrier(FINALIZERS)
+        with context.Pool(FINALIZERS) as pool:
+            finalized = pool.starmap(_finalize, [(str(p), barrier) for p in stage_paths])
+    assert all(finalized)
+
+    store = WfRunStore(run_dir / "wf-run.json")
+    assert store.compact()
+    wf_run = json.loads(store.path.read_text())  # Valid JSON, complete after compaction
+    statuses = {entry["id"]: entry for entry in wf_run["stages"]}
+    for path in stage_paths:
+        entry = statuses[path.name]
+        assert entry["status"] == "completed", entry
+        assert entry["started_at"] and entry["completed_at"]
+    assert wf_run["event_log_offset"] == store.events_path.stat().st_size
+    assert store.rebuild() == wf_run == store.read()
+
+
+def test_concurrent_appends_from_threads(run_dir, monkeypatch):
+    monkeypatch.setattr(wfrun, "COMPACT_EVERY_BYTES", 512)
+    store = WfRunStore(run_dir / "wf-run.json")
+    updates = [(stage_id, f"step-{i}") for stage_id in ("explore", "specify") for i in range(100)]
+
+    def note(update: tuple[str, str]) -> bool:
+        stage_id, field = update
+        return store.update_stage(stage_id, event="note", **{field: True})
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        assert all(pool.map(note, updates))
+
+    store.compact()
+    wf_run = json.loads(store.path.read_text())
+    for entry in wf_run["stages"]:
+        assert all(entry.get(f"step-{i}") for i in range(100)), entry["id"]
+
+
+def test_cli_transitions_are_compacted_into_wf_run_json(run_dir, explore_outputs):
+    from typer.testing import CliRunner
+
+    from chainglass.cli import app
+
+    def status_on_disk() -> str:
+        # Read the file itself, as scripts and external orchestrators do
+        return json.loads((run_dir / "wf-run.json").read_text())["stages"][0]["status"]
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["accept", "explore", "-r", str(run_dir)])
+    assert result.exit_code == 0, result.output
+    assert status_on_disk() == "in_progress"
+
+    shutil.copytree(explore_outputs, run_dir / "stages" / "explore" / "run", dirs_exist_ok=True)
+    (run_dir / "stages" / "explore" / "run" / "output-data" / "output-params.json").unlink(
+        missing_ok=True
+    )
+    result = runner.invoke(app, ["finalize", "explore", "-r", str(run_dir)])
+    assert result.exit_code == 0, result.output
+    assert status_on_disk() == "completed"
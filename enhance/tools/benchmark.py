@@ -0,0 +1,871 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for chainglass hot paths.
+
+Usage:
+    python benchmark.py yaml [--lines 5000] [--configs 500] [--repeat 3]
+    python benchmark.py validate [--outputs 50] [--items 5000]
+    python benchmark.py query [--queries 100000]
+    python benchmark.py wf-run [--finalizers 64] [--stages 2000]
+    python benchmark.py compose [--stages 200] [--count 10]
+    python benchmark.py run-folder [--existing 3000] [--processes 16]
+
+Examples:
+    # YAML load/dump: pure-Python SafeLoader/SafeDumper vs libyaml C variants
+    python benchmark.py yaml
+
+    # validate_stage over a stage with 50 large JSON outputs (reads/parses)
+    python benchmark.py validate
+
+    # output_parameter queries: per-call regex parsing vs compiled queries
+    python benchmark.py query
+
+    # Compose a 200-stage wf-spec: serial per-stage vs planned + thread pool,
+    # 10 runs via compose_many vs 10 compose calls, wf-spec folder vs bundle,
+    # copied vs hardlinked/symlinked shared templates, and the compose --stats
+    # projection vs measured time
+    python benchmark.py compose
+
+    # Run-folder ordinal allocation with 3000 runs already present today, and
+    # 16 processes composing into one output directory at once (collisions)
+    python benchmark.py run-folder
+
+    # 64 processes finalizing stages of one run at once (lost wf-run.json updates),
+    # then per-update cost of rewriting wf-run.json vs appending to its event log
+    python benchmark.py wf-run
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import yaml  # noqa: E402
+
+from chainglass import composer, yamlio  # noqa: E402
+from chainglass.bundle import load_bundle, write_bundle  # noqa: E402
+from chainglass.composer import (  # noqa: E402
+    compose,
+    compose_many,
+    compose_runs,
+    execute_plan,
+    plan_compose,
+)
+from chainglass.documents import HAS_ORJSON, DocumentStore  # noqa: E402
+from chainglass.estimate import CostModel, estimate_compose  # noqa: E402
+from chainglass.query import compile_queries  # noqa: E402
+from chainglass.stage import Stage, resolve_query  # noqa: E402
+from chainglass.validator import validate_or_raise, validate_stage  # noqa: E402
+from chainglass.wfrun import WfRunStore  # noqa: E402
+
+SAMPLE_WF_SPEC = Path(__file__).resolve().parent.parent / "sample" / "sample_1" / "wf-spec"
+SAMPLE_FIXTURES = (
+    Path(__file__).resolve().parent.parent / "sample" / "sample_1" / "test-fixtures" / "valid-stage"
+)
+
+# ANSI colors
+GREEN = "\033[92m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+BOLD = "\033[1m"
+
+
+# =============================================================================
+# Synthetic workflow generation
+# =============================================================================
+
+
+def make_stage(index: int, upstream: str | None) -> dict[str, Any]:
+    """Build one stage definition shaped like the sample explore/specify stages."""
+    stage_id = f"stage-{index:03d}"
+    stage: dict[str, Any] = {
+        "id": stage_id,
+        "name": f"Stage {index}",
+        "description": f"Synthetic benchmark stage {index}",
+        "inputs": {
+            "required": [
+                {
+                    "name": "user-description.md",
+                    "path": "inputs/user-description.md",
+                    "description": "User-provided description",
+                }
+            ],
+            "optional": [],
+        },
+        "outputs": {
+            "files": [
+                {
+                    "name": "report.md",
+                    "path": "run/output-files/report.md",
+                    "description": "Stage report",
+                }
+            ],
+            "data": [
+                {
+                    "name": "wf-result.json",
+                    "path": "run/output-data/wf-result.json",
+                    "schema": "schemas/wf-result.schema.json",
+                    "description": "Stage execution status",
+                    "required": True,
+                },
+                {
+                    "name": "findings.json",
+                    "path": "run/output-data/findings.json",
+                    "schema": "schemas/findings.schema.json",
+                    "description": "Structured findings",
+                    "required": True,
+                },
+            ],
+        },
+        "output_parameters": [
+            {
+                "name": "total_findings",
+                "description": "Total number of findings",
+                "source": "run/output-data/findings.json",
+                "query": "summary.total",
+            }
+        ],
+        "prompt": {"entry": "prompt/wf.md", "main": "prompt/main.md"},
+    }
+    if upstream:
+        stage["inputs"]["required"].append(
+            {
+                "name": "findings.json",
+                "path": "inputs/findings.json",
+                "description": "Findings from upstream stage",
+                "from_stage": upstream,
+                "source": "run/output-data/findings.json",
+            }
+        )
+        stage["parameters"] = [
+            {
+                "name": "total_findings",
+                "description": "Findings from upstream stage",
+                "from_stage": upstream,
+                "output_parameter": "total_findings",
+            }
+        ]
+    return stage
+
+
+def make_workflow(stage_count: int) -> dict[str, Any]:
+    """Build a wf.yaml dict with a linear chain of stage_count stages."""
+    stages = []
+    for i in range(stage_count):
+        upstream = f"stage-{i - 1:03d}" if i > 0 else None
+        stages.append(make_stage(i, upstream))
+    return {
+        "version": "1.0",
+        "metadata": {"name": "benchmark", "description": "Synthetic benchmark workflow"},
+        "stages": stages,
+        "shared_templates": [
+            {"source": "templates/wf.md", "target": "prompt/wf.md"},
+            {"source": "schemas/wf-result.schema.json", "target": "schemas/wf-result.schema.json"},
+            {"source": "schemas/error-codes.json", "target": "schemas/error-codes.json"},
+            {"source": "schemas/handback.schema.json", "target": "schemas/handback.schema.json"},
+            {"source": "schemas/accept.schema.json", "target": "schemas/accept.schema.json"},
+        ],
+    }
+
+
+def workflow_with_lines(target_lines: int) -> dict[str, Any]:
+    """Build a workflow whose YAML dump is at least target_lines long."""
+    stage_count = 1
+    while True:
+        workflow = make_workflow(stage_count)
+        lines = yamlio.dump(workflow, default_flow_style=False, sort_keys=False).count("\n")
+        if lines >= target_lines:
+            return workflow
+        stage_count = max(stage_count + 1, stage_count * target_lines // max(lines, 1))
+
+
+def write_wf_spec(root: Path, stage_count: int) -> Path:
+    """Write a complete synthetic wf-spec folder (schemas/templates from the sample)."""
+    wf_spec = root / "wf-spec"
+    shutil.copytree(SAMPLE_WF_SPEC / "schemas", wf_spec / "schemas")
+    shutil.copytree(SAMPLE_WF_SPEC / "templates", wf_spec / "templates")
+    findings_schema = SAMPLE_WF_SPEC / "stages" / "explore" / "schemas" / "findings.schema.json"
+
+    workflow = make_workflow(stage_count)
+    for stage in workflow["stages"]:
+        stage_dir = wf_spec / "stages" / stage["id"]
+        (stage_dir / "prompt").mkdir(parents=True)
+        (stage_dir / "prompt" / "main.md").write_text(f"# {stage['name']}\n\nDo the work.\n")
+        (stage_dir / "schemas").mkdir()
+        shutil.copy2(findings_schema, stage_dir / "schemas" / "findings.schema.json")
+
+    with open(wf_spec / "wf.yaml", "w") as f:
+        yamlio.dump(workflow, f, default_flow_style=False, sort_keys=False)
+    return wf_spec
+
+
+# =============================================================================
+# Timing helpers
+# =============================================================================
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    """Return the best wall-clock time (seconds) of repeat runs of fn."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, baseline: float, candidate: float) -> None:
+    """Print one baseline-vs-candidate row."""
+    speedup = baseline / candidate if candidate else float("inf")
+    color = GREEN if speedup >= 1 else YELLOW
+    print(
+        f"  {label:<32} {baseline * 1000:9.1f} ms  ->  {candidate * 1000:9.1f} ms"
+        f"  {color}{speedup:5.1f}x{RESET}"
+    )
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+
+def bench_yaml(args: argparse.Namespace) -> int:
+    """YAML load/dump: pure-Python safe loader/dumper vs chainglass.yamlio."""
+    print(f"\n{BOLD}YAML load/dump{RESET} (libyaml available: {yamlio.HAS_LIBYAML})\n")
+    if not yamlio.HAS_LIBYAML:
+        print(f"{YELLOW}PyYAML was built without libyaml - both columns use the Python loader{RESET}\n")
+
+    dump_kwargs = {"default_flow_style": False, "sort_keys": False, "allow_unicode": True}
+
+    workflow = workflow_with_lines(args.lines)
+    wf_text = yamlio.dump(workflow, **dump_kwargs)
+    print(f"wf.yaml: {wf_text.count(chr(10))} lines, {len(workflow['stages'])} stages")
+    report(
+        "wf.yaml load",
+        best_of(args.repeat, lambda: yaml.safe_load(wf_text)),
+        best_of(args.repeat, lambda: yamlio.load(wf_text)),
+    )
+    report(
+        "wf.yaml dump",
+        best_of(args.repeat, lambda: yaml.safe_dump(workflow, **dump_kwargs)),
+        best_of(args.repeat, lambda: yamlio.dump(workflow, **dump_kwargs)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_paths = []
+        stage = make_stage(1, "stage-000")
+        for i in range(args.configs):
+            path = Path(tmp) / f"stage-config-{i:04d}.yaml"
+            path.write_text(yamlio.dump(stage, **dump_kwargs))
+            config_paths.append(path)
+
+        print(f"\nstage-config.yaml: {args.configs} files")
+        report(
+            "stage-config.yaml load (all)",
+            best_of(args.repeat, lambda: [yaml.safe_load(p.read_text()) for p in config_paths]),
+            best_of(args.repeat, lambda: [yamlio.load(p.read_text()) for p in config_paths]),
+        )
+
+        def dump_all(dump: Callable[..., Any]) -> None:
+            for p in config_paths:
+                with open(p, "w") as f:
+                    dump(stage, f, **dump_kwargs)
+
+        report(
+            "stage-config.yaml dump (all)",
+            best_of(args.repeat, lambda: dump_all(yaml.safe_dump)),
+            best_of(args.repeat, lambda: dump_all(yamlio.dump)),
+        )
+
+    return 0
+
+
+def write_large_output_stage(root: Path, outputs: int, items: int) -> Path:
+    """Write a stage folder with `outputs` large JSON data files, each with a
+    schema and an output_parameter, plus accept.json and handback.json."""
+    stage_dir = root / "stages" / "bench"
+    data_dir = stage_dir / "run" / "output-data"
+    schemas_dir = stage_dir / "schemas"
+    data_dir.mkdir(parents=True)
+    schemas_dir.mkdir()
+
+    shutil.copy2(SAMPLE_WF_SPEC / "schemas" / "accept.schema.json", schemas_dir)
+    shutil.copy2(SAMPLE_WF_SPEC / "schemas" / "handback.schema.json", schemas_dir)
+    (data_dir / "accept.json").write_text(
+        json.dumps({"state": "agent", "timestamp": "2026-01-18T00:00:00Z"})
+    )
+    (data_dir / "handback.json").write_text(
+        json.dumps({"reason": "success", "description": "Benchmark stage completed"})
+    )
+
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "type": "object",
+        "required": ["summary", "findings"],
+        "properties": {
+            "summary": {"type": "object", "required": ["total"]},
+            "findings": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["id", "severity", "score"],
+                    "properties": {
+                        "id": {"type": "string"},
+                        "severity": {"enum": ["low", "medium", "high", "critical"]},
+                        "score": {"type": "number"},
+                    },
+                },
+            },
+        },
+    }
+    severities = ["low", "medium", "high", "critical"]
+    document = {
+        "summary": {"total": items},
+        "findings": [
+            {"id": f"F-{i:06d}", "severity": severities[i % 4], "score": i % 100 / 10}
+            for i in range(items)
+        ],
+    }
+
+    data_outputs = []
+    output_parameters = []
+    for i in range(outputs):
+        name = f"data-{i:03d}"
+        (schemas_dir / f"{name}.schema.json").write_text(json.dumps(schema))
+        (data_dir / f"{name}.json").write_text(json.dumps(document))
+        data_outputs.append(
+            {
+                "name": f"{name}.json",
+                "path": f"run/output-data/{name}.json",
+                "schema": f"schemas/{name}.schema.json",
+                "required": True,
+            }
+        )
+        output_parameters.append(
+            {
+                "name": f"{name}_total",
+                "source": f"run/output-data/{name}.json",
+                "query": "summary.total",
+            }
+        )
+
+    config = {
+        "id": "bench",
+        "outputs": {"files": [], "data": data_outputs},
+        "output_parameters": output_parameters,
+    }
+    with open(stage_dir / "stage-config.yaml", "w") as f:
+        yamlio.dump(config, f, default_flow_style=False, sort_keys=False)
+    return stage_dir
+
+
+def bench_validate(args: argparse.Namespace) -> int:
+    """validate_stage over many large JSON outputs: reads, parses and time."""
+    print(f"\n{BOLD}validate_stage with large JSON outputs{RESET} (orjson: {HAS_ORJSON})\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stage_dir = write_large_output_stage(Path(tmp), args.outputs, args.items)
+        size = (stage_dir / "run" / "output-data" / "data-000.json").stat().st_size
+        print(f"{args.outputs} outputs x {size / 1024 / 1024:.1f} MiB, 1 output_parameter each\n")
+
+        documents = DocumentStore()
+        result = validate_stage(stage_dir, documents=documents)
+        if result.status != "pass":
+            print(f"{YELLOW}Unexpected validation failure: {result.summary}{RESET}")
+            return 1
+
+        stats = documents.stats()
+        mib = 1024 * 1024
+        print(f"  JSON load requests            {stats['requests']:>9}")
+        print(f"  Files parsed                  {stats['parse_count']:>9}")
+        print(f"  Bytes read                    {stats['bytes_read'] / mib:>9.1f} MiB")
+        print(
+            f"  Bytes read if read per use    {stats['bytes_requested'] / mib:>9.1f} MiB"
+            f"  {GREEN}{stats['bytes_requested'] / max(stats['bytes_read'], 1):.1f}x{RESET}"
+        )
+        elapsed = best_of(args.repeat, lambda: validate_stage(stage_dir))
+        print(f"  validate_stage wall time      {elapsed * 1000:>9.1f} ms")
+
+    return 0
+
+
+def legacy_resolve_query(data: Any, query: str) -> Any:
+    """resolve_query as it was before compiled queries (regex + split per call)."""
+    if data is None or query is None or query == "":
+        return None
+    current = data
+    segment_pattern = re.compile(r"([^.\[\]]+)(?:\[(\d+)\])?")
+    for part in query.split("."):
+        if current is None:
+            return None
+        match = segment_pattern.fullmatch(part)
+        if not match:
+            return None
+        key, index = match.groups()
+        if key == "length" and isinstance(current, list):
+            return len(current)
+        if isinstance(current, dict):
+            if key not in current:
+                return None
+            current = current[key]
+        elif isinstance(current, list):
+            try:
+                idx = int(key)
+                if idx < 0 or idx >= len(current):
+                    return None
+                current = current[idx]
+            except ValueError:
+                return None
+        else:
+            return None
+        if index is not None:
+            if not isinstance(current, list):
+                return None
+            idx = int(index)
+            if idx < 0 or idx >= len(current):
+                return None
+            current = current[idx]
+    return current
+
+
+def bench_query(args: argparse.Namespace) -> int:
+    """output_parameter query resolution: legacy vs compiled vs one-pass sets."""
+    print(f"\n{BOLD}output_parameter queries{RESET} ({args.queries} evaluations)\n")
+
+    document = {
+        "summary": {"total_findings": 42, "critical": 3, "by_area": {"auth": 7, "db": 11}},
+        "findings": [{"id": f"F{i}", "severity": "low", "score": i} for i in range(50)],
+        "metadata": {"version": "1.0", "tags": ["a", "b", "c"]},
+    }
+    queries = [
+        "summary.total_findings",
+        "summary.critical",
+        "summary.by_area.auth",
+        "summary.by_area.db",
+        "findings.length",
+        "findings[3].severity",
+        "findings[49].score",
+        "metadata.version",
+        "metadata.tags.length",
+        "metadata.tags[1]",
+    ]
+    workload = [queries[i % len(queries)] for i in range(args.queries)]
+
+    for query in queries:
+        if legacy_resolve_query(document, query) != resolve_query(document, query):
+            print(f"{YELLOW}Mismatch for {query!r}{RESET}")
+            return 1
+
+    report(
+        "resolve_query (one at a time)",
+        best_of(args.repeat, lambda: [legacy_resolve_query(document, q) for q in workload]),
+        best_of(args.repeat, lambda: [resolve_query(document, q) for q in workload]),
+    )
+
+    batch = tuple(queries)
+    batches = args.queries // len(queries)
+    report(
+        f"{len(queries)} queries/doc, one pass",
+        best_of(
+            args.repeat,
+            lambda: [[legacy_resolve_query(document, q) for q in batch] for _ in range(batches)],
+        ),
+        best_of(
+            args.repeat,
+            lambda: [compile_queries(batch).evaluate(document) for _ in range(batches)],
+        ),
+    )
+    return 0
+
+
+def legacy_update_status(stage_path: Path, status: str) -> None:
+    """wf-run.json update as Stage._update_wf_run_status did it: unlocked read-modify-write."""
+    from datetime import datetime, timezone
+
+    wf_run_path = stage_path.parent.parent / "wf-run.json"
+    try:
+        wf_run = json.loads(wf_run_path.read_text())
+    except json.JSONDecodeError:
+        return  # Torn read of a concurrent write - the old code silently gave up
+    for stage in wf_run.get("stages", []):
+        if stage["id"] == stage_path.name:
+            stage["status"] = status
+            stage["completed_at"] = datetime.now(timezone.utc).isoformat()
+            break
+    wf_run_path.write_text(json.dumps(wf_run, indent=2))
+
+
+def _finalize_worker(stage_path: str, barrier: Any, legacy: bool) -> bool:
+    """Finalize one stage once every worker is ready (legacy: unlocked status write)."""
+    stage = Stage(Path(stage_path))
+    barrier.wait()
+    if legacy:
+        from chainglass.validator import validate_stage as validate
+
+        if validate(stage.path).status != "pass":
+            return False
+        legacy_update_status(stage.path, "completed")
+        return True
+    return stage.finalize().success
+
+
+def write_finalizable_run(root: Path, stage_count: int) -> Path:
+    """Compose a stage_count-stage run and give every stage valid outputs."""
+    run_dir = compose(write_wf_spec(root, stage_count), root / "runs")
+    fixture = SAMPLE_FIXTURES / "stages" / "explore" / "run"
+    for stage_dir in sorted((run_dir / "stages").iterdir()):
+        output_data = stage_dir / "run" / "output-data"
+        shutil.copy2(fixture / "output-data" / "wf-result.json", output_data / "wf-result.json")
+        shutil.copy2(fixture / "output-data" / "findings.json", output_data / "findings.json")
+        (stage_dir / "run" / "output-files" / "report.md").write_text("# Report\n\nDone.\n")
+    return run_dir
+
+
+def bench_wf_run(args: argparse.Namespace) -> int:
+    """Parallel finalizers on one run: completed statuses lost per wf-run.json writer."""
+    count = args.finalizers
+    print(f"\n{BOLD}wf-run.json under {count} concurrent finalizers{RESET}\n")
+
+    failed = False
+    for legacy in (True, False):
+        label = "unlocked read-modify-write" if legacy else "WfRunStore (event log)"
+        lost_counts = []
+        corrupt = 0
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                run_dir = write_finalizable_run(Path(tmp), count)
+                stage_paths = [str(p) for p in sorted((run_dir / "stages").iterdir())]
+                with multiprocessing.Manager() as manager:
+                    barrier = manager.Barrier(count)
+                    with multiprocessing.Pool(count) as pool:
+                        finalized = pool.starmap(
+                            _finalize_worker, [(p, barrier, legacy) for p in stage_paths]
+                        )
+                if not all(finalized):
+                    print(f"{YELLOW}{finalized.count(False)} finalize call(s) failed{RESET}")
+                    return 1
+                try:
+                    # Legacy writers only touch wf-run.json; WfRunStore state includes its log
+                    store = WfRunStore(run_dir / "wf-run.json")
+                    wf_run = json.loads(store.path.read_text()) if legacy else store.read()
+                    if not legacy and (not store.compact() or store.rebuild() != store.read()):
+                        print(f"{YELLOW}wf-run.json rebuilt from the event log differs{RESET}")
+                        return 1
+                except json.JSONDecodeError:
+                    corrupt += 1  # Interleaved writes left a torn file: every update lost
+                    lost_counts.append(count)
+                    continue
+                lost_counts.append(
+                    sum(
+                        1
+                        for entry in wf_run["stages"]
+                        if entry["status"] != "completed" or not entry["completed_at"]
+                    )
+                )
+        worst = max(lost_counts)
+        color = YELLOW if worst else GREEN
+        print(
+            f"  {label:<28} lost updates per run (worst of {args.repeat}): "
+            f"{color}{worst:>3}{RESET}  corrupt wf-run.json: {color}{corrupt}{RESET}"
+        )
+        if not legacy and worst:
+            failed = True
+
+    if failed:
+        print(f"\n{YELLOW}FAIL: WfRunStore lost updates{RESET}")
+        return 1
+
+    # Cost of one status update as the run grows: full rewrite vs log append
+    stages = args.stages
+    print(f"\n{stages}-stage wf-run.json, one status update per stage:\n")
+    wf_run = {
+        "run_id": "run-benchmark",
+        "stages": [
+            {"id": f"stage-{i:05d}", "status": "pending", "started_at": None, "completed_at": None}
+            for i in range(stages)
+        ],
+    }
+
+    def rewrite_each(run_dir: Path) -> None:
+        for entry in wf_run["stages"]:
+            legacy_update_status(run_dir / "stages" / entry["id"], "completed")
+
+    def append_each(run_dir: Path) -> None:
+        store = WfRunStore(run_dir / "wf-run.json")
+        for entry in wf_run["stages"]:
+            store.set_status(entry["id"], "completed", event="finalize")
+
+    def timed(update_all: Callable[[Path], None]) -> float:
+        def once() -> None:
+            with tempfile.TemporaryDirectory() as tmp:
+                WfRunStore(Path(tmp) / "wf-run.json").create(wf_run)
+                update_all(Path(tmp))
+
+        return best_of(args.repeat, once)
+
+    report("status updates (append)", timed(rewrite_each), timed(append_each))
+    return 0
+
+
+def legacy_compose_stages(run_folder: Path, wf_spec: Path, workflow: dict[str, Any]) -> None:
+    """Stage folders as compose built them before planning: one stage at a time."""
+    for stage in sorted(workflow["stages"], key=lambda s: s["id"]):
+        stage_dir = run_folder / "stages" / stage["id"]
+        for subdir in ["inputs", "prompt", "run/output-files", "run/output-data",
+                       "run/runtime-inputs", "schemas"]:
+            (stage_dir / subdir).mkdir(parents=True, exist_ok=True)
+        config = {key: stage[key] for key in stage if key != "id"}
+        with open(stage_dir / "stage-config.yaml", "w") as f:
+            f.write(f"# Stage: {stage['id']}\n\n")
+            yamlio.dump({"id": stage["id"], **config}, f, default_flow_style=False, sort_keys=False)
+        src_prompt = wf_spec / "stages" / stage["id"] / "prompt" / "main.md"
+        if src_prompt.exists():
+            shutil.copy2(src_prompt, stage_dir / "prompt" / "main.md")
+        src_schemas = wf_spec / "stages" / stage["id"] / "schemas"
+        if src_schemas.exists():
+            for schema_file in sorted(src_schemas.iterdir()):
+                if schema_file.is_file():
+                    shutil.copy2(schema_file, stage_dir / "schemas" / schema_file.name)
+        for template in workflow.get("shared_templates", []):
+            src = wf_spec / template["source"]
+            dst = stage_dir / template["target"]
+            if src.exists():
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(src, dst)
+
+
+def bench_compose(args: argparse.Namespace) -> int:
+    """Compose a large wf-spec: serial per-stage vs planned + parallel, one vs many runs."""
+    print(f"\n{BOLD}compose{RESET} ({args.stages} stages)\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        wf_spec = write_wf_spec(root, args.stages)
+        workflow = validate_or_raise(wf_spec)
+        plan = plan_compose(wf_spec, workflow)
+        print(
+            f"{len(plan.directories)} directories, {plan.file_count} files per run "
+            f"({len(plan.copies)} copies)\n"
+        )
+
+        counter = iter(range(1_000_000))
+
+        def fresh_folder() -> Path:
+            folder = root / "runs" / f"run-{next(counter):06d}"
+            folder.mkdir(parents=True)
+            return folder
+
+        report(
+            "stage folders (one run)",
+            best_of(args.repeat, lambda: legacy_compose_stages(fresh_folder(), wf_spec, workflow)),
+            best_of(
+                args.repeat,
+                lambda: execute_plan(plan_compose(wf_spec, workflow), fresh_folder()),
+            ),
+        )
+
+        count = args.count
+        report(
+            f"{count} runs (compose x{count} vs compose_many)",
+            best_of(args.repeat, lambda: [compose(wf_spec, root / "many-a") for _ in range(count)]),
+            best_of(args.repeat, lambda: compose_many(wf_spec, root / "many-b", count)),
+        )
+
+        # Warm wf-spec folder (parse cache hit) vs a pre-validated bundle
+        bundle = root / "wf-spec.bundle.zip"
+        write_bundle(wf_spec, bundle)
+        print(
+            f"\n  bundle: 1 file, {bundle.stat().st_size / 1024:.0f} KiB "
+            f"(wf-spec folder: wf.yaml + {len(plan.sources)} source files)\n"
+        )
+        compose(wf_spec, root / "warm", use_cache=True)
+        report(
+            "plan (wf-spec vs bundle)",
+            best_of(
+                args.repeat,
+                lambda: plan_compose(wf_spec, validate_or_raise(wf_spec, use_cache=True)),
+            ),
+            best_of(args.repeat, lambda: load_bundle(bundle)),
+        )
+        report(
+            "one run (compose vs --bundle)",
+            best_of(args.repeat, lambda: compose(wf_spec, root / "from-spec", use_cache=True)),
+            best_of(args.repeat, lambda: compose_runs(load_bundle(bundle), root / "from-bundle")),
+        )
+
+        # Shared templates/schemas: a copy per stage vs one blob per run, linked
+        print(f"\n  {len(plan.shared)} distinct shared files in .blobs/\n")
+        for link in ("hardlink", "symlink"):
+            report(
+                f"stage folders (--link {link})",
+                best_of(args.repeat, lambda: execute_plan(plan, fresh_folder())),
+                best_of(args.repeat, lambda: execute_plan(plan, fresh_folder(), link=link)),
+            )
+        for link in ("copy", "hardlink", "symlink"):
+            folder = fresh_folder()
+            execute_plan(plan, folder, link=link)
+            label = f"disk usage (--link {link})"
+            print(f"  {label:<32} {disk_usage(folder) / 1024:9.0f} KiB")
+
+        # compose --dry-run --stats: calibrated projection vs measured time
+        print()
+        model = CostModel.calibrate(root)
+        for link in ("copy", "hardlink", "symlink"):
+            projected = estimate_compose(plan, link=link).projected_seconds(model)
+            actual = best_of(args.repeat, lambda: execute_plan(plan, fresh_folder(), link=link))
+            label = f"projected vs actual ({link})"
+            print(f"  {label:<32} {projected * 1000:9.1f} ms  vs  {actual * 1000:9.1f} ms")
+    return 0
+
+
+def disk_usage(root: Path) -> int:
+    """Bytes allocated under root, counting each hardlinked inode once (like du)."""
+    seen: set[int] = set()
+    total = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            st = os.lstat(os.path.join(dirpath, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_blocks * 512
+    return total
+
+
+def legacy_create_run_folder(output_path: Path) -> Path:
+    """Run folder allocation before the ordinal scan: stat -001, -002, ... then mkdir."""
+    output_path.mkdir(parents=True, exist_ok=True)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    ordinal = 1
+    while True:
+        run_folder = output_path / f"run-{today}-{ordinal:03d}"
+        if not run_folder.exists():
+            break
+        ordinal += 1
+    run_folder.mkdir(parents=True)
+    return run_folder
+
+
+def _allocate_worker(output_path: str, count: int, barrier: Any, legacy: bool) -> list[str | None]:
+    """Allocate count run folders after all workers are ready; None marks a collision."""
+    create = legacy_create_run_folder if legacy else composer._create_run_folder
+    barrier.wait()
+    names: list[str | None] = []
+    for _ in range(count):
+        try:
+            names.append(create(Path(output_path)).name)
+        except FileExistsError:
+            names.append(None)
+    return names
+
+
+def bench_run_folder(args: argparse.Namespace) -> int:
+    """Run-folder allocation: O(n) stat loop vs one scan + atomic mkdir, and under concurrency."""
+    print(f"\n{BOLD}run-folder{RESET} ordinal allocation\n")
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "runs"
+        output.mkdir()
+        for ordinal in range(1, args.existing + 1):
+            (output / f"run-{today}-{ordinal:03d}").mkdir()
+
+        def allocate(create: Callable[[Path], Path]) -> None:
+            shutil.rmtree(create(output))
+
+        def scan_and_allocate() -> None:
+            composer._next_ordinals.clear()  # Measure a fresh process: scan included
+            allocate(composer._create_run_folder)
+
+        report(
+            f"next of {args.existing} runs (new process)",
+            best_of(args.repeat, lambda: allocate(legacy_create_run_folder)),
+            best_of(args.repeat, scan_and_allocate),
+        )
+        report(
+            f"next of {args.existing} runs (same process)",
+            best_of(args.repeat, lambda: allocate(legacy_create_run_folder)),
+            best_of(args.repeat, lambda: allocate(composer._create_run_folder)),
+        )
+
+    processes, per_process = args.processes, args.per_process
+    print(f"\n{processes} processes x {per_process} run folders into one output directory:\n")
+    failed = False
+    for label, legacy in (("stat loop + mkdir", True), ("scan + atomic mkdir", False)):
+        with tempfile.TemporaryDirectory() as tmp:
+            with multiprocessing.Manager() as manager:
+                barrier = manager.Barrier(processes)
+                with multiprocessing.Pool(processes) as pool:
+                    results = pool.starmap(
+                        _allocate_worker,
+                        [(tmp, per_process, barrier, legacy) for _ in range(processes)],
+                    )
+        names = [name for result in results for name in result]
+        collisions = names.count(None)
+        unique = len({name for name in names if name})
+        color = YELLOW if collisions else GREEN
+        print(
+            f"  {label:<28} collisions: {color}{collisions:>4}{RESET}  "
+            f"folders created: {unique}/{processes * per_process}"
+        )
+        if not legacy and (collisions or unique != processes * per_process):
+            failed = True
+
+    if failed:
+        print(f"\n{YELLOW}FAIL: concurrent composes collided{RESET}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for chainglass hot paths")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    yaml_parser = subparsers.add_parser("yaml", help="YAML load/dump: Python vs libyaml")
+    yaml_parser.add_argument("--lines", type=int, default=5000, help="Target wf.yaml line count")
+    yaml_parser.add_argument("--configs", type=int, default=500, help="Number of stage-config.yaml files")
+    yaml_parser.set_defaults(func=bench_yaml)
+
+    validate_parser = subparsers.add_parser("validate", help="validate_stage reads/parses per call")
+    validate_parser.add_argument("--outputs", type=int, default=50, help="Number of JSON outputs")
+    validate_parser.add_argument("--items", type=int, default=5000, help="Array items per output")
+    validate_parser.set_defaults(func=bench_validate)
+
+    query_parser = subparsers.add_parser("query", help="output_parameter query resolution")
+    query_parser.add_argument("--queries", type=int, default=100_000, help="Query evaluations")
+    query_parser.set_defaults(func=bench_query)
+
+    wf_run_parser = subparsers.add_parser("wf-run", help="Concurrent finalizers vs wf-run.json")
+    wf_run_parser.add_argument("--finalizers", type=int, default=64, help="Parallel finalize processes")
+    wf_run_parser.add_argument("--stages", type=int, default=2000, help="Stages for the per-update timing")
+    wf_run_parser.set_defaults(func=bench_wf_run)
+
+    compose_parser = subparsers.add_parser("compose", help="Compose a large wf-spec, one and many runs")
+    compose_parser.add_argument("--stages", type=int, default=200, help="Stages in the wf-spec")
+    compose_parser.add_argument("--count", type=int, default=10, help="Runs for compose_many")
+    compose_parser.set_defaults(func=bench_compose)
+
+    run_folder_parser = subparsers.add_parser("run-folder", help="Run-folder ordinal allocation")
+    run_folder_parser.add_argument("--existing", type=int, default=3000, help="Runs already present today")
+    run_folder_parser.add_argument("--processes", type=int, default=16, help="Concurrent allocating processes")
+    run_folder_parser.add_argument("--per-process", type=int, default=20, help="Run folders per process")
+    run_folder_parser.set_defaults(func=bench_run_folder)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
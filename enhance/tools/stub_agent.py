@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Stub agent for `chainglass execute`: copies canned stage outputs into place.
+
+Stands in for a real LLM agent when exercising the executor. For the
+stage named by CHAINGLASS_STAGE_ID it copies
+<fixtures>/stages/<stage_id>/run/ into the stage's run/ folder
+(output-params.json excluded - finalize writes that).
+
+Usage:
+    python stub_agent.py --fixtures <dir> [--sleep SECONDS] [--fail STAGE_ID]
+
+Examples:
+    chainglass execute -r runs/run-2026-01-18-001 -j 2 \\
+        --agent-cmd 'python tools/stub_agent.py --fixtures sample/sample_1/test-fixtures/valid-stage'
+
+    # Simulate a failing agent on one stage
+    chainglass execute -r runs/run-2026-01-18-001 \\
+        --agent-cmd 'python tools/stub_agent.py --fixtures ... --fail explore'
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Copy fixture outputs into a stage folder")
+    parser.add_argument("--fixtures", type=Path, required=True, help="Fixture root containing stages/")
+    parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to wait before writing outputs")
+    parser.add_argument("--fail", action="append", default=[], help="Exit 1 for this stage id")
+    args = parser.parse_args()
+
+    stage_id = os.environ.get("CHAINGLASS_STAGE_ID")
+    stage_dir = os.environ.get("CHAINGLASS_STAGE_DIR")
+    if not stage_id or not stage_dir:
+        print("CHAINGLASS_STAGE_ID / CHAINGLASS_STAGE_DIR not set (run via chainglass execute)")
+        return 2
+
+    print(f"stub agent: {stage_id}")
+    if args.sleep:
+        time.sleep(args.sleep)
+    if stage_id in args.fail:
+        print(f"stub agent: failing {stage_id} as requested")
+        return 1
+
+    source = args.fixtures.resolve() / "stages" / stage_id / "run"
+    if not source.is_dir():
+        print(f"stub agent: no fixture outputs at {source}")
+        return 1
+
+    target = Path(stage_dir) / "run"
+    for path in sorted(source.rglob("*")):
+        if path.is_dir() or path.name == "output-params.json":
+            continue
+        destination = target / path.relative_to(source)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, destination)
+        print(f"  wrote {destination.relative_to(stage_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,12 +24,22 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
 try:
-    from jsonschema import Draft202012Validator, ValidationError
+    from jsonschema import Draft202012Validator, SchemaError, ValidationError
     HAS_JSONSCHEMA = True
 except ImportError:
     HAS_JSONSCHEMA = False
 
+try:
+    # Shared compiled-validator cache (resolves cross-file $refs between schemas)
+    from chainglass.cache import get_validator
+except ImportError:
+    get_validator = None
+
 
 # ANSI colors
 GREEN = "\033[92m"
@@ -53,19 +63,38 @@ def load_json(path: Path) -> tuple[Optional[dict], Optional[str]]:
         return None, str(e)
 
 
+def load_validator(schema_path: Path) -> tuple[Optional[object], Optional[str]]:
+    """Load a compiled validator for a schema file, return (validator, error)."""
+    if get_validator is not None:
+        try:
+            return get_validator(schema_path), None
+        except json.JSONDecodeError as e:
+            return None, f"Invalid JSON: {e}"
+        except FileNotFoundError:
+            return None, "File not found"
+        except SchemaError as e:
+            return None, f"Invalid schema: {e.message}"
+        except Exception as e:
+            return None, str(e)
+
+    schema, err = load_json(schema_path)
+    if err:
+        return None, err
+    return Draft202012Validator(schema), None
+
+
 def validate_against_schema(
     data: dict,
-    schema: dict,
+    validator,
     verbose: bool = False
 ) -> tuple[bool, list[str]]:
     """
-    Validate data against JSON schema.
+    Validate data against a compiled JSON schema validator.
     Returns (is_valid, list of error messages).
     """
     if not HAS_JSONSCHEMA:
         return True, ["jsonschema not installed - skipping validation"]
 
-    validator = Draft202012Validator(schema)
     errors = list(validator.iter_errors(data))
 
     if not errors:
@@ -132,7 +161,10 @@ def validate_pair(
     lines = []
 
     # Load schema
-    schema, schema_err = load_json(schema_path)
+    if HAS_JSONSCHEMA:
+        validator, schema_err = load_validator(schema_path)
+    else:
+        validator, schema_err = load_json(schema_path)
     if schema_err:
         return False, f"{RED}✗{RESET} {name}: Schema error - {schema_err}"
 
@@ -142,7 +174,7 @@ def validate_pair(
         return False, f"{RED}✗{RESET} {name}: Output error - {data_err}"
 
     # Validate
-    is_valid, errors = validate_against_schema(data, schema, verbose)
+    is_valid, errors = validate_against_schema(data, validator, verbose)
 
     if is_valid:
         msg = f"{GREEN}✓{RESET} {name}"